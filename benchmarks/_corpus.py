@@ -0,0 +1,154 @@
+"""
+Synthetic Sinhala fixtures shared by the benchmark scripts.
+
+Everything here is generated deterministically from ``sinlib.utils.chars`` so the
+benchmarks run offline, without the hub character map or vocabulary.
+"""
+import json
+import random
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from sinlib.tokenizer import Tokenizer
+from sinlib.utils.chars import ALL_SINHALA_CHARACTERS, BASE_CONSONANTS
+
+CONSONANT_SOUNDS = {
+    "ක": "k", "ඛ": "kh", "ග": "g", "ඝ": "gh", "ඞ": "n", "ඟ": "ng", "ච": "ch", "ඡ": "chh", "ජ": "j",
+    "ඣ": "jh", "ඤ": "kn", "ඦ": "nj", "ට": "t", "ඨ": "th", "ඩ": "d", "ඪ": "dh", "ණ": "n", "ඬ": "nd",
+    "ත": "th", "ථ": "th", "ද": "d", "ධ": "dh", "න": "n", "ඳ": "nd", "ප": "p", "ඵ": "ph", "බ": "b",
+    "භ": "bh", "ම": "m", "ඹ": "mb", "ය": "y", "ර": "r", "ල": "l", "ව": "w", "ශ": "sh", "ෂ": "sh",
+    "ස": "s", "හ": "h", "ළ": "l", "ෆ": "f",
+}
+VOWEL_SIGN_SOUNDS = {
+    "": "a", "ා": "a", "ැ": "e", "ෑ": "e", "ි": "i", "ී": "i", "ු": "u", "ූ": "u", "ෙ": "e",
+    "ේ": "e", "ො": "o", "ෝ": "o", "ෞ": "au", "ෛ": "ai", "ං": "an", "්": "",
+}
+VOWEL_SOUNDS = {
+    "අ": "a", "ආ": "aa", "ඇ": "e", "ඈ": "ee", "ඉ": "i", "ඊ": "ii", "උ": "u", "ඌ": "uu",
+    "එ": "e", "ඒ": "ee", "ඔ": "o", "ඕ": "oo", "ඖ": "au",
+}
+
+SENTENCE_END = [".", ".", ".", "?", "!"]
+
+
+def synthetic_char_map() -> Dict[str, str]:
+    """Return a character map covering every consonant/vowel-sign combination."""
+    char_map = dict(VOWEL_SOUNDS)
+    for consonant in BASE_CONSONANTS:
+        for sign, sound in VOWEL_SIGN_SOUNDS.items():
+            char_map[consonant + sign] = CONSONANT_SOUNDS[consonant] + sound
+    return char_map
+
+
+def synthetic_words(n_words: int, seed: int = 0) -> List[str]:
+    """Return ``n_words`` distinct pseudo-Sinhala words."""
+    rng = random.Random(seed)
+    syllables = [
+        c + s
+        for c in BASE_CONSONANTS
+        if c in ALL_SINHALA_CHARACTERS
+        for s in VOWEL_SIGN_SOUNDS
+        if s != "්"
+    ]
+    words = set()
+    while len(words) < n_words:
+        head = rng.choice([v for v in VOWEL_SOUNDS if v in ALL_SINHALA_CHARACTERS]) if rng.random() < 0.15 else ""
+        words.add(head + "".join(rng.choice(syllables) for _ in range(rng.randint(1, 4))))
+    return sorted(words)
+
+
+def synthetic_corpus(n_lines: int, words_per_line: int = 12, vocab_size: int = 5000, seed: int = 0) -> List[str]:
+    """
+    Return a deterministic corpus of pseudo-Sinhala sentences.
+
+    Word frequencies follow a Zipf-like distribution and roughly one word in twenty
+    is an English word or a number, like real web text.
+    """
+    rng = random.Random(seed)
+    vocab = synthetic_words(vocab_size, seed)
+    weights = [1.0 / (rank + 1) for rank in range(len(vocab))]
+    extras = ["hello", "covid", "2024", "60,122", "sinlib", "(AI)"]
+    lines = []
+    for _ in range(n_lines):
+        n = max(1, int(rng.gauss(words_per_line, words_per_line / 3)))
+        words = rng.choices(vocab, weights=weights, k=n)
+        for i in range(n):
+            if rng.random() < 0.05:
+                words[i] = rng.choice(extras)
+        lines.append(" ".join(words) + rng.choice(SENTENCE_END))
+    return lines
+
+
+def write_romanizer_fixtures(directory: Path, corpus: List[str]) -> Dict[str, Path]:
+    """
+    Write a character map and a tokenizer trained on ``corpus`` to ``directory``.
+
+    Returns:
+        Paths usable as ``Romanizer(char_mapper_fp=..., tokenizer_path=...)``.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    char_map_fp = directory / "char_map.json"
+    with open(char_map_fp, "w", encoding="utf-8") as f:
+        json.dump(synthetic_char_map(), f, ensure_ascii=False)
+
+    tokenizer = Tokenizer(max_length=None)
+    tokenizer.train(corpus + [" ".join(synthetic_char_map())])
+    tokenizer.save_tokenizer(directory / "tokenizer")
+    return {"char_mapper_fp": char_map_fp, "tokenizer_path": directory / "tokenizer"}
+
+
+def read_corpus(path: Path) -> List[str]:
+    """Return the non-empty lines of a UTF-8 text file."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def write_typo_detector_fixtures(directory: Path, corpus: List[str], tokenizer: Tokenizer) -> Dict[str, Path]:
+    """
+    Write a dictionary and character bigram probabilities estimated from ``corpus``.
+
+    Returns:
+        Paths usable as ``TypoDetector(dictionary_path=..., ngram_probs_path=...)``.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    words = sorted({word for line in corpus for word in line.split()})
+    counts: Dict[int, int] = {}
+    for word in words:
+        ids = tokenizer(word)
+        for i in range(len(ids) - 1):
+            key = int(f"{ids[i]}{ids[i + 1]}")
+            counts[key] = counts.get(key, 0) + 1
+    total = sum(counts.values()) or 1
+    ngram_probs = {key: count / total for key, count in counts.items()}
+
+    dictionary_path = directory / "dictionary.npy"
+    ngram_probs_path = directory / "ngram_probs.npy"
+    np.save(dictionary_path, np.array(words))
+    np.save(ngram_probs_path, np.array(ngram_probs, dtype=object), allow_pickle=True)
+    return {"dictionary_path": dictionary_path, "ngram_probs_path": ngram_probs_path}
+
+
+def write_transliterator_fixtures(directory: Path, vocab_size: int, seed: int = 0) -> Path:
+    """
+    Write randomly initialized checkpoints of the default and small transliteration models.
+
+    Inference cost does not depend on the weights, so untrained models of the
+    released and distilled architectures are enough for timing.
+    """
+    import torch
+
+    from sinlib.utils.distillation import STUDENT_HIDDEN_SIZE, STUDENT_NUM_LAYERS
+    from sinlib.utils.model_utils import HIDDEN_SIZE
+    from sinlib.utils.models.transliterator_model import BiLSTMTranslator
+
+    torch.manual_seed(seed)
+    small_path = Path(directory) / "transliterator-small.pth"
+    small = BiLSTMTranslator(vocab_size, STUDENT_HIDDEN_SIZE, vocab_size, STUDENT_NUM_LAYERS)
+    torch.save(small.state_dict(), small_path)
+    checkpoint_path = Path(directory) / "transliterator-checkpoint.pth"
+    torch.save(BiLSTMTranslator(vocab_size, HIDDEN_SIZE, vocab_size).state_dict(), checkpoint_path)
+    return checkpoint_path
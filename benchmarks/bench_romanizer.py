@@ -0,0 +1,64 @@
+"""
+Benchmark the table-driven Romanizer against the original per-character implementation.
+
+Usage:
+    python benchmarks/bench_romanizer.py --lines 20000
+"""
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from _corpus import synthetic_corpus, write_romanizer_fixtures
+from sinlib import Romanizer
+from sinlib.utils.chars import ALL_SINHALA_CHARACTERS, NUBERS_AND_PUNKTS
+from sinlib.utils.preprocessing import remove_non_printable
+
+
+def legacy_romanize(romanizer: Romanizer, text: str) -> str:
+    """The romanization loop as it was before the translation table was introduced."""
+    text = remove_non_printable(text)
+    chars = np.array(list(text))
+    sinhala_mask = [char in ALL_SINHALA_CHARACTERS + list(NUBERS_AND_PUNKTS) + [" "] for char in chars]
+    sinhala_text = "".join(chars[sinhala_mask]).strip()
+    encodings = romanizer.tokenizer(sinhala_text, truncate_and_pad=False)
+    decoded_chars = [romanizer.tokenizer.token_id_to_token_map[c] for c in encodings]
+    romanized_chars = [
+        romanizer.char_mapper.get(ch, ch if ch in NUBERS_AND_PUNKTS.union({" "}) else "")
+        for ch in decoded_chars
+    ]
+    word_mapping = dict(zip(sinhala_text.split(), "".join(romanized_chars).split()))
+    return " ".join(word_mapping.get(word, word) for word in text.split())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=20000, help="Number of corpus lines")
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(args.lines)
+    n_chars = sum(len(line) for line in corpus)
+    with tempfile.TemporaryDirectory() as tmp:
+        romanizer = Romanizer(**{k: str(v) for k, v in write_romanizer_fixtures(tmp, corpus).items()})
+
+    start = time.perf_counter()
+    expected = [legacy_romanize(romanizer, line) for line in corpus]
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = romanizer(corpus)
+    table_seconds = time.perf_counter() - start
+
+    # The legacy word-zip remapping leaves a whole word untouched when it contains a
+    # character outside the supported set, so a few lines are expected to differ.
+    differing = sum(a != b for a, b in zip(results, expected))
+    print(f"corpus: {len(corpus)} lines, {n_chars / 1e6:.2f}M characters")
+    print(f"legacy: {legacy_seconds:.3f}s ({n_chars / legacy_seconds / 1e6:.2f}M chars/s)")
+    print(f"table:  {table_seconds:.3f}s ({n_chars / table_seconds / 1e6:.2f}M chars/s)")
+    print(f"speedup: {legacy_seconds / table_seconds:.1f}x")
+    print(f"lines differing from legacy output: {differing}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Measure Romanizer.romanize_stream throughput across worker counts.
+
+Usage:
+    python benchmarks/bench_romanizer_parallel.py --lines 200000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from _corpus import synthetic_corpus, write_romanizer_fixtures
+from sinlib import Romanizer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=200000, help="Number of corpus lines")
+    parser.add_argument("--chunk-size", type=int, default=512, help="Texts per worker task")
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=sorted({1, 2, 4, os.cpu_count() or 1}),
+        help="Worker counts to measure",
+    )
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(args.lines)
+    n_chars = sum(len(line) for line in corpus)
+    with tempfile.TemporaryDirectory() as tmp:
+        romanizer = Romanizer(**{k: str(v) for k, v in write_romanizer_fixtures(tmp, corpus).items()})
+
+    print(f"corpus: {len(corpus)} lines, {n_chars / 1e6:.2f}M characters")
+    baseline = None
+    with romanizer:
+        for workers in args.workers:
+            # Warm up so pool start-up is not counted, as in a long-running service.
+            list(romanizer.romanize_stream(corpus[:workers * args.chunk_size], workers, args.chunk_size))
+            start = time.perf_counter()
+            for _ in romanizer.romanize_stream(iter(corpus), num_workers=workers, chunk_size=args.chunk_size):
+                pass
+            seconds = time.perf_counter() - start
+            baseline = baseline or seconds
+            print(
+                f"workers={workers:<3} {seconds:7.3f}s  {len(corpus) / seconds:10.0f} lines/s  "
+                f"{n_chars / seconds / 1e6:6.2f}M chars/s  speedup {baseline / seconds:4.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark the compiled Tokenizer encoder against the original per-part loop on long documents.
+
+Usage:
+    python benchmarks/bench_tokenizer_encode.py --documents 200 --lines-per-document 200
+"""
+import argparse
+import time
+from typing import List
+
+from _corpus import synthetic_corpus
+from sinlib.tokenizer import Tokenizer
+from sinlib.utils.preprocessing import canonicalize, process_text
+
+
+def legacy_encode(tokenizer: Tokenizer, text: str, allowed_special_tokens: List[str] = []) -> List[int]:
+    """The encoding loop as it was before the compiled encoder was introduced."""
+    allowed_token_ids = [tokenizer.vocab_map[tok] for tok in allowed_special_tokens]
+    text_encodings: List[int] = []
+    for part in text.split(tokenizer.end_of_text_token):
+        processed_text = process_text(canonicalize(part) if tokenizer.normalize else part)
+        for token in processed_text:
+            if token in tokenizer.special_tokens:
+                if token in allowed_special_tokens:
+                    text_encodings.append(tokenizer.vocab_map[token])
+            else:
+                text_encodings.append(tokenizer.vocab_map.get(token, tokenizer.unknown_token_id))
+        if len(text.split(tokenizer.end_of_text_token)) > 1:
+            text_encodings.append(tokenizer.end_of_text_token_id)
+    return text_encodings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=200, help="Number of documents")
+    parser.add_argument("--lines-per-document", type=int, default=200, help="Sentences per document")
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(args.documents * args.lines_per_document)
+    tokenizer = Tokenizer(max_length=None)
+    tokenizer.train(corpus[: len(corpus) // 2])
+    eot = tokenizer.end_of_text_token
+    documents = [
+        eot.join(corpus[i:i + args.lines_per_document])
+        for i in range(0, len(corpus), args.lines_per_document)
+    ]
+    n_chars = sum(len(doc) for doc in documents)
+
+    start = time.perf_counter()
+    expected = [legacy_encode(tokenizer, doc) for doc in documents]
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = [tokenizer(doc) for doc in documents]
+    compiled_seconds = time.perf_counter() - start
+
+    if results != expected:
+        raise AssertionError("compiled encoder output differs from the legacy loop")
+    print(f"documents: {len(documents)}, {n_chars / 1e6:.2f}M characters")
+    print(f"legacy:   {legacy_seconds:.3f}s ({n_chars / legacy_seconds / 1e6:.2f}M chars/s)")
+    print(f"compiled: {compiled_seconds:.3f}s ({n_chars / compiled_seconds / 1e6:.2f}M chars/s)")
+    print(f"speedup: {legacy_seconds / compiled_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
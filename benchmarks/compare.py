@@ -0,0 +1,71 @@
+"""
+Compare two benchmark result files written by run.py.
+
+Benchmarks are matched by name and corpus. Changes in throughput, median and
+99th percentile latency and peak RSS are printed, and a throughput drop larger
+than ``--threshold`` is marked as a regression.
+
+Usage:
+    python benchmarks/compare.py baseline.json results.json --threshold 0.1 --fail-on-regression
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Tuple
+
+
+def load_results(path: Path) -> Tuple[Dict, Dict[Tuple[str, str], Dict]]:
+    report = json.loads(path.read_text(encoding="utf-8"))
+    return report.get("environment", {}), {(r["benchmark"], r["corpus"]): r for r in report["results"]}
+
+
+def _change(old: float, new: float) -> str:
+    return f"{(new - old) / old * 100:+7.1f}%" if old else "     n/a"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline", type=Path, help="Results of the reference commit")
+    parser.add_argument("candidate", type=Path, help="Results to compare against the baseline")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Relative throughput drop reported as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 on any regression")
+    args = parser.parse_args()
+
+    base_env, baseline = load_results(args.baseline)
+    new_env, candidate = load_results(args.candidate)
+    print(f"baseline:  {base_env.get('commit')} ({base_env.get('timestamp')})")
+    print(f"candidate: {new_env.get('commit')} ({new_env.get('timestamp')})")
+    if base_env.get("platform") != new_env.get("platform") or base_env.get("cpu_count") != new_env.get("cpu_count"):
+        print("warning: results come from different machines")
+    print()
+    print(f"{'benchmark':32} {'corpus':20} {'items/s':>12} {'change':>8} {'p50':>8} {'p99':>8} {'peak RSS':>8}")
+
+    regressions = []
+    for key in sorted(baseline.keys() | candidate.keys()):
+        name, corpus = key
+        if key not in baseline or key not in candidate:
+            print(f"{name:32} {corpus:20} {'only in ' + ('candidate' if key in candidate else 'baseline'):>12}")
+            continue
+        old, new = baseline[key], candidate[key]
+        throughput_change = (new["items_per_second"] - old["items_per_second"]) / old["items_per_second"]
+        regressed = throughput_change < -args.threshold
+        if regressed:
+            regressions.append(key)
+        print(
+            f"{name:32} {corpus:20} {new['items_per_second']:12.1f} "
+            f"{_change(old['items_per_second'], new['items_per_second'])} "
+            f"{_change(old['latency_ms']['p50'], new['latency_ms']['p50'])} "
+            f"{_change(old['latency_ms']['p99'], new['latency_ms']['p99'])} "
+            f"{_change(old['peak_rss_mb'], new['peak_rss_mb'])}"
+            + ("  REGRESSION" if regressed else "")
+        )
+
+    print()
+    print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+"""
+Run the sinlib benchmark suite and write the results as JSON.
+
+Every public component is timed on synthetic corpora of several sizes and on the
+bundled Sinhala sample in ``benchmarks/fixtures``, plus any text files given with
+``--corpus``. All models and vocabularies are built from local fixtures, so the
+suite runs offline. Each benchmark runs in a fresh process, which makes its peak
+RSS meaningful, and reports throughput (best of ``--repeat`` passes) and per-call
+latency percentiles over all passes.
+
+Usage:
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --sizes small large --only tokenizer.encode romanizer --corpus crawl.txt
+    python benchmarks/compare.py baseline.json results.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+# Progress bars of Tokenizer.train would interleave with the results table.
+os.environ.setdefault("TQDM_DISABLE", "1")
+
+from _corpus import (  # noqa: E402
+    read_corpus,
+    synthetic_corpus,
+    write_romanizer_fixtures,
+    write_transliterator_fixtures,
+    write_typo_detector_fixtures,
+)
+
+SIZES = {"small": 1_000, "medium": 10_000, "large": 100_000}
+SAMPLE_CORPUS = Path(__file__).parent / "fixtures" / "sinhala_sample.txt"
+BATCH_SIZE = 64
+
+
+@dataclass
+class Workload:
+    """One pass of a benchmark: ``operation`` is called, and timed, once per input."""
+    operation: Callable[[Any], Any]
+    inputs: List[Any]
+    items: int
+    chars: int
+    # Extra figures reported once the timed passes are done
+    stats: Optional[Callable[[], Dict[str, Any]]] = None
+
+
+class Fixtures:
+    """Components built from the fixture directory, loaded on first use."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self._loaded: Dict[str, Any] = {}
+
+    def _get(self, name: str, load: Callable[[], Any]) -> Any:
+        if name not in self._loaded:
+            self._loaded[name] = load()
+        return self._loaded[name]
+
+    @property
+    def tokenizer(self):
+        from sinlib.tokenizer import Tokenizer
+
+        return self._get(
+            "tokenizer",
+            lambda: Tokenizer(max_length=None).load_from_pretrained(
+                self.directory / "tokenizer", load_default_tokenizer=False
+            ),
+        )
+
+    @property
+    def romanizer(self):
+        from sinlib import Romanizer
+
+        return self._get(
+            "romanizer",
+            lambda: Romanizer(
+                char_mapper_fp=str(self.directory / "char_map.json"),
+                tokenizer_path=str(self.directory / "tokenizer"),
+            ),
+        )
+
+    @property
+    def typo_detector(self):
+        from sinlib.spellcheck import TypoDetector
+
+        tokenizer = self.tokenizer
+
+        class LocalTypoDetector(TypoDetector):
+            def _load_tokenizer(self):
+                return tokenizer
+
+        return self._get(
+            "typo_detector",
+            lambda: LocalTypoDetector(
+                warn_unusual=False,
+                dictionary_path=self.directory / "dictionary.npy",
+                ngram_probs_path=self.directory / "ngram_probs.npy",
+            ),
+        )
+
+    def _transliterator(self, checkpoint: str, **kwargs):
+        from sinlib import Transliterator
+
+        return Transliterator(
+            model_path=self.directory / checkpoint, tokenizer_path=str(self.directory / "tokenizer"), **kwargs
+        )
+
+    @property
+    def transliterator(self):
+        return self._get("transliterator", lambda: self._transliterator("transliterator-checkpoint.pth"))
+
+    @property
+    def transliterator_small(self):
+        return self._get("transliterator_small", lambda: self._transliterator("transliterator-small.pth"))
+
+    @property
+    def transliterator_hybrid(self):
+        from sinlib import Deromanizer
+
+        return self._get(
+            "transliterator_hybrid",
+            lambda: self._transliterator(
+                "transliterator-checkpoint.pth",
+                hybrid=True,
+                deromanizer=Deromanizer(str(self.directory / "char_map.json")),
+                vocabulary=self.directory / "dictionary.npy",
+            ),
+        )
+
+
+def _batches(lines: List[str], size: int = BATCH_SIZE) -> List[List[str]]:
+    return [lines[i:i + size] for i in range(0, len(lines), size)]
+
+
+def _per_line(operation: Callable[[str], Any], lines: List[str]) -> Workload:
+    return Workload(operation, lines, len(lines), sum(map(len, lines)))
+
+
+def _per_batch(operation: Callable[[List[str]], Any], lines: List[str]) -> Workload:
+    return Workload(operation, _batches(lines), len(lines), sum(map(len, lines)))
+
+
+def _tokenizer_decode(fx: Fixtures, lines: List[str]) -> Workload:
+    encoded = [fx.tokenizer(line) for line in lines]
+    return Workload(fx.tokenizer.decode, encoded, len(lines), sum(map(len, lines)))
+
+
+def _tokenizer_batch_decode(fx: Fixtures, lines: List[str]) -> Workload:
+    tokenizer = fx.tokenizer
+    width = max(len(tokenizer(line)) for line in lines)
+    tokenizer.max_length = width
+    matrices = [
+        np.array([tokenizer(line, truncate_and_pad=True) for line in batch]) for batch in _batches(lines)
+    ]
+    return Workload(
+        lambda ids: tokenizer.batch_decode(ids, skip_special_tokens=True), matrices, len(lines), sum(map(len, lines))
+    )
+
+
+def _tokenizer_train(fx: Fixtures, lines: List[str]) -> Workload:
+    from sinlib.tokenizer import Tokenizer
+
+    return Workload(lambda texts: Tokenizer(max_length=None).train(texts), [lines], len(lines), sum(map(len, lines)))
+
+
+def _transliterator_hybrid(fx: Fixtures, lines: List[str]) -> Workload:
+    # The rule-based path needs Roman input; the romanized corpus is what it sees in use.
+    transliterator = fx.transliterator_hybrid
+    workload = _per_line(transliterator.transliterate, fx.romanizer(lines))
+    workload.stats = lambda: {"paths": transliterator.path_stats()}
+    return workload
+
+
+def _sinhala_ratio(fx: Fixtures, lines: List[str]) -> Workload:
+    from sinlib.utils.preprocessing import get_sinhala_character_ratio
+
+    return _per_line(get_sinhala_character_ratio, lines)
+
+
+def _sinhala_ratio_batch(fx: Fixtures, lines: List[str]) -> Workload:
+    from sinlib.utils.preprocessing import CorpusStatistics
+
+    # A single process, so the figure is comparable across machines.
+    statistics = CorpusStatistics(num_workers=1)
+    return Workload(statistics.sinhala_character_ratio, [lines], len(lines), sum(map(len, lines)))
+
+
+# name -> (workload builder, maximum number of lines; slow model benchmarks use a prefix)
+BENCHMARKS: Dict[str, tuple] = {
+    "tokenizer.encode": (lambda fx, lines: _per_line(fx.tokenizer, lines), None),
+    "tokenizer.encode_with_offsets": (lambda fx, lines: _per_line(fx.tokenizer.encode_with_offsets, lines), None),
+    "tokenizer.decode": (_tokenizer_decode, None),
+    "tokenizer.batch_decode": (_tokenizer_batch_decode, None),
+    "tokenizer.train": (_tokenizer_train, None),
+    "romanizer": (lambda fx, lines: _per_line(fx.romanizer, lines), None),
+    "romanizer.batch": (lambda fx, lines: _per_batch(fx.romanizer, lines), None),
+    "transliterator": (lambda fx, lines: _per_line(fx.transliterator.transliterate, lines), 200),
+    "transliterator.batch": (lambda fx, lines: _per_batch(fx.transliterator.batch_transliterate, lines), 200),
+    "transliterator.small": (lambda fx, lines: _per_line(fx.transliterator_small.transliterate, lines), 200),
+    "transliterator.hybrid": (_transliterator_hybrid, 200),
+    "typo_detector.check": (lambda fx, lines: _per_line(fx.typo_detector.check, lines), 2_000),
+    "sinhala_character_ratio": (_sinhala_ratio, None),
+    "sinhala_character_ratio.batch": (_sinhala_ratio_batch, None),
+}
+
+
+def _peak_rss_mb() -> float:
+    # On Linux ru_maxrss survives exec, so a spawned worker would report the
+    # parent's peak; the high-water mark in /proc starts afresh.
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / (1 << 10)
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / (1 << 10)
+
+
+def run_benchmark(name: str, corpus_path: str, fixtures_dir: str, repeat: int) -> Dict[str, Any]:
+    """Run one benchmark on one corpus; called in a fresh worker process."""
+    build, max_lines = BENCHMARKS[name]
+    lines = read_corpus(Path(corpus_path))[:max_lines]
+    workload = build(Fixtures(Path(fixtures_dir)), lines)
+    setup_rss_mb = _peak_rss_mb()
+
+    workload.operation(workload.inputs[0])  # warm up caches and lazy loading
+    latencies: List[float] = []
+    pass_seconds: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in workload.inputs:
+            call_start = time.perf_counter()
+            workload.operation(item)
+            latencies.append(time.perf_counter() - call_start)
+        pass_seconds.append(time.perf_counter() - start)
+
+    best = min(pass_seconds)
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) * 1e3
+    return {
+        "benchmark": name,
+        "items": workload.items,
+        "chars": workload.chars,
+        "calls": len(workload.inputs),
+        "seconds": pass_seconds,
+        "items_per_second": workload.items / best,
+        "chars_per_second": workload.chars / best,
+        "latency_ms": {"p50": p50, "p90": p90, "p99": p99, "max": max(latencies) * 1e3},
+        "setup_rss_mb": setup_rss_mb,
+        "peak_rss_mb": _peak_rss_mb(),
+        **(workload.stats() if workload.stats else {}),
+    }
+
+
+def build_fixtures(directory: Path, corpora: Dict[str, List[str]]) -> None:
+    """Write the tokenizer, character map, spell-checker data and model checkpoint."""
+    from sinlib.tokenizer import Tokenizer
+
+    training = [line for lines in corpora.values() for line in lines[:2_000]]
+    paths = write_romanizer_fixtures(directory, training)
+    tokenizer = Tokenizer(max_length=None).load_from_pretrained(paths["tokenizer_path"], load_default_tokenizer=False)
+    write_typo_detector_fixtures(directory, training, tokenizer)
+    write_transliterator_fixtures(directory, len(tokenizer))
+
+
+def _environment() -> Dict[str, Any]:
+    import sinlib
+
+    def package_version(module: str) -> Optional[str]:
+        try:
+            return __import__(module).__version__
+        except ImportError:
+            return None
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True, cwd=Path(__file__).parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "sinlib": sinlib.__version__,
+        "python": platform.python_version(),
+        "numpy": package_version("numpy"),
+        "torch": package_version("torch"),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="*", choices=SIZES, default=["small", "medium"], help="Synthetic corpora")
+    parser.add_argument("--corpus", nargs="*", type=Path, default=[], help="Additional UTF-8 corpora, one text per line")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, help="Benchmarks to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes per benchmark")
+    parser.add_argument("--output", type=Path, help="JSON file for the results")
+    args = parser.parse_args()
+
+    corpora = {f"synthetic-{size}": synthetic_corpus(SIZES[size]) for size in args.sizes}
+    corpora["sample"] = read_corpus(SAMPLE_CORPUS)
+    for path in args.corpus:
+        corpora[path.stem] = read_corpus(path)
+
+    results = []
+    context = get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        corpus_paths = {}
+        for corpus, lines in corpora.items():
+            corpus_paths[corpus] = tmp / f"{corpus}.txt"
+            corpus_paths[corpus].write_text("\n".join(lines), encoding="utf-8")
+        build_fixtures(tmp / "fixtures", corpora)
+
+        print(f"{'benchmark':32} {'corpus':20} {'items/s':>12} {'p50 ms':>9} {'p99 ms':>9} {'peak MB':>9}")
+        for name in args.only or BENCHMARKS:
+            for corpus, path in corpus_paths.items():
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    result = executor.submit(run_benchmark, name, str(path), str(tmp / "fixtures"), args.repeat).result()
+                result["corpus"] = corpus
+                results.append(result)
+                print(
+                    f"{name:32} {corpus:20} {result['items_per_second']:12.1f} "
+                    f"{result['latency_ms']['p50']:9.3f} {result['latency_ms']['p99']:9.3f} {result['peak_rss_mb']:9.1f}"
+                )
+
+    report = {"environment": _environment(), "repeat": args.repeat, "results": results}
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
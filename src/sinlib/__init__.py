@@ -7,22 +7,28 @@ of Sinhala text, along with various preprocessing utilities.
 Available Classes:
     - Tokenizer: For tokenizing Sinhala text
     - Romanizer: For converting Sinhala text to Roman characters
+    - Deromanizer: For converting Roman characters back to Sinhala text
     - Transliterator: For transliterating between scripts
 """
 
 from os import path
 from typing import List
 
-from sinlib.romanize import Romanizer
+from sinlib.romanize import Deromanizer, Romanizer
 from sinlib.tokenizer import Tokenizer
 from sinlib.transliterate import Transliterator
 from sinlib.utils import preprocessing
+from sinlib import data, lexicon, segment
 from sinlib.spellcheck import TypoDetector
 
 __all__: List[str] = [
     "Tokenizer",
     "preprocessing",
+    "segment",
+    "data",
+    "lexicon",
     "Romanizer",
+    "Deromanizer",
     "Transliterator",
     "TypoDetector"
 ]
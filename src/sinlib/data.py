@@ -0,0 +1,461 @@
+"""
+Module for caching tokenized corpora on disk.
+
+A corpus is encoded once with a Tokenizer and written as shards of flat uint16
+token IDs, each with an array of sequence offsets, described by an
+``index.json`` file. TokenDataset memory-maps the shards, so training epochs
+read cached encodings instead of tokenizing the corpus again.
+
+Layout of a dataset directory::
+
+    index.json
+    shard_00000.bin           flat uint16 token IDs
+    shard_00000.offsets.npy   int64 start of every sequence, then the total length
+    ...
+"""
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .tokenizer import Tokenizer
+
+INDEX_FILE = "index.json"
+FORMAT_VERSION = 1
+TOKEN_DTYPE = np.uint16
+
+# Tokenizer shared by write_token_shards worker processes, set once by the pool initializer.
+_WORKER_TOKENIZER: Optional[Tokenizer] = None
+
+
+def _init_encode_worker(tokenizer: Tokenizer) -> None:
+    global _WORKER_TOKENIZER
+    _WORKER_TOKENIZER = tokenizer
+
+
+def _encode_chunk(
+    texts: List[str], allowed_special_tokens: Sequence[str], tokenizer: Optional[Tokenizer] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    tokenizer = tokenizer or _WORKER_TOKENIZER
+    encoded = [tokenizer(text, allowed_special_tokens=list(allowed_special_tokens)) for text in texts]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    tokens = np.fromiter(
+        (token for ids in encoded for token in ids), dtype=TOKEN_DTYPE, count=int(lengths.sum())
+    )
+    return tokens, lengths
+
+
+class ShardWriter:
+    """
+    Writer of token ID sequences into fixed-size shards.
+
+    Sequences are appended to the current shard until it holds ``shard_size``
+    tokens; a sequence never spans two shards, and one longer than ``shard_size``
+    gets a shard of its own. The index is written by close(), so use the writer as
+    a context manager.
+
+    Attributes:
+        output_dir: Directory the shards and index are written to
+        shard_size: Maximum number of tokens per shard
+        metadata: Extra JSON-serializable entries stored in the index
+    """
+
+    def __init__(self, output_dir: Union[str, Path], shard_size: int = 1 << 24, metadata: Optional[Dict] = None):
+        """
+        Initialize the writer.
+
+        Args:
+            output_dir: Directory for the dataset. Created if missing; must not
+                already contain a dataset.
+            shard_size: Maximum number of tokens per shard
+            metadata: Extra JSON-serializable entries stored in the index
+        """
+        if shard_size < 1:
+            raise ValueError("shard_size must be positive")
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if (self.output_dir / INDEX_FILE).exists():
+            raise FileExistsError(f"A dataset already exists at {self.output_dir}")
+        self.shard_size = shard_size
+        self.metadata = dict(metadata or {})
+        self._shards: List[Dict] = []
+        self._file = None
+        self._lengths: List[np.ndarray] = []
+        self._shard_tokens = 0
+
+    def __enter__(self) -> "ShardWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        if exc_type is None:
+            self.close()
+        elif self._file is not None:
+            # Without an index the incomplete dataset cannot be opened.
+            self._file.close()
+
+    def write(self, ids: Sequence[int]) -> None:
+        """Append one sequence of token IDs."""
+        ids = np.asarray(ids)
+        self.write_batch(ids, np.array([len(ids)], dtype=np.int64))
+
+    def write_batch(self, tokens: np.ndarray, lengths: np.ndarray) -> None:
+        """
+        Append several sequences stored back to back.
+
+        Args:
+            tokens: Flat array of the token IDs of all sequences
+            lengths: Length of every sequence
+        """
+        tokens = self._as_tokens(tokens)
+        lengths = np.asarray(lengths, dtype=np.int64)
+        if int(lengths.sum()) != len(tokens):
+            raise ValueError("lengths do not add up to the number of tokens")
+
+        ends = np.cumsum(lengths)
+        first_sequence, first_token = 0, 0
+        while first_sequence < len(lengths):
+            room = self.shard_size - self._shard_tokens
+            fitting = int(np.searchsorted(ends[first_sequence:] - first_token, room, side="right"))
+            if fitting == 0:
+                if self._shard_tokens:
+                    self._close_shard()
+                    continue
+                fitting = 1
+            last_token = int(ends[first_sequence + fitting - 1])
+            self._append(tokens[first_token:last_token], lengths[first_sequence:first_sequence + fitting])
+            first_sequence, first_token = first_sequence + fitting, last_token
+            if self._shard_tokens >= self.shard_size:
+                self._close_shard()
+
+    def close(self) -> Path:
+        """
+        Finish the last shard and write the index.
+
+        Returns:
+            Path of the index file.
+        """
+        index_path = self.output_dir / INDEX_FILE
+        if self._shards is None:
+            return index_path
+        self._close_shard()
+        index = {
+            "format_version": FORMAT_VERSION,
+            "dtype": np.dtype(TOKEN_DTYPE).name,
+            "num_sequences": sum(shard["num_sequences"] for shard in self._shards),
+            "num_tokens": sum(shard["num_tokens"] for shard in self._shards),
+            "shards": self._shards,
+            **self.metadata,
+        }
+        with open(index_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=4)
+        self._shards = None
+        return index_path
+
+    @staticmethod
+    def _as_tokens(tokens) -> np.ndarray:
+        tokens = np.asarray(tokens)
+        if tokens.dtype != TOKEN_DTYPE:
+            if tokens.size and (tokens.min() < 0 or tokens.max() > np.iinfo(TOKEN_DTYPE).max):
+                raise ValueError("Token IDs must fit in uint16")
+            tokens = tokens.astype(TOKEN_DTYPE)
+        return tokens
+
+    def _append(self, tokens: np.ndarray, lengths: np.ndarray) -> None:
+        if self._file is None:
+            name = f"shard_{len(self._shards):05d}"
+            self._file = open(self.output_dir / f"{name}.bin", "wb")
+        tokens.tofile(self._file)
+        self._lengths.append(lengths)
+        self._shard_tokens += len(tokens)
+
+    def _close_shard(self) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        name = f"shard_{len(self._shards):05d}"
+        lengths = np.concatenate(self._lengths)
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        np.save(self.output_dir / f"{name}.offsets.npy", offsets)
+        self._shards.append(
+            {
+                "tokens": f"{name}.bin",
+                "offsets": f"{name}.offsets.npy",
+                "num_sequences": len(lengths),
+                "num_tokens": self._shard_tokens,
+            }
+        )
+        self._lengths, self._shard_tokens = [], 0
+
+
+def write_token_shards(
+    texts: Iterable[str],
+    tokenizer: Tokenizer,
+    output_dir: Union[str, Path],
+    shard_size: int = 1 << 24,
+    num_workers: Optional[int] = None,
+    chunk_size: int = 1024,
+    allowed_special_tokens: Sequence[str] = (),
+) -> Path:
+    """
+    Tokenize a corpus and write it as a sharded dataset.
+
+    Texts are encoded chunk by chunk on a worker pool, with at most twice as many
+    chunks in flight as there are workers, and written in input order, so corpora
+    of any size can be streamed from an open file. Line endings are stripped from
+    every text, so each line of a file becomes one sequence without a newline token.
+
+    Args:
+        texts: Iterable of texts, for example an open file
+        tokenizer: Trained tokenizer with at most 65536 tokens
+        output_dir: Directory for the dataset
+        shard_size: Maximum number of tokens per shard
+        num_workers: Number of worker processes. Defaults to the CPU count;
+            ``0`` or ``1`` encodes in the calling process.
+        chunk_size: Number of texts sent to a worker at a time
+        allowed_special_tokens: Special tokens that are encoded as such when they
+            appear in the text
+
+    Returns:
+        Path of the index file.
+
+    Examples:
+        >>> from sinlib.data import TokenDataset, write_token_shards
+        >>> with open("corpus.txt", encoding="utf-8") as f:
+        ...     write_token_shards(f, tokenizer, "corpus-tokens")
+        >>> dataset = TokenDataset("corpus-tokens")
+    """
+    if not tokenizer.vocab_map:
+        raise ValueError("Tokenizer not trained. Call train() first.")
+    if len(tokenizer) > np.iinfo(TOKEN_DTYPE).max + 1:
+        raise ValueError(f"Vocabulary of {len(tokenizer)} tokens does not fit in uint16")
+    for tok in allowed_special_tokens:
+        if tok not in tokenizer.vocab_map:
+            raise KeyError(tok)
+
+    metadata = {
+        "tokenizer": {
+            "vocab_size": len(tokenizer),
+            "unknown_token_id": tokenizer.unknown_token_id,
+            "pad_token_id": tokenizer.pad_token_id,
+            "end_of_text_token_id": tokenizer.end_of_text_token_id,
+        }
+    }
+    num_workers = (os.cpu_count() or 1) if num_workers is None else num_workers
+    texts = (text.rstrip("\r\n") for text in texts)
+    with ShardWriter(output_dir, shard_size, metadata) as writer:
+        if num_workers <= 1:
+            while True:
+                chunk = list(islice(texts, chunk_size))
+                if not chunk:
+                    break
+                writer.write_batch(*_encode_chunk(chunk, allowed_special_tokens, tokenizer))
+            return writer.close()
+
+        with ProcessPoolExecutor(
+            max_workers=num_workers, initializer=_init_encode_worker, initargs=(tokenizer,)
+        ) as executor:
+            pending: Deque = deque()
+            while True:
+                chunk = list(islice(texts, chunk_size))
+                if not chunk:
+                    break
+                pending.append(executor.submit(_encode_chunk, chunk, tuple(allowed_special_tokens)))
+                if len(pending) >= 2 * num_workers:
+                    writer.write_batch(*pending.popleft().result())
+            while pending:
+                writer.write_batch(*pending.popleft().result())
+        return writer.close()
+
+
+class TokenDataset:
+    """
+    Random access to a sharded dataset written by write_token_shards().
+
+    Shards are memory-mapped, so opening a dataset reads only the index and the
+    sequence offsets; token IDs are paged in from disk as they are accessed.
+    Items are read-only uint16 arrays, and the class can be used directly as a
+    map-style PyTorch dataset.
+
+    Attributes:
+        path: Dataset directory
+        index: Contents of ``index.json``
+        lengths: int64 array with the length of every sequence
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """
+        Open a dataset.
+
+        Args:
+            path: Dataset directory
+        """
+        self.path = Path(path)
+        with open(self.path / INDEX_FILE, "r", encoding="utf-8") as f:
+            self.index = json.load(f)
+        if self.index.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported dataset format: {self.index.get('format_version')}")
+
+        dtype = np.dtype(self.index["dtype"])
+        self._tokens: List[np.ndarray] = []
+        self._offsets: List[np.ndarray] = []
+        for shard in self.index["shards"]:
+            offsets = np.load(self.path / shard["offsets"])
+            tokens = (
+                np.memmap(self.path / shard["tokens"], dtype=dtype, mode="r", shape=(int(offsets[-1]),))
+                if offsets[-1]
+                else np.empty(0, dtype=dtype)
+            )
+            self._tokens.append(tokens)
+            self._offsets.append(offsets)
+
+        counts = [len(offsets) - 1 for offsets in self._offsets]
+        self._shard_starts = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self._shard_starts[1:])
+        self.lengths = (
+            np.concatenate([np.diff(offsets) for offsets in self._offsets])
+            if self._offsets
+            else np.empty(0, dtype=np.int64)
+        )
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def __getitem__(self, i: int) -> np.ndarray:
+        """Return the token IDs of sequence ``i``."""
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError(f"Sequence index out of range: {i}")
+        shard = int(np.searchsorted(self._shard_starts, i, side="right")) - 1
+        offsets = self._offsets[shard]
+        local = i - self._shard_starts[shard]
+        return self._tokens[shard][offsets[local]:offsets[local + 1]]
+
+    @property
+    def pad_token_id(self) -> Optional[int]:
+        """Padding token ID of the tokenizer the dataset was written with."""
+        return self.index.get("tokenizer", {}).get("pad_token_id")
+
+    def batch(
+        self, indices: Sequence[int], max_length: Optional[int] = None, pad_token_id: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Collate sequences into a padded batch.
+
+        Args:
+            indices: Sequence indices
+            max_length: Truncate sequences to this length. By default the batch is
+                as long as its longest sequence.
+            pad_token_id: Padding ID. Defaults to the tokenizer's padding token.
+
+        Returns:
+            int64 array of shape ``(len(indices), length)`` with the token IDs and an
+            int64 array with the length of every sequence before padding.
+        """
+        pad_token_id = self.pad_token_id if pad_token_id is None else pad_token_id
+        if pad_token_id is None:
+            raise ValueError("pad_token_id is required for datasets written without a tokenizer")
+        lengths = self.lengths[np.asarray(indices, dtype=np.int64)]
+        if max_length is not None:
+            lengths = np.minimum(lengths, max_length)
+        batch = np.full((len(indices), int(lengths.max(initial=0))), pad_token_id, dtype=np.int64)
+        for row, (i, length) in enumerate(zip(indices, lengths)):
+            batch[row, :length] = self[int(i)][:length]
+        return batch, lengths
+
+    def bucketed_batches(
+        self, batch_size: int, shuffle: bool = True, seed: Optional[int] = None, drop_last: bool = False
+    ) -> "LengthBucketSampler":
+        """Return a LengthBucketSampler over this dataset's sequence lengths."""
+        return LengthBucketSampler(self.lengths, batch_size, shuffle=shuffle, seed=seed, drop_last=drop_last)
+
+
+class LengthBucketSampler:
+    """
+    Batch sampler that groups sequences of similar length.
+
+    Every epoch, indices are shuffled and split into pools of
+    ``batch_size * pool_batches`` sequences. Each pool is sorted by length and cut
+    into batches, and the order of all batches is shuffled, so batches need little
+    padding while their order stays random. It yields arrays of indices and can be
+    passed as the ``batch_sampler`` of a PyTorch DataLoader.
+
+    Attributes:
+        lengths: Length of every sequence
+        batch_size: Number of sequences per batch
+        epoch: Number of completed passes, which seeds the next shuffle
+    """
+
+    def __init__(
+        self,
+        lengths: Sequence[int],
+        batch_size: int,
+        shuffle: bool = True,
+        seed: Optional[int] = None,
+        drop_last: bool = False,
+        pool_batches: int = 50,
+    ) -> None:
+        """
+        Initialize the sampler.
+
+        Args:
+            lengths: Length of every sequence
+            batch_size: Number of sequences per batch
+            shuffle: Shuffle indices and batches. Without shuffling, all sequences
+                are sorted by length.
+            seed: Seed of the shuffles; each epoch uses ``seed + epoch``
+            drop_last: Drop batches smaller than ``batch_size``
+            pool_batches: Number of batches sorted together
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        self.lengths = np.asarray(lengths)
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.seed = seed
+        self.drop_last = drop_last
+        self.pool_batches = pool_batches
+        self.epoch = 0
+
+    def __len__(self) -> int:
+        if self.drop_last:
+            return len(self.lengths) // self.batch_size
+        return sum(
+            -(-len(pool) // self.batch_size) for pool in self._pools(np.arange(len(self.lengths)))
+        )
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        rng = np.random.default_rng(None if self.seed is None else self.seed + self.epoch)
+        self.epoch += 1
+        if not self.shuffle:
+            order = np.argsort(self.lengths, kind="stable")
+            yield from self._batches(order)
+            return
+
+        batches = [
+            batch
+            for pool in self._pools(rng.permutation(len(self.lengths)))
+            for batch in self._batches(pool[np.argsort(self.lengths[pool], kind="stable")])
+        ]
+        for i in rng.permutation(len(batches)):
+            yield batches[i]
+
+    def _pools(self, indices: np.ndarray) -> List[np.ndarray]:
+        if not self.shuffle:
+            return [indices]
+        size = self.batch_size * self.pool_batches
+        return [indices[i:i + size] for i in range(0, len(indices), size)]
+
+    def _batches(self, indices: np.ndarray) -> Iterator[np.ndarray]:
+        for i in range(0, len(indices), self.batch_size):
+            batch = indices[i:i + self.batch_size]
+            if len(batch) == self.batch_size or not self.drop_last:
+                yield batch
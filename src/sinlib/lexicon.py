@@ -0,0 +1,352 @@
+"""
+Module for precomputed word-to-transliteration tables.
+
+A table is built once by running the Transliterator over a word list, for
+example a corpus vocabulary, and stored as flat memory-mapped arrays, so opening
+it costs next to nothing and lookups touch only a few pages. Passing the table to
+``Transliterator(table=...)`` answers those words without running the model.
+
+Building is split into fixed chunks of the word list, transliterated on a pool
+of worker processes, and every finished chunk is saved in a ``parts`` directory.
+Running the build again with the same word list and output directory skips the
+chunks already done, so an interrupted build resumes where it stopped.
+
+Layout of a table directory::
+
+    index.json
+    hashes.npy          sorted uint64 hashes of the words
+    keys.bin            UTF-8 words, in hash order, back to back
+    key_offsets.npy     int64 start of every word, then the total length
+    values.bin          UTF-8 transliterations, in the same order
+    value_offsets.npy   int64 start of every transliteration, then the total length
+
+Usage:
+    python -m sinlib.lexicon words.txt vocab-table --num-workers 8
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+from tqdm import tqdm
+
+INDEX_FILE = "index.json"
+FORMAT_VERSION = 1
+PARTS_DIR = "parts"
+BUILD_FILE = "build.json"
+
+# Transliterator of a build_lexicon worker process, set once by the pool initializer.
+_WORKER_TRANSLITERATOR = None
+
+
+def _hash(word: str) -> int:
+    # Stable across processes, unlike Python's hash().
+    return int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _make_transliterator(transliterator_kwargs: Dict[str, Any]):
+    from .transliterate import Transliterator
+
+    return Transliterator(**transliterator_kwargs)
+
+
+def _init_build_worker(transliterator_kwargs: Dict[str, Any]) -> None:
+    import torch
+
+    global _WORKER_TRANSLITERATOR
+    # One thread per process; the pool provides the parallelism.
+    torch.set_num_threads(1)
+    _WORKER_TRANSLITERATOR = _make_transliterator(transliterator_kwargs)
+
+
+def _transliterate_chunk(words: List[str], part_path: Path, transliterator=None) -> int:
+    transliterator = transliterator or _WORKER_TRANSLITERATOR
+    values = transliterator.batch_transliterate(words)
+    # Written under a temporary name first, so a part on disk is always complete.
+    tmp_path = part_path.with_name(part_path.stem + ".tmp.npz")
+    np.savez(tmp_path, words=np.array(words, dtype=str), values=np.array(values, dtype=str))
+    os.replace(tmp_path, part_path)
+    return len(words)
+
+
+def _word_list_digest(words: List[str]) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for word in words:
+        digest.update(word.encode("utf-8") + b"\n")
+    return digest.hexdigest()
+
+
+def _write_strings(path: Path, strings: List[str]) -> np.ndarray:
+    """Write UTF-8 strings back to back and return their offsets."""
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    with open(path, "wb") as f:
+        f.write(b"".join(encoded))
+    return offsets
+
+
+def write_lexicon_table(
+    entries: Iterable[Tuple[str, str]], output_dir: Union[str, Path], metadata: Optional[Dict] = None
+) -> Path:
+    """
+    Write word-transliteration pairs as a table.
+
+    Args:
+        entries: ``(word, transliteration)`` pairs; a repeated word keeps its
+            last transliteration
+        output_dir: Directory for the table. Created if missing.
+        metadata: Extra JSON-serializable entries stored in the index
+
+    Returns:
+        Path of the index file.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    table = dict(entries)
+    words = list(table)
+    hashes = np.fromiter((_hash(word) for word in words), dtype=np.uint64, count=len(words))
+    order = np.argsort(hashes, kind="stable")
+    words = [words[i] for i in order]
+
+    np.save(output_dir / "hashes.npy", hashes[order])
+    np.save(output_dir / "key_offsets.npy", _write_strings(output_dir / "keys.bin", words))
+    np.save(output_dir / "value_offsets.npy", _write_strings(output_dir / "values.bin", [table[w] for w in words]))
+    index = {"format_version": FORMAT_VERSION, "num_words": len(words), **(metadata or {})}
+    # The index is written last: a directory without one holds no usable table.
+    index_path = output_dir / INDEX_FILE
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, indent=4)
+    return index_path
+
+
+def build_lexicon(
+    words: Iterable[str],
+    output_dir: Union[str, Path],
+    transliterator_kwargs: Optional[Dict[str, Any]] = None,
+    num_workers: Optional[int] = None,
+    chunk_size: int = 10_000,
+    transliterator=None,
+) -> Path:
+    """
+    Transliterate a word list and write the results as a table.
+
+    The distinct words are cut into chunks of ``chunk_size`` and transliterated
+    with Transliterator.batch_transliterate() on a worker pool, with at most
+    twice as many chunks in flight as there are workers. Finished chunks are kept
+    until the table is written, so calling this again after an interruption
+    continues the same build.
+
+    Args:
+        words: Words without whitespace, for example a corpus vocabulary
+        output_dir: Directory for the table
+        transliterator_kwargs: Arguments of the Transliterator built in every
+            worker, such as ``model_path`` or ``model="small"``
+        num_workers: Number of worker processes. Defaults to the CPU count;
+            ``0`` or ``1`` transliterates in the calling process.
+        chunk_size: Number of words per chunk
+        transliterator: Transliterator used when transliterating in the calling
+            process. Built from ``transliterator_kwargs`` by default.
+
+    Returns:
+        Path of the index file.
+
+    Raises:
+        FileExistsError: If a finished table already exists in ``output_dir``
+        ValueError: If ``output_dir`` holds an unfinished build of another word
+            list or chunk size
+    """
+    output_dir = Path(output_dir)
+    if (output_dir / INDEX_FILE).exists():
+        raise FileExistsError(f"A lexicon table already exists at {output_dir}")
+    transliterator_kwargs = dict(transliterator_kwargs or {})
+    words = list(dict.fromkeys(word for word in words if word))
+
+    build = {"num_words": len(words), "chunk_size": chunk_size, "words_digest": _word_list_digest(words)}
+    parts_dir = output_dir / PARTS_DIR
+    build_path = output_dir / BUILD_FILE
+    if build_path.exists():
+        with open(build_path, "r", encoding="utf-8") as f:
+            if json.load(f) != build:
+                raise ValueError(
+                    f"{output_dir} holds an unfinished build of a different word list or chunk size; "
+                    "use another output directory or remove it"
+                )
+    else:
+        parts_dir.mkdir(parents=True, exist_ok=True)
+        with open(build_path, "w", encoding="utf-8") as f:
+            json.dump(build, f, indent=4)
+
+    chunks = [
+        (words[start:start + chunk_size], parts_dir / f"part_{i:06d}.npz")
+        for i, start in enumerate(range(0, len(words), chunk_size))
+    ]
+    todo = [(chunk, path) for chunk, path in chunks if not path.exists()]
+    num_workers = (os.cpu_count() or 1) if num_workers is None else num_workers
+    with tqdm(total=len(words), initial=len(words) - sum(len(c) for c, _ in todo), desc="Transliterating") as bar:
+        if num_workers <= 1 or len(todo) <= 1:
+            if todo:
+                transliterator = transliterator or _make_transliterator(transliterator_kwargs)
+            for chunk, path in todo:
+                bar.update(_transliterate_chunk(chunk, path, transliterator))
+        else:
+            with ProcessPoolExecutor(
+                max_workers=num_workers, initializer=_init_build_worker, initargs=(transliterator_kwargs,)
+            ) as executor:
+                pending: Deque = deque()
+                for chunk, path in todo:
+                    pending.append(executor.submit(_transliterate_chunk, chunk, path))
+                    if len(pending) >= 2 * num_workers:
+                        bar.update(pending.popleft().result())
+                while pending:
+                    bar.update(pending.popleft().result())
+
+    def entries() -> Iterator[Tuple[str, str]]:
+        for _, path in chunks:
+            with np.load(path) as part:
+                yield from zip(part["words"].tolist(), part["values"].tolist())
+
+    metadata = {
+        "transliterator": {
+            k: v if v is None or isinstance(v, (bool, int, float, str)) else str(v)
+            for k, v in transliterator_kwargs.items()
+        }
+    }
+    index_path = write_lexicon_table(entries(), output_dir, metadata)
+    shutil.rmtree(parts_dir)
+    build_path.unlink()
+    return index_path
+
+
+class LexiconTable(Mapping):
+    """
+    Read-only mapping of words to transliterations backed by memory-mapped files.
+
+    A lookup hashes the word, binary-searches the sorted hashes and compares the
+    stored bytes of the matching entries, so tables of millions of words open
+    instantly and use little memory.
+
+    Attributes:
+        path: Table directory
+        index: Contents of ``index.json``
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """
+        Open a table.
+
+        Args:
+            path: Table directory written by build_lexicon() or write_lexicon_table()
+        """
+        self.path = Path(path)
+        with open(self.path / INDEX_FILE, "r", encoding="utf-8") as f:
+            self.index = json.load(f)
+        if self.index.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported lexicon table format: {self.index.get('format_version')}")
+
+        self._hashes = np.load(self.path / "hashes.npy", mmap_mode="r")
+        self._key_offsets = np.load(self.path / "key_offsets.npy", mmap_mode="r")
+        self._value_offsets = np.load(self.path / "value_offsets.npy", mmap_mode="r")
+        self._keys = self._map_bytes("keys.bin", int(self._key_offsets[-1]))
+        self._values = self._map_bytes("values.bin", int(self._value_offsets[-1]))
+
+    def _map_bytes(self, name: str, size: int) -> np.ndarray:
+        if not size:
+            return np.empty(0, dtype=np.uint8)
+        return np.memmap(self.path / name, dtype=np.uint8, mode="r", shape=(size,))
+
+    def _key(self, i: int) -> bytes:
+        return self._keys[self._key_offsets[i]:self._key_offsets[i + 1]].tobytes()
+
+    def _find(self, word: str) -> int:
+        h = _hash(word)
+        i = int(np.searchsorted(self._hashes, np.uint64(h)))
+        encoded = word.encode("utf-8")
+        # Entries with the same hash are adjacent.
+        while i < len(self._hashes) and int(self._hashes[i]) == h:
+            if self._key(i) == encoded:
+                return i
+            i += 1
+        return -1
+
+    def get(self, word: str, default: Optional[str] = None) -> Optional[str]:
+        """Return the transliteration of ``word``, or ``default`` if it is not in the table."""
+        i = self._find(word)
+        if i < 0:
+            return default
+        return self._values[self._value_offsets[i]:self._value_offsets[i + 1]].tobytes().decode("utf-8")
+
+    def __getitem__(self, word: str) -> str:
+        value = self.get(word)
+        if value is None:
+            raise KeyError(word)
+        return value
+
+    def __contains__(self, word: object) -> bool:
+        return isinstance(word, str) and self._find(word) >= 0
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self)):
+            yield self._key(i).decode("utf-8")
+
+
+def read_word_list(path: Union[str, Path]) -> List[str]:
+    """
+    Read the distinct words of a word list.
+
+    Args:
+        path: A ``.npy`` array of words, such as the TypoDetector dictionary, or a
+            UTF-8 text file whose whitespace-separated words are used
+
+    Returns:
+        The words, in order of first appearance.
+    """
+    path = Path(path)
+    if path.suffix == ".npy":
+        return list(dict.fromkeys(np.load(path).tolist()))
+    with open(path, "r", encoding="utf-8") as f:
+        return list(dict.fromkeys(word for line in f for word in line.split()))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build a memory-mapped word-to-transliteration table.")
+    parser.add_argument("words", type=Path, help="Text file of words, or a .npy array such as the TypoDetector dictionary")
+    parser.add_argument("output_dir", type=Path, help="Directory for the table; rerun with the same one to resume")
+    parser.add_argument("--romanize", action="store_true", help="Romanize Sinhala words before transliterating them")
+    parser.add_argument("--model", default="default", help="Bundled model variant, such as 'small'")
+    parser.add_argument("--model-path", help="Custom model file")
+    parser.add_argument("--tokenizer-path", help="Saved tokenizer directory")
+    parser.add_argument("--hybrid", action="store_true", help="Use the rule-based path where it is confident")
+    parser.add_argument("--num-workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=10_000, help="Words per chunk")
+    args = parser.parse_args()
+
+    words = read_word_list(args.words)
+    if args.romanize:
+        from .romanize import Romanizer
+
+        with Romanizer() as romanizer:
+            words = romanizer.romanize_batch(words, num_workers=args.num_workers)
+    transliterator_kwargs = {"model": args.model, "hybrid": args.hybrid}
+    if args.model_path:
+        transliterator_kwargs["model_path"] = args.model_path
+    if args.tokenizer_path:
+        transliterator_kwargs["tokenizer_path"] = args.tokenizer_path
+    index_path = build_lexicon(
+        words, args.output_dir, transliterator_kwargs, num_workers=args.num_workers, chunk_size=args.chunk_size
+    )
+    print(f"wrote {LexiconTable(index_path.parent).index['num_words']} words to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
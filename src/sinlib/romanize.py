@@ -4,95 +4,503 @@ Module for romanizing Sinhala text.
 This module provides functionality to convert Sinhala text to its romanized form
 using character mapping and tokenization.
 """
-from typing import Dict, List, Optional, Set, Union
+import os
+import re
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
-from numpy.typing import NDArray
 
 from .tokenizer import Tokenizer
-from .utils.chars import ALL_SINHALA_CHARACTERS, NUBERS_AND_PUNKTS
-from .utils.preprocessing import load_char_mapper, remove_non_printable
+from .utils.chars import (
+    BASE_CONSONANTS,
+    COMPOSED_VOWEL_DIACRITICS_MAPPING,
+    DIACRITICS_MAPPING,
+    REVERSE_DIACRITICS_MAPPING,
+    REVERSE_SAN_MAPPING,
+    SAN,
+    VOWEL_DIACRITICS,
+    VOWELS,
+)
+from .utils.char_classes import CharClass, chars_with
+from .utils.instrumentation import timer
+from .utils.preprocessing import load_char_mapper
+
+_JOINERS = "\u200c\u200d"
+
+
+# Short vowels and the long vowel written when the same vowel is repeated ("kaa").
+_LONG_VOWELS = {"අ": "ආ", "ඇ": "ඈ", "ඉ": "ඊ", "උ": "ඌ", "එ": "ඒ", "ඔ": "ඕ"}
+
+# Usual Roman spelling of each vowel sign and the order in which signs are
+# preferred when a spelling does not settle a tie. "්" marks a bare consonant.
+_SIGN_SPELLINGS = {
+    "": "a", "්": "", "ා": "aa", "ි": "i", "ී": "ii", "ු": "u", "ූ": "uu", "ෙ": "e", "ේ": "ee",
+    "ො": "o", "ෝ": "oo", "ැ": "ae", "ෑ": "aee", "ෛ": "ai", "ෞ": "au", "ෘ": "ru", "ෲ": "ruu",
+}
+_SIGN_ORDER = {sign: order for order, sign in enumerate(_SIGN_SPELLINGS)}
+# Letters of the pure Sinhala alphabet, most common first, win ties between
+# consonants that share a spelling (e.g. "n" is "න" rather than "ඞ" or "ණ").
+_CONSONANT_PREFERENCE = "කගචජතදනපබමයරලවසහටඩණළ"
+
+_ROMAN_WORD_PATTERN = re.compile(r"[A-Za-z]+")
+
+_SAN_PATTERN = re.compile("|".join(sorted(REVERSE_SAN_MAPPING, key=len, reverse=True)))
+
+DeromanizedWord = namedtuple("DeromanizedWord", ["text", "ambiguous", "unknown"])
+
+# Table shared by romanize_batch worker processes, set once by the pool initializer.
+_WORKER_TABLE: Optional["RomanizationTable"] = None
+
+
+def _char_class(chars) -> str:
+    return "".join(re.escape(c) for c in sorted(chars))
+
+
+def _init_romanize_worker(table: "RomanizationTable") -> None:
+    global _WORKER_TABLE
+    _WORKER_TABLE = table
+
+
+def _romanize_chunk(texts: List[str]) -> List[str]:
+    return [_WORKER_TABLE.romanize(t) for t in texts]
+
+
+class RomanizationTable:
+    """
+    A precompiled grapheme-to-Roman translation table.
+
+    The table is built once from the character map and the tokenizer vocabulary.
+    Romanizing text is then a single regex pass that finds Sinhala graphemes,
+    segmented the same way as ``process_text``, and rewrites them in place through
+    a dict lookup. Everything outside Sinhala spans is left untouched.
+
+    Attributes:
+        table: Mapping of every known grapheme to its Roman form
+        unknown: Replacement for graphemes missing from the vocabulary
+    """
+
+    def __init__(self, char_mapper: Dict[str, str], vocab_map: Dict[str, int], unknown_token: str) -> None:
+        """
+        Compile the translation table.
+
+        Args:
+            char_mapper: Dictionary mapping Sinhala graphemes to their Roman equivalents
+            vocab_map: Tokenizer vocabulary; graphemes outside it are unknown
+            unknown_token: The tokenizer's unknown token
+        """
+        passthrough = chars_with(CharClass.DIGIT | CharClass.PUNCT) | {" "}
+        supported = chars_with(CharClass.SUPPORTED)
+        sinhala_block = chars_with(CharClass.SINHALA)
+        diacritics = chars_with(CharClass.DIACRITIC) & supported
+        letters = chars_with(CharClass.LETTER, exclude=CharClass.DIACRITIC) & supported
+        # Joiners and Sinhala code points outside the supported character set are
+        # skipped, also between a letter and its vowel sign.
+        ignorable = chars_with(CharClass.SINHALA, exclude=CharClass.SUPPORTED) | set(_JOINERS)
+
+        self.table: Dict[str, str] = {
+            token: char_mapper.get(token, token if token in passthrough else "")
+            for token in vocab_map
+        }
+        # A vowel sign is only ever emitted together with the letter before it.
+        self.table.update({c: "" for c in diacritics | ignorable})
+        self.unknown: str = char_mapper.get(unknown_token, "")
+
+        # Vowel signs typed in two parts are read as their composed form.
+        composed = "|".join(sorted(COMPOSED_VOWEL_DIACRITICS_MAPPING, key=len, reverse=True))
+        self._pattern = re.compile(
+            f"[{_char_class(letters)}](?:[{_char_class(ignorable)}]*({composed}|[{_char_class(diacritics)}]))?"
+            f"|[{_char_class(sinhala_block)}]"
+            f"|(?<=[{_char_class(sinhala_block)}])[{_JOINERS}]+"
+        )
+
+    def _lookup(self, match: "re.Match") -> str:
+        grapheme = match.group()
+        if len(grapheme) > 2:
+            # Letter, skipped characters, vowel sign: look up the letter and sign only.
+            sign = match.group(1)
+            grapheme = grapheme[0] + COMPOSED_VOWEL_DIACRITICS_MAPPING.get(sign, sign)
+        return self.table.get(grapheme, self.unknown if grapheme[0] not in _JOINERS else "")
+
+    def romanize(self, text: str) -> str:
+        """
+        Romanize the Sinhala spans of ``text``.
+
+        Args:
+            text: Input text
+
+        Returns:
+            Text with every Sinhala grapheme replaced by its Roman form.
+        """
+        return self._pattern.sub(self._lookup, text)
+
+    def romanize_with_offsets(self, text: str) -> Tuple[str, np.ndarray]:
+        """
+        Romanize ``text`` and return the alignment between source and output.
+
+        Args:
+            text: Input text
+
+        Returns:
+            The romanized text and an int32 array of shape ``(n, 4)``. Each row is
+            ``(source_start, source_end, target_start, target_end)`` for one segment:
+            a rewritten Sinhala grapheme or a run of untouched text. Rows are in
+            order and together cover both strings.
+        """
+        lookup = self._lookup
+        parts: List[str] = []
+        offsets: List[Tuple[int, int, int, int]] = []
+        source_pos = target_pos = 0
+
+        for match in self._pattern.finditer(text):
+            start, end = match.span()
+            if start > source_pos:
+                parts.append(text[source_pos:start])
+                offsets.append((source_pos, start, target_pos, target_pos + start - source_pos))
+                target_pos += start - source_pos
+            romanized = lookup(match)
+            parts.append(romanized)
+            offsets.append((start, end, target_pos, target_pos + len(romanized)))
+            target_pos += len(romanized)
+            source_pos = end
+
+        if source_pos < len(text):
+            parts.append(text[source_pos:])
+            offsets.append((source_pos, len(text), target_pos, target_pos + len(text) - source_pos))
+
+        return "".join(parts), np.array(offsets, dtype=np.int32).reshape(-1, 4)
 
 
 class Romanizer:
     """
     A class for converting Sinhala text to Roman characters.
-    
+
     This class provides functionality to convert Sinhala text to its romanized
     form while preserving non-Sinhala characters and maintaining word boundaries.
-    
+
     Attributes:
         char_mapper: Dictionary mapping Sinhala characters to their Roman equivalents
         tokenizer: Tokenizer instance for processing Sinhala text
     """
 
     def __init__(
-        self, 
-        char_mapper_fp: Optional[str] = None, 
+        self,
+        char_mapper_fp: Optional[str] = None,
         tokenizer_path: Optional[str] = None
     ) -> None:
         """
         Initialize the Romanizer with character mappings and tokenizer.
-        
+
         Args:
-            char_mapper_fp: Path to character mapping file
-            tokenizer_path: Path to tokenizer vocabulary file
+            char_mapper_fp: Path to character mapping file. Defaults to the hub file.
+            tokenizer_path: Path to a saved tokenizer directory. Defaults to the
+                pretrained tokenizer.
         """
-        self.char_mapper = load_char_mapper()
+        self.char_mapper = load_char_mapper(char_mapper_fp)
         self.tokenizer = Tokenizer(max_length=None)
-        self.tokenizer.load_from_pretrained(file_path=None, load_default_tokenizer=True)
+        if tokenizer_path is None:
+            self.tokenizer.load_from_pretrained(file_path=None, load_default_tokenizer=True)
+        else:
+            self.tokenizer.load_from_pretrained(file_path=tokenizer_path, load_default_tokenizer=False)
+        self.table = RomanizationTable(self.char_mapper, self.tokenizer.vocab_map, self.tokenizer.unknown_token)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_workers = 0
+
+    def __enter__(self) -> "Romanizer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the worker pool used by romanize_batch and romanize_stream."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+            self._executor_workers = 0
+
+    def _get_executor(self, num_workers: int) -> ProcessPoolExecutor:
+        """Return the persistent worker pool, starting it on first use."""
+        if self._executor is None or self._executor_workers != num_workers:
+            self.close()
+            self._executor = ProcessPoolExecutor(
+                max_workers=num_workers,
+                initializer=_init_romanize_worker,
+                initargs=(self.table,),
+            )
+            self._executor_workers = num_workers
+        return self._executor
 
     def __call__(self, text: Union[str, List[str]]) -> Union[str, List[str]]:
         """
         Convert input text to romanized form.
-        
+
         Args:
             text: Input text or list of texts to romanize
-            
+
         Returns:
             Romanized version of the input text
         """
-        if isinstance(text, list):
-            return [self.__romanize(t) for t in text]
-        return self.__romanize(text)
+        with timer("romanizer.romanize") as stage:
+            if isinstance(text, list):
+                stage.items = len(text)
+                return [self.table.romanize(t) for t in text]
+            return self.table.romanize(text)
 
-    def __romanize(self, text: str) -> str:
+    def romanize(
+        self, text: str, return_offsets: bool = False
+    ) -> Union[str, Tuple[str, np.ndarray]]:
         """
         Convert a single text to its romanized form.
-        
+
+        Only Sinhala spans are rewritten; spacing and any other characters are kept
+        exactly as they appear in the input.
+
         Args:
             text: Input text to romanize
-            
+            return_offsets: Also return the source/target alignment
+
         Returns:
-            Romanized version of the input text
+            Romanized version of the input text, and when ``return_offsets`` is set an
+            int32 array of ``(source_start, source_end, target_start, target_end)``
+            rows aligning each segment of the input with the output.
+
+        Examples:
+            >>> text, offsets = romanizer.romanize("hi මම", return_offsets=True)
+            >>> text
+            'hi mama'
+        """
+        with timer("romanizer.romanize"):
+            if return_offsets:
+                return self.table.romanize_with_offsets(text)
+            return self.table.romanize(text)
+
+    def romanize_batch(
+        self, texts: Iterable[str], num_workers: Optional[int] = None, chunk_size: int = 256
+    ) -> List[str]:
+        """
+        Romanize many texts using a persistent pool of worker processes.
+
+        Args:
+            texts: Texts to romanize
+            num_workers: Number of worker processes. Defaults to the CPU count;
+                ``0`` or ``1`` romanizes in the calling process.
+            chunk_size: Number of texts sent to a worker at a time
+
+        Returns:
+            Romanized texts, in input order.
+        """
+        return list(self.romanize_stream(texts, num_workers=num_workers, chunk_size=chunk_size))
+
+    def romanize_stream(
+        self,
+        texts: Iterable[str],
+        num_workers: Optional[int] = None,
+        chunk_size: int = 256,
+        max_pending: Optional[int] = None,
+    ) -> Iterator[str]:
+        """
+        Lazily romanize a stream of texts, yielding results in input order.
+
+        The input is consumed chunk by chunk and at most ``max_pending`` chunks are in
+        flight at once, so memory stays bounded for corpora of any size. The worker
+        pool is kept alive between calls; call close() or use the Romanizer as a
+        context manager to release it.
+
+        Args:
+            texts: Iterable of texts, for example an open file
+            num_workers: Number of worker processes. Defaults to the CPU count;
+                ``0`` or ``1`` romanizes in the calling process.
+            chunk_size: Number of texts sent to a worker at a time
+            max_pending: Maximum number of chunks in flight. Defaults to twice the
+                number of workers.
+
+        Yields:
+            Romanized texts.
+        """
+        num_workers = (os.cpu_count() or 1) if num_workers is None else num_workers
+        if num_workers <= 1:
+            for text in texts:
+                yield self.table.romanize(text)
+            return
+
+        executor = self._get_executor(num_workers)
+        max_pending = max_pending or 2 * num_workers
+        pending: Deque = deque()
+        texts = iter(texts)
+        while True:
+            chunk = list(islice(texts, chunk_size))
+            if not chunk:
+                break
+            pending.append(executor.submit(_romanize_chunk, chunk))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+class Deromanizer:
+    """
+    A deterministic converter from Roman characters back to Sinhala.
+
+    The character map is inverted into a trie of Roman spellings and words are
+    converted by greedy longest match. When several graphemes share a spelling, the
+    simplest well-formed one wins: independent vowels only start a word, the vowel
+    sign whose usual spelling matches the Roman letters is preferred, common letters
+    beat rare ones, and prenasalized (san) letters are written out in full unless
+    ``prefer_san`` is set. Words where these rules could not tell two graphemes
+    apart, and a tie had to be broken by letter order, are reported as ambiguous,
+    so a caller can send only those to the neural Transliterator.
+
+    Attributes:
+        char_mapper: Dictionary mapping Sinhala characters to their Roman equivalents
+    """
+
+    def __init__(self, char_mapper_fp: Optional[str] = None, prefer_san: bool = False) -> None:
+        """
+        Initialize the Deromanizer by inverting the character map.
+
+        Args:
+            char_mapper_fp: Path to character mapping file. Defaults to the hub file.
+            prefer_san: Write prenasalized consonants as single san letters (e.g. "ඳ")
+                instead of their explicit spelling (e.g. "න්ද").
+        """
+        self.char_mapper = load_char_mapper(char_mapper_fp)
+        self.prefer_san = prefer_san
+
+        candidates: Dict[str, List[str]] = {}
+        for grapheme, roman in self.char_mapper.items():
+            if roman and self._is_well_formed(grapheme):
+                candidates.setdefault(roman.lower(), []).append(grapheme)
+
+        self._trie: Dict = {}
+        for roman, graphemes in candidates.items():
+            node = self._trie
+            for char in roman:
+                node = node.setdefault(char, {})
+            graphemes.sort(key=lambda g: self._rank(g, roman))
+            node[""] = (graphemes, self._rank(graphemes[0], roman)[2] <= 0)
+
+    @staticmethod
+    def _is_well_formed(grapheme: str) -> bool:
+        if grapheme in VOWELS:
+            return True
+        return grapheme[0] in BASE_CONSONANTS and grapheme[1:] in VOWEL_DIACRITICS
+
+    def _rank(self, grapheme: str, roman: str) -> Tuple:
+        is_vowel = grapheme in VOWELS
+        is_san = grapheme[0] in SAN and not self.prefer_san
+        sign = DIACRITICS_MAPPING[grapheme] if is_vowel else grapheme[1:]
+        # Prefer the sign whose usual spelling ends the Roman string, longest first.
+        spelling = _SIGN_SPELLINGS.get(sign)
+        if spelling is None:
+            spelling_rank = 1
+        elif spelling:
+            spelling_rank = -len(spelling) if roman.endswith(spelling) else 1
+        else:
+            spelling_rank = 0 if roman[-1] not in "aeiou" else 1
+        if is_vowel:
+            order = VOWELS.index(grapheme)
+        elif grapheme[0] in _CONSONANT_PREFERENCE:
+            order = _CONSONANT_PREFERENCE.index(grapheme[0])
+        else:
+            order = len(_CONSONANT_PREFERENCE) + BASE_CONSONANTS.index(grapheme[0])
+        return (is_vowel, is_san, spelling_rank, _SIGN_ORDER.get(sign, len(_SIGN_ORDER)), order)
+
+    def _longest_match(self, word: str, start: int) -> Tuple[int, List[str]]:
+        # A match whose spelling fits its vowel sign beats a longer one that does
+        # not (e.g. "yan" mapped to "යඃ" loses to "ya" + "n").
+        node = self._trie
+        longest = fitting = (start, [])
+        for i in range(start, len(word)):
+            node = node.get(word[i])
+            if node is None:
+                break
+            if "" in node:
+                graphemes, fits = node[""]
+                longest = (i + 1, graphemes)
+                if fits:
+                    fitting = longest
+        return fitting if fitting[1] else longest
+
+    def analyze(self, word: str) -> DeromanizedWord:
         """
-        text = remove_non_printable(text)
-        chars: NDArray = np.array(list(text))
-        
-        # Create mask for Sinhala characters and allowed punctuation
-        sinhala_mask = [
-            char in ALL_SINHALA_CHARACTERS + list(NUBERS_AND_PUNKTS) + [" "]
-            for char in chars
-        ]
-        
-        # Extract Sinhala text
-        sinhala_text = "".join(chars[sinhala_mask]).strip()
-        
-        # Tokenize and decode
-        encodings = self.tokenizer(sinhala_text, truncate_and_pad=False)
-        decoded_chars = [
-            self.tokenizer.token_id_to_token_map[c] for c in encodings
-        ]
-        
-        # Convert to Roman characters
-        romanized_chars = [
-            self.char_mapper.get(ch, ch if ch in NUBERS_AND_PUNKTS.union({" "}) else '')
-            for ch in decoded_chars
-        ]
-        romanized_sinhala = "".join(romanized_chars)
-        
-        # Create word mapping and apply to full text
-        word_mapping = dict(zip(sinhala_text.split(), romanized_sinhala.split()))
-        romanized_words = [word_mapping.get(word, word) for word in text.split()]
-        
-        return " ".join(romanized_words)
+        Convert a single Roman word and report how reliable the conversion is.
+
+        Args:
+            word: Word made of Roman letters
+
+        Returns:
+            DeromanizedWord with the Sinhala text, whether a tie between graphemes
+            with the same spelling had to be broken, and whether some letters could
+            not be matched at all (those are kept as they are).
+        """
+        word = word.lower()
+        output: List[str] = []
+        ambiguous = unknown = False
+        position = 0
+
+        while position < len(word):
+            end, graphemes = self._longest_match(word, position)
+            if not graphemes:
+                output.append(word[position])
+                unknown = True
+                position += 1
+                continue
+
+            if output:
+                consonants = [g for g in graphemes if g not in VOWELS]
+                if consonants:
+                    graphemes = consonants
+            # Shared spellings the ranking settles are fine; only an unresolved tie is not.
+            roman = word[position:end]
+            if len(graphemes) > 1 and self._rank(graphemes[1], roman)[:4] == self._rank(graphemes[0], roman)[:4]:
+                ambiguous = True
+
+            if output and graphemes[0] in VOWELS:
+                output[-1], handled = self._join_vowel(output[-1], graphemes[0])
+                if handled:
+                    position = end
+                    continue
+
+            output.append(graphemes[0])
+            position = end
+
+        text = "".join(output)
+        if self.prefer_san:
+            text = _SAN_PATTERN.sub(lambda m: REVERSE_SAN_MAPPING[m.group()], text)
+        return DeromanizedWord(text, ambiguous, unknown)
+
+    @staticmethod
+    def _join_vowel(previous: str, vowel: str) -> Tuple[str, bool]:
+        """Merge a vowel following a consonant into that consonant's vowel sign."""
+        if previous in VOWELS or previous[0] not in BASE_CONSONANTS:
+            return previous, False
+        sign = previous[1:]
+        if sign == "්":
+            # A bare consonant ("k") followed by a vowel takes that vowel's sign.
+            return previous[0] + DIACRITICS_MAPPING[vowel], True
+        if REVERSE_DIACRITICS_MAPPING.get(sign) == vowel and vowel in _LONG_VOWELS:
+            # The same vowel repeated ("kaa") lengthens it.
+            return previous[0] + DIACRITICS_MAPPING[_LONG_VOWELS[vowel]], True
+        return previous, False
+
+    def deromanize(self, word: str) -> str:
+        """Convert a single Roman word to Sinhala."""
+        return self.analyze(word).text
+
+    def __call__(self, text: Union[str, List[str]]) -> Union[str, List[str]]:
+        """
+        Convert the Roman words of a text to Sinhala, keeping everything else as is.
+
+        Args:
+            text: Input text or list of texts
+
+        Returns:
+            Text with every run of Roman letters converted to Sinhala.
+        """
+        if isinstance(text, list):
+            return [self(t) for t in text]
+        return _ROMAN_WORD_PATTERN.sub(lambda m: self.analyze(m.group()).text, text)
@@ -0,0 +1,290 @@
+"""
+Module for splitting Sinhala text into words and sentences.
+
+Word and sentence boundaries are found with regular expressions whose character
+sets come from the shared codepoint class table, so vowel signs and joiners stay
+inside their words. Both splitters can also read from file objects in fixed-size
+chunks, reporting character offsets into the whole stream while keeping only the
+unfinished word or sentence in memory.
+"""
+import re
+from collections import namedtuple
+from typing import Iterable, Iterator, List, Optional
+
+from .utils.char_classes import CharClass, chars_with
+from .utils.chars import JOINERS, SENTENCE_TERMINATORS
+from .utils.preprocessing import canonicalize
+
+Span = namedtuple("Span", ["text", "start", "end"])
+
+
+def _char_set(chars) -> str:
+    return "".join(re.escape(c) for c in sorted(chars))
+
+
+_WORD_CHARS = _char_set(
+    chars_with(
+        CharClass.LETTER | CharClass.DIACRITIC | CharClass.SINHALA | CharClass.LATIN | CharClass.DIGIT,
+        exclude=CharClass.TERMINAL,
+    )
+    | set(JOINERS)
+)
+
+# Numbers with separators ("3.14", "1,000", "10:30"), then runs of word characters
+# (letters of other scripts included), then any other single visible character.
+WORD_PATTERN = re.compile(rf"[0-9]+(?:[.,:/][0-9]+)+|(?:[{_WORD_CHARS}]|[^\W_])+|\S")
+
+_TERMINATORS = _char_set(SENTENCE_TERMINATORS)
+_CLOSING = "\"'”’)]}"
+# A run of terminators with any closing quotes or brackets, followed by whitespace
+# or the end of the text, or a blank line.
+_BOUNDARY_PATTERN = re.compile(rf"[{_TERMINATORS}]+[{re.escape(_CLOSING)}]*(?=\s|$)|(?<=\S)[ \t]*\n[ \t]*\n")
+_NEXT_VISIBLE = re.compile(r"\S")
+_DROP_JOINERS = dict.fromkeys(map(ord, JOINERS))
+
+DEFAULT_ABBREVIATIONS = frozenset(
+    [
+        # Times, eras and common Sinhala abbreviations
+        "පෙ.ව.", "ප.ව.", "ක්රි.පූ.", "ක්රි.ව.", "බු.ව.", "අ.පො.ස.", "සා.පෙ.", "උ.පෙ.", "රු.", "ශ.",
+        "පි.", "ඔ.", "ආ.", "මහ.", "වි.", "නො.", "අං.", "පු.",
+        # Sinhala spellings of Latin initials
+        "ඒ.", "බී.", "සී.", "ඩී.", "ඊ.", "එෆ්.", "ජී.", "එච්.", "අයි.", "ජේ.", "කේ.", "එල්.", "එම්.",
+        "එන්.", "ඕ.", "පී.", "කිව්.", "ආර්.", "එස්.", "ටී.", "යූ.", "වී.", "ඩබ්.", "ඩබ්ලිව්.", "එක්ස්.",
+        "වයි.", "ඉසෙඩ්.",
+        # English titles and abbreviations
+        "mr.", "mrs.", "ms.", "dr.", "prof.", "st.", "no.", "vs.", "e.g.", "i.e.", "jr.", "sr.",
+    ]
+)
+
+
+def iter_words(text: str, offset: int = 0) -> Iterator[Span]:
+    """
+    Yield the words and punctuation marks of ``text``.
+
+    Args:
+        text: Input text
+        offset: Added to every reported offset
+
+    Yields:
+        Span of each word, number or punctuation mark.
+    """
+    for match in WORD_PATTERN.finditer(text):
+        yield Span(match.group(), match.start() + offset, match.end() + offset)
+
+
+def split_words(text: str) -> List[Span]:
+    """
+    Split ``text`` into words, numbers and punctuation marks.
+
+    Unlike ``str.split``, punctuation is separated from the words it touches while
+    vowel signs, joiners and decimal points stay inside their tokens.
+
+    Args:
+        text: Input text
+
+    Returns:
+        List of Spans with character offsets into ``text``.
+
+    Examples:
+        >>> [w.text for w in split_words("ශ්‍රී ලංකාව, 2024.")]
+        ['ශ්‍රී', 'ලංකාව', ',', '2024', '.']
+    """
+    return list(iter_words(text))
+
+
+def stream_words(file: Iterable[str], chunk_size: int = 1 << 16, max_word_length: int = 10_000) -> Iterator[Span]:
+    """
+    Lazily split a text stream into words.
+
+    Only the text after the last whitespace is kept between chunks, so memory
+    stays bounded by ``chunk_size`` plus ``max_word_length``.
+
+    Args:
+        file: Open text file, or any object with a ``read(size)`` method or
+            iterable of text pieces
+        chunk_size: Number of characters read at a time
+        max_word_length: Runs of text without whitespace longer than this many
+            characters are split at that length
+
+    Yields:
+        Span of each word with offsets into the whole stream.
+    """
+    if max_word_length < 1:
+        raise ValueError("max_word_length must be positive")
+    buffer, base = "", 0
+    for chunk in _read_chunks(file, chunk_size):
+        buffer += chunk
+        # The last token may continue in the next chunk.
+        keep = len(buffer) - len(buffer.rstrip())
+        cut = len(buffer) if keep else _last_space(buffer)
+        if len(buffer) - cut > max_word_length:
+            cut = len(buffer) - max_word_length
+        yield from iter_words(buffer[:cut], base)
+        buffer, base = buffer[cut:], base + cut
+    yield from iter_words(buffer, base)
+
+
+def _last_space(text: str) -> int:
+    for i in range(len(text) - 1, -1, -1):
+        if text[i].isspace():
+            return i + 1
+    return 0
+
+
+def _read_chunks(file, chunk_size: int) -> Iterator[str]:
+    if hasattr(file, "read"):
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        yield from file
+
+
+class SentenceSplitter:
+    """
+    A rule-based sentence splitter for Sinhala text.
+
+    A sentence ends at a run of ``.``, ``?``, ``!`` or ``෴`` followed by whitespace
+    (closing quotes and brackets stay with the sentence), or at a blank line. A
+    full stop does not end a sentence after a known abbreviation or a single
+    Latin initial, or when the next word starts with a lowercase Latin letter.
+
+    Attributes:
+        abbreviations: Lowercased abbreviations, each including its final full stop
+        max_sentence_length: Sentences longer than this many characters are split
+            at the last whitespace, which bounds the memory used when streaming
+    """
+
+    def __init__(
+        self,
+        abbreviations: Optional[Iterable[str]] = None,
+        max_sentence_length: int = 10_000,
+    ) -> None:
+        """
+        Initialize the splitter.
+
+        Args:
+            abbreviations: Abbreviations that do not end a sentence, such as
+                ``"පෙ.ව."``. Defaults to DEFAULT_ABBREVIATIONS.
+            max_sentence_length: Maximum length of a sentence in characters
+        """
+        if max_sentence_length < 1:
+            raise ValueError("max_sentence_length must be positive")
+        abbreviations = DEFAULT_ABBREVIATIONS if abbreviations is None else abbreviations
+        self.abbreviations = frozenset(_abbreviation_key(a) for a in abbreviations)
+        self.max_sentence_length = max_sentence_length
+
+    def split(self, text: str) -> List[Span]:
+        """
+        Split ``text`` into sentences.
+
+        Args:
+            text: Input text
+
+        Returns:
+            List of Spans with character offsets into ``text``. Leading and
+            trailing whitespace is not part of any sentence.
+
+        Examples:
+            >>> splitter = SentenceSplitter()
+            >>> [s.text for s in splitter.split("මම ගෙදර ගියා. ඔයා ආවද?")]
+            ['මම ගෙදර ගියා.', 'ඔයා ආවද?']
+        """
+        spans, _ = self._split_buffer(text, 0, final=True)
+        return spans
+
+    def __call__(self, text: str) -> List[Span]:
+        return self.split(text)
+
+    def stream(self, file: Iterable[str], chunk_size: int = 1 << 16) -> Iterator[Span]:
+        """
+        Lazily split a text stream into sentences.
+
+        Only the unfinished sentence is kept between chunks, so memory stays
+        bounded by ``chunk_size`` plus ``max_sentence_length``.
+
+        Args:
+            file: Open text file, or any object with a ``read(size)`` method or
+                iterable of text pieces
+            chunk_size: Number of characters read at a time
+
+        Yields:
+            Span of each sentence with offsets into the whole stream.
+        """
+        buffer, base = "", 0
+        for chunk in _read_chunks(file, chunk_size):
+            buffer += chunk
+            spans, consumed = self._split_buffer(buffer, base, final=False)
+            yield from spans
+            buffer, base = buffer[consumed:], base + consumed
+        spans, _ = self._split_buffer(buffer, base, final=True)
+        yield from spans
+
+    def _split_buffer(self, text: str, base: int, final: bool):
+        """Split complete sentences off ``text`` and return them with the consumed length."""
+        spans: List[Span] = []
+        start = 0
+        for match in _BOUNDARY_PATTERN.finditer(text):
+            if match.start() < start:
+                continue
+            next_visible = _NEXT_VISIBLE.search(text, match.end())
+            if next_visible is None and not final:
+                # What follows the boundary decides it; wait for more text.
+                break
+            if match.group()[0] in SENTENCE_TERMINATORS and not self._ends_sentence(text, start, match, next_visible):
+                continue
+            end = match.end() if match.group()[0] in SENTENCE_TERMINATORS else match.start()
+            start = self._emit(text, start, end, base, spans)
+
+        while len(text) - start > self.max_sentence_length:
+            limit = start + self.max_sentence_length
+            cut = _last_space(text[start:limit]) + start
+            start = self._emit(text, start, cut if cut > start else limit, base, spans)
+
+        if final:
+            start = self._emit(text, start, len(text), base, spans)
+        return spans, start
+
+    def _ends_sentence(self, text: str, start: int, match: "re.Match", next_visible: Optional["re.Match"]) -> bool:
+        terminators = match.group().rstrip(_CLOSING)
+        if terminators != ".":
+            return True
+        word_start = _last_space(text[start:match.start()]) + start
+        word = _abbreviation_key(text[word_start:match.start() + 1].lstrip(_CLOSING + "\"'“‘([{"))
+        if word in self.abbreviations:
+            return False
+        if len(word) == 2 and "a" <= word[0] <= "z":
+            # A single Latin initial, as in "J. R. Jayewardene".
+            return False
+        return next_visible is None or not ("a" <= next_visible.group() <= "z")
+
+    @staticmethod
+    def _emit(text: str, start: int, end: int, base: int, spans: List[Span]) -> int:
+        sentence = text[start:end]
+        stripped = sentence.strip()
+        if stripped:
+            offset = start + len(sentence) - len(sentence.lstrip())
+            spans.append(Span(stripped, base + offset, base + offset + len(stripped)))
+        return end
+
+
+def _abbreviation_key(word: str) -> str:
+    # Joiners are dropped so that "ක්‍රි.ව." and "ක්රි.ව." are the same abbreviation.
+    return canonicalize(word).translate(_DROP_JOINERS).lower()
+
+
+def split_sentences(text: str, abbreviations: Optional[Iterable[str]] = None) -> List[Span]:
+    """
+    Split ``text`` into sentences with a default SentenceSplitter.
+
+    Args:
+        text: Input text
+        abbreviations: Abbreviations that do not end a sentence. Defaults to
+            DEFAULT_ABBREVIATIONS.
+
+    Returns:
+        List of Spans with character offsets into ``text``.
+    """
+    return SentenceSplitter(abbreviations).split(text)
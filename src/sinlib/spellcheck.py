@@ -1,11 +1,147 @@
-from difflib import get_close_matches
-from typing import List, Dict, Union, Any
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import csv
+from enum import IntEnum
+from difflib import SequenceMatcher, get_close_matches
+from itertools import islice
+import math
+import multiprocessing
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Dict, Tuple, Union, Any, Optional
+import threading
 import warnings
-from functools import lru_cache
 from sinlib.tokenizer import Tokenizer
-from sinlib.utils.preprocessing import download_hub_file, Filenames
+from sinlib.utils import instrumentation
+from sinlib.utils.cache import CacheInfo, LRUCache
+from sinlib.utils.preprocessing import canonicalize, download_hub_file, Filenames
+from sinlib.utils.word_lm import BOS_TOKEN, EOS_TOKEN, WordBigramLM, train_word_lm
 import numpy as np
 
+NO_SUGGESTION = "No suggestion"
+
+_TOKEN_PATTERN = re.compile(r"\S+")
+
+_MATCH_CUTOFF = 0.7
+
+
+def _lengths_can_match(a: int, b: int) -> bool:
+    """Upper bound used by difflib: words this different in length can never reach the cutoff."""
+    return a + b > 0 and 2.0 * min(a, b) / (a + b) >= _MATCH_CUTOFF
+
+
+class TokenStatus(IntEnum):
+    """Outcome of checking a single token."""
+    KNOWN = 0
+    SUSPECT = 1
+    CORRECTED = 2
+
+
+CHECK_RESULT_DTYPE = np.dtype([
+    ("token", object),
+    ("start", np.int32),
+    ("end", np.int32),
+    ("status", np.int8),
+    ("probability", np.float64),
+    ("correction", object),
+    ("candidates", object),
+])
+
+_WORDS_FILE = "words_{}.npy"
+_NGRAM_KEYS_FILE = "ngram_keys.npy"
+_NGRAM_PROBS_FILE = "ngram_probs.npy"
+
+
+class _WordTable:
+    """
+    Memory-mapped dictionary read by check_corpus workers.
+
+    Words are stored in one sorted fixed-width array per word length, so a lookup
+    is a binary search in a single bucket and the candidates for a suggestion are
+    whole buckets. Every worker maps the same files, so the operating system keeps
+    one copy of the pages.
+    """
+
+    def __init__(self, directory: Union[str, Path]) -> None:
+        self._buckets: Dict[int, np.ndarray] = {
+            int(path.stem.rsplit("_", 1)[1]): np.load(path, mmap_mode="r")
+            for path in Path(directory).glob(_WORDS_FILE.format("*"))
+        }
+
+    @staticmethod
+    def write(words: Iterable[str], directory: Union[str, Path]) -> None:
+        buckets: Dict[int, List[str]] = {}
+        for w in words:
+            if w:
+                buckets.setdefault(len(w), []).append(w)
+        for length, bucket in buckets.items():
+            np.save(Path(directory) / _WORDS_FILE.format(length), np.array(sorted(bucket), dtype=f"U{length}"))
+
+    def __contains__(self, word: str) -> bool:
+        bucket = self._buckets.get(len(word))
+        if bucket is None:
+            return False
+        i = int(np.searchsorted(bucket, word))
+        return i < len(bucket) and bucket[i] == word
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self._buckets.values())
+
+    def __iter__(self) -> Iterator[str]:
+        for bucket in self._buckets.values():
+            yield from bucket.tolist()
+
+    def candidates(self, length: int) -> List[str]:
+        """Return the words whose length allows a close match with a word of ``length``."""
+        return [
+            w
+            for bucket_length, bucket in self._buckets.items()
+            if _lengths_can_match(length, bucket_length)
+            for w in bucket.tolist()
+        ]
+
+
+class _NgramTable:
+    """Memory-mapped n-gram probabilities read by check_corpus workers, as sorted keys and values."""
+
+    def __init__(self, directory: Union[str, Path]) -> None:
+        self._keys = np.load(Path(directory) / _NGRAM_KEYS_FILE, mmap_mode="r")
+        self._probs = np.load(Path(directory) / _NGRAM_PROBS_FILE, mmap_mode="r")
+
+    @staticmethod
+    def write(ngram_probs: Dict[int, float], directory: Union[str, Path]) -> None:
+        keys = np.array(sorted(ngram_probs), dtype=np.int64)
+        np.save(Path(directory) / _NGRAM_KEYS_FILE, keys)
+        np.save(Path(directory) / _NGRAM_PROBS_FILE, np.array([ngram_probs[k] for k in keys.tolist()], dtype=np.float64))
+
+    def get(self, key: int, default: float) -> float:
+        i = int(np.searchsorted(self._keys, key))
+        return float(self._probs[i]) if i < len(self._keys) and self._keys[i] == key else default
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+# Detector of each check_corpus worker process, set once by the pool initializer.
+_CORPUS_WORKER: Optional["TypoDetector"] = None
+
+
+def _init_corpus_worker(directory: str, tokenizer: Tokenizer, threshold: float, cache_size: Optional[int]) -> None:
+    global _CORPUS_WORKER
+    detector = TypoDetector(cache_size=cache_size, threshold=threshold, lazy_loading=True, warn_unusual=False)
+    detector._dictionary = _WordTable(directory)
+    detector._ngram_probs = _NgramTable(directory)
+    detector._tokenizer = tokenizer
+    detector._loaded = True
+    _CORPUS_WORKER = detector
+
+
+def _correct_words_in_worker(words: List[str]) -> List[str]:
+    return [_CORPUS_WORKER._correct_word(w) for w in words]
+
+
 class TypoDetector:
     """
     A class for detecting and correcting typos in words using n-gram probabilities.
@@ -15,37 +151,117 @@ class TypoDetector:
         _ngram_probs (Dict[int, float]): Dictionary of n-gram probabilities.
     """
     
-    def __init__(self, cache_size: int = 1000, threshold: float = 1e-8, lazy_loading: bool = False):
+    def __init__(
+        self,
+        cache_size: Optional[int] = 1000,
+        threshold: float = 1e-8,
+        lazy_loading: bool = False,
+        cache_ttl: Optional[float] = None,
+        word_lm: Optional[WordBigramLM] = None,
+        warn_unusual: bool = True,
+        dictionary_path: Optional[Union[str, Path]] = None,
+        ngram_probs_path: Optional[Union[str, Path]] = None,
+    ):
         """
         Initialize the TypoDetector with configurable caching and loading options.
         
         Args:
-            cache_size: Maximum number of entries to cache for frequent operations
+            cache_size: Maximum number of entries kept in each per-instance cache.
+                ``None`` means unbounded and ``0`` disables caching.
             threshold: Probability threshold for considering words as typos
             lazy_loading: Delay resource loading until first use
+            cache_ttl: Optional time-to-live in seconds for cached entries
+            word_lm: Optional word bigram model used by correct_sentence
+            warn_unusual: Emit a UserWarning for unusual words when called. Use
+                check() for structured results without warnings.
+            dictionary_path: Optional local dictionary file, for example one written
+                by compact(). Defaults to the hub dictionary.
+            ngram_probs_path: Optional local n-gram probability file. Defaults to the
+                hub n-gram probabilities.
         """
         self._cache_size = cache_size
+        self._cache_ttl = cache_ttl
         self._threshold = threshold
         self._lazy_loading = lazy_loading
+        self._word_lm = word_lm
+        self._warn_unusual = warn_unusual
+        self._dictionary_path = dictionary_path
+        self._ngram_probs_path = ngram_probs_path
+        self._loaded = False
+
+        # Deltas applied on top of the base dictionary and n-gram probabilities.
+        self._added_words: set = set()
+        self._ngram_overlay: Dict[int, float] = {}
+
+        # Dictionary words bucketed by length, built on first suggestion.
+        self._candidate_index: Optional[Dict[int, List[str]]] = None
+        self._candidate_index_source: Any = None
+        self._load_lock = threading.Lock()
+
+        # Caches are owned by the instance so they never keep other detectors alive
+        # and can be sized and inspected independently.
+        self._caches: Dict[str, LRUCache] = {
+            name: LRUCache(cache_size, cache_ttl, name=f"typo_detector.{name.strip('_')}")
+            for name in ["word_ngram_probability", "suggest_correction", "check_word", "__call__"]
+        }
         
         if not lazy_loading:
-            self._dictionary = self._load_dictionary()
-            self._ngram_probs = self._load_ngram_probs()
-            self._tokenizer = self._load_tokenizer()
-            # Apply caching to core methods
-            self.word_ngram_probability = lru_cache(maxsize=cache_size)(self.word_ngram_probability)
-            self.suggest_correction = lru_cache(maxsize=cache_size)(self.suggest_correction)
-            self.__call__ = lru_cache(maxsize=cache_size)(self.__call__)
+            self._ensure_loaded()
+
+    def _ensure_loaded(self) -> None:
+        """Load the dictionary, n-gram probabilities and tokenizer on first use."""
+        if self._loaded:
+            return
+        with self._load_lock:
+            if self._loaded:
+                return
+            with instrumentation.timer("typo_detector.load"):
+                self._dictionary = self._load_dictionary()
+                self._ngram_probs = self._load_ngram_probs()
+                self._tokenizer = self._load_tokenizer()
+            self._loaded = True
+
+    def cache_info(self) -> Dict[str, CacheInfo]:
+        """
+        Return hit/miss statistics for every per-instance cache.
+
+        Returns:
+            Mapping of cached operation name to its CacheInfo.
+        """
+        return {name: cache.cache_info() for name, cache in self._caches.items()}
+
+    def cache_clear(self) -> None:
+        """Empty every per-instance cache and reset its statistics."""
+        for cache in self._caches.values():
+            cache.clear()
     
+    def __getstate__(self) -> Dict[str, Any]:
+        # Locks cannot be pickled; caches pickle as empty caches of the same size.
+        state = self.__dict__.copy()
+        del state["_load_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._load_lock = threading.Lock()
+
     def _load_dictionary(self) -> set:
         """
         Load the dictionary as a set for O(1) lookups.
 
+        Words are canonicalized, in one pass over the joined word list, so they
+        match canonicalized input however they were encoded.
+
         Returns:
             Set of valid words.
         """
-        dictionary_path = download_hub_file(Filenames.DICTIONARY.value)
-        return set(np.load(dictionary_path).tolist())
+        dictionary_path = self._dictionary_path or download_hub_file(Filenames.DICTIONARY.value)
+        if instrumentation.is_enabled():
+            instrumentation.count("typo_detector.load", "bytes_loaded", os.path.getsize(dictionary_path))
+        words = np.load(dictionary_path).tolist()
+        if not words:
+            return set()
+        return set(canonicalize("\n".join(words)).split("\n"))
 
     def _load_ngram_probs(self) -> Dict[int, float]:
         """
@@ -53,7 +269,9 @@ class TypoDetector:
         Returns:
             Dictionary mapping n-gram keys to probabilities.
         """
-        ngram_probs_path = download_hub_file(Filenames.NGRAM_PROBS.value)
+        ngram_probs_path = self._ngram_probs_path or download_hub_file(Filenames.NGRAM_PROBS.value)
+        if instrumentation.is_enabled():
+            instrumentation.count("typo_detector.load", "bytes_loaded", os.path.getsize(ngram_probs_path))
         loaded_data = np.load(ngram_probs_path, allow_pickle=True)
         return loaded_data.item() if hasattr(loaded_data, 'item') else loaded_data
 
@@ -70,22 +288,25 @@ class TypoDetector:
     @property
     def dictionary(self) -> str:
         """Return a description of the dictionary."""
-        return f"Dictionary containing {len(self._dictionary)} words. Use .get_dictionary() to access the full list."
+        self._ensure_loaded()
+        return f"Dictionary containing {len(self._dictionary) + len(self._added_words)} words. Use .get_dictionary() to access the full list."
     
     def get_dictionary(self) -> List[str]:
         """Return the full dictionary list."""
-        return self._dictionary
+        self._ensure_loaded()
+        return self._dictionary | self._added_words if self._added_words else self._dictionary
     
     @property
     def ngram_probs(self) -> str:
         """Return a description of the n-gram probabilities."""
+        self._ensure_loaded()
         return f"N-gram probability dictionary with {len(self._ngram_probs)} entries. Use .get_ngram_probs() to access the full dictionary."
     
     def get_ngram_probs(self) -> Dict[int, float]:
         """Return the full n-gram probabilities dictionary."""
+        self._ensure_loaded()
         return self._ngram_probs
     
-    @lru_cache(maxsize=1000)
     def word_ngram_probability(self, word: str, n: int = 2) -> float:
         """
         Calculate the probability of a word based on its n-grams.
@@ -97,14 +318,23 @@ class TypoDetector:
         Returns:
             Probability score for the word.
         """
-        word = self._tokenizer(word, truncate_and_pad=False)
+        self._ensure_loaded()
+        return self._caches["word_ngram_probability"].get_or_compute(
+            (word, n), lambda: self._word_ngram_probability(word, n)
+        )
+
+    def _word_ngram_probability(self, word: str, n: int) -> float:
         prob = 1.0
-        for i in range(len(word) - n + 1):
-            ngram = word[i:i+n]
-            ngram_key = map(str, ngram)
-            ngram_key = "".join(ngram_key)
-            prob *= self._ngram_probs.get(int(ngram_key), 1e-9)  # Small value for unseen n-grams
+        for ngram_key in self._ngram_keys(word, n):
+            if ngram_key in self._ngram_overlay:
+                prob *= self._ngram_overlay[ngram_key]
+            else:
+                prob *= self._ngram_probs.get(ngram_key, 1e-9)  # Small value for unseen n-grams
         return prob
+
+    def _ngram_keys(self, word: str, n: int) -> List[int]:
+        word = self._tokenizer(word, truncate_and_pad=False)
+        return [int("".join(map(str, word[i:i+n]))) for i in range(len(word) - n + 1)]
     
     def suggest_correction(self, word: str, n: int = 3) -> List[str]:
         """
@@ -117,8 +347,149 @@ class TypoDetector:
         Returns:
             List of suggested corrections.
         """
-        matches = get_close_matches(word, self._dictionary, n=n, cutoff=0.7)
-        return matches if matches else ["No suggestion"]
+        self._ensure_loaded()
+        matches = self._caches["suggest_correction"].get_or_compute(
+            (word, n), lambda: self._close_matches(word, n)
+        )
+        return list(matches) if matches else [NO_SUGGESTION]
+
+    def _close_matches(self, word: str, n: int) -> Tuple[str, ...]:
+        with instrumentation.timer("typo_detector.suggest_correction"):
+            return tuple(get_close_matches(word, self._candidates_for(word), n=n, cutoff=_MATCH_CUTOFF))
+
+    def _candidates_for(self, word: str) -> List[str]:
+        """Return the dictionary words whose length allows a close match with ``word``."""
+        if isinstance(self._dictionary, _WordTable):
+            # A check_corpus worker reads the buckets from the shared table.
+            return self._dictionary.candidates(len(word))
+        if self._candidate_index is None or self._candidate_index_source is not self._dictionary:
+            index: Dict[int, List[str]] = {}
+            for w in self._dictionary:
+                index.setdefault(len(w), []).append(w)
+            for w in self._added_words:
+                index.setdefault(len(w), []).append(w)
+            self._candidate_index = index
+            self._candidate_index_source = self._dictionary
+
+        return [
+            w
+            for length, bucket in self._candidate_index.items()
+            if _lengths_can_match(len(word), length)
+            for w in bucket
+        ]
+
+    def _is_known(self, word: str) -> bool:
+        return word in self._dictionary or word in self._added_words
+
+    def add_words(self, words: Iterable[str]) -> int:
+        """
+        Add words to the dictionary overlay without reloading the base dictionary.
+
+        Only cached results that the new words can change are invalidated: entries
+        for the words themselves and suggestions for unknown words of a compatible
+        length.
+
+        Args:
+            words: Words to add.
+
+        Returns:
+            Number of words that were not already known.
+        """
+        self._ensure_loaded()
+        added = {w for w in map(canonicalize, words) if not self._is_known(w)}
+        if not added:
+            return 0
+
+        self._added_words.update(added)
+        if self._candidate_index is not None:
+            for w in added:
+                self._candidate_index.setdefault(len(w), []).append(w)
+
+        lengths = {len(w) for w in added}
+
+        def affected(word: str) -> bool:
+            return word in added or (
+                not self._is_known(word) and any(_lengths_can_match(len(word), length) for length in lengths)
+            )
+
+        self._caches["suggest_correction"].invalidate(lambda key: affected(key[0]))
+        self._invalidate_words(affected)
+        return len(added)
+
+    def update_ngrams(self, corpus_iter: Iterable[str], n: int = 2) -> int:
+        """
+        Update n-gram probabilities from a stream of text.
+
+        Each n-gram observed in the update takes the larger of its current probability
+        and its relative frequency in the update, so adding domain text never makes
+        its own n-grams less plausible. Only cached results for words containing a
+        changed n-gram are invalidated.
+
+        Args:
+            corpus_iter: Iterable of texts, consumed as a stream.
+            n: Size of n-grams, matching word_ngram_probability.
+
+        Returns:
+            Number of n-gram probabilities that changed.
+        """
+        self._ensure_loaded()
+        counts: Counter = Counter()
+        for text in corpus_iter:
+            for w in text.split():
+                counts.update(self._ngram_keys(w, n))
+
+        total = sum(counts.values())
+        changed = set()
+        for key, count in counts.items():
+            current = self._ngram_overlay.get(key, self._ngram_probs.get(key, 0.0))
+            if count / total > current:
+                self._ngram_overlay[key] = count / total
+                changed.add(key)
+        if not changed:
+            return 0
+
+        def affected(word: str) -> bool:
+            return not changed.isdisjoint(self._ngram_keys(word, n))
+
+        self._caches["word_ngram_probability"].invalidate(lambda key: key[1] == n and affected(key[0]))
+        self._invalidate_words(affected)
+        return len(changed)
+
+    def _invalidate_words(self, affected: Callable[[str], bool]) -> None:
+        self._caches["check_word"].invalidate(affected)
+        self._caches["__call__"].invalidate(lambda text: any(affected(w) for w in text.split()))
+
+    def compact(self, save_path: Union[str, Path]) -> Tuple[Path, Path]:
+        """
+        Merge the overlays into new base dictionary and n-gram files.
+
+        The files use the same format as the hub artifacts and can be passed back as
+        ``dictionary_path`` and ``ngram_probs_path``. After compaction the overlays
+        are empty and this detector uses the merged data as its base.
+
+        Args:
+            save_path: Directory to write the files to.
+
+        Returns:
+            Paths of the written dictionary and n-gram probability files.
+        """
+        self._ensure_loaded()
+        save_path = Path(save_path)
+        save_path.mkdir(parents=True, exist_ok=True)
+
+        dictionary = set(self._dictionary) | self._added_words
+        ngram_probs = {**self._ngram_probs, **self._ngram_overlay}
+
+        dictionary_path = save_path / Filenames.DICTIONARY.value
+        ngram_probs_path = save_path / Filenames.NGRAM_PROBS.value
+        np.save(dictionary_path, np.array(sorted(dictionary)))
+        np.save(ngram_probs_path, np.array(ngram_probs, dtype=object), allow_pickle=True)
+
+        self._dictionary = dictionary
+        self._ngram_probs = ngram_probs
+        self._added_words = set()
+        self._ngram_overlay = {}
+        return dictionary_path, ngram_probs_path
     
     def __call__(self, text: str) -> str:
         """
@@ -130,26 +501,284 @@ class TypoDetector:
         Returns:
             Corrected sentence.
         """
-        corrected = []
-        words = text.split() if isinstance(text, str) else [str(text)]
-        
+        self._ensure_loaded()
+        if not isinstance(text, str):
+            text = str(text)
+            return self._join_corrections(text, self._check_text(text))
+        # The canonical text is the cache key; tokens that are not corrected are
+        # returned as typed.
+        key = canonicalize(text)
+        corrections = self._caches["__call__"].get_or_compute(key, lambda: self._check_text(text))
+        return self._join_corrections(text, corrections)
+
+    def _check_text(self, text: str) -> Tuple[Optional[str], ...]:
+        """Return the correction of every token of ``text``, or None for tokens that are kept."""
+        result = self.check(text)
+        if self._warn_unusual:
+            for w in result.token[result.status == TokenStatus.SUSPECT]:
+                warnings.warn(f"'{w}' is unusual but may not be a typo", UserWarning)
+        return tuple(
+            str(correction) if status == TokenStatus.CORRECTED else None
+            for status, correction in zip(result.status, result.correction)
+        )
+
+    @staticmethod
+    def _join_corrections(text: str, corrections: Tuple[Optional[str], ...]) -> str:
+        tokens = _TOKEN_PATTERN.findall(text)
+        return ' '.join(w if c is None else c for w, c in zip(tokens, corrections))
+
+    def check(self, text: str) -> np.recarray:
+        """
+        Check text for spelling errors and return one structured record per token.
+
+        Unlike calling the detector, this never emits warnings, so it is the cheap
+        path for systems that consume the results programmatically.
+
+        Args:
+            text: The sentence to check.
+
+        Returns:
+            Record array with dtype CHECK_RESULT_DTYPE. ``start``/``end`` are the
+            character span of each whitespace-separated token in ``text``, ``status``
+            is a TokenStatus, ``probability`` is the n-gram score (NaN for dictionary
+            words, which are not scored), ``correction`` is the replacement token and
+            ``candidates`` the suggestions considered. Words are looked up in
+            canonical form, but tokens that are not corrected keep the
+            spelling of ``text``.
+
+        Examples:
+            >>> result = typo_detector.check("මම ගෙදර ගියා")
+            >>> result.status
+            array([0, 0, 0], dtype=int8)
+        """
+        self._ensure_loaded()
+        cache = self._caches["check_word"]
+        records = []
+        with instrumentation.timer("typo_detector.check") as stage:
+            for match in _TOKEN_PATTERN.finditer(text):
+                w = match.group()
+                key = canonicalize(w)
+                status, prob, correction, candidates = cache.get_or_compute(key, lambda: self._analyze_word(key))
+                if status != TokenStatus.CORRECTED:
+                    correction = w
+                records.append((w, match.start(), match.end(), status, prob, correction, candidates))
+            stage.items = len(records)
+        return np.array(records, dtype=CHECK_RESULT_DTYPE).view(np.recarray)
+
+    def _analyze_word(self, word: str) -> Tuple[int, float, str, Tuple[str, ...]]:
+        if self._is_known(word):
+            return TokenStatus.KNOWN, math.nan, word, ()
+
+        prob = self.word_ngram_probability(word)
+        if prob >= self._threshold:
+            return TokenStatus.SUSPECT, prob, word, ()
+
+        candidates = tuple(c for c in self.suggest_correction(word) if c != NO_SUGGESTION)
+        if not candidates:
+            return TokenStatus.SUSPECT, prob, word, ()
+        return TokenStatus.CORRECTED, prob, candidates[0], candidates
+
+    def _correct_word(self, word: str) -> str:
+        """Return the best correction for a single word, or the word itself as typed."""
+        key = canonicalize(word)
+        status, _, correction, _ = self._caches["check_word"].get_or_compute(key, lambda: self._analyze_word(key))
+        return correction if status == TokenStatus.CORRECTED else word
+
+    def check_corpus(
+        self,
+        documents: Iterable[str],
+        num_workers: Optional[int] = None,
+        chunk_size: int = 1000,
+        report_path: Optional[Union[str, Path]] = None,
+    ) -> Iterator[str]:
+        """
+        Correct a stream of documents, yielding rewritten documents in input order.
+
+        Documents are read in chunks. Out-of-vocabulary words are deduplicated across
+        the whole corpus, so each unique word is corrected only once, and new words
+        are corrected in parallel by worker processes. Words are looked up in
+        canonical form, so encoding variants of dictionary words are left alone.
+        Only corrected words are rewritten; whitespace and line breaks are kept.
+
+        Before the workers start, the dictionary and n-gram probabilities,
+        overlays included, are written once to a temporary directory as NumPy
+        arrays that every worker opens with ``mmap_mode="r"``, so all workers
+        share one copy through the page cache whatever the start method. Only
+        the tokenizer is sent to each worker.
+
+        Args:
+            documents: Iterable of documents, consumed lazily.
+            num_workers: Number of worker processes. Defaults to the CPU count;
+                ``0`` or ``1`` corrects words in the calling process.
+            chunk_size: Number of documents read before correcting their new words.
+            report_path: Optional path of a tab-separated report with one row per
+                out-of-vocabulary word: the word, its correction and its frequency.
+                It is written once the corpus has been fully consumed.
+
+        Yields:
+            Corrected documents.
+        """
+        self._ensure_loaded()
+        num_workers = (os.cpu_count() or 1) if num_workers is None else num_workers
+        corrections: Dict[str, str] = {}
+        frequencies: Counter = Counter()
+
+        executor = tables = None
+        if num_workers > 1:
+            tables = tempfile.TemporaryDirectory(prefix="sinlib-typo-")
+            self._write_corpus_tables(tables.name)
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("fork" if "fork" in methods else None)
+            executor = ProcessPoolExecutor(
+                max_workers=num_workers,
+                mp_context=context,
+                initializer=_init_corpus_worker,
+                initargs=(tables.name, self._tokenizer, self._threshold, self._cache_size),
+            )
+
+        def rewrite(match: "re.Match") -> str:
+            return corrections.get(match.group(), match.group())
+
+        try:
+            documents = iter(documents)
+            while True:
+                chunk = list(islice(documents, chunk_size))
+                if not chunk:
+                    break
+
+                new_words = []
+                for doc in chunk:
+                    for w in _TOKEN_PATTERN.findall(doc):
+                        if self._is_known(canonicalize(w)):
+                            continue
+                        frequencies[w] += 1
+                        if w not in corrections:
+                            corrections[w] = w
+                            new_words.append(w)
+
+                if new_words:
+                    corrections.update(zip(new_words, self._correct_words(new_words, executor, num_workers)))
+
+                for doc in chunk:
+                    yield _TOKEN_PATTERN.sub(rewrite, doc)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+            if tables is not None:
+                tables.cleanup()
+
+        if report_path is not None:
+            with open(report_path, "w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f, delimiter="\t")
+                writer.writerow(["word", "correction", "count"])
+                for word, count in frequencies.most_common():
+                    writer.writerow([word, corrections[word], count])
+
+    def _write_corpus_tables(self, directory: Union[str, Path]) -> None:
+        """Write the dictionary and n-gram probabilities as the memory-mapped tables of the workers."""
+        _WordTable.write(self.get_dictionary(), directory)
+        _NgramTable.write({**self._ngram_probs, **self._ngram_overlay}, directory)
+
+    def _correct_words(
+        self, words: List[str], executor: Optional[ProcessPoolExecutor], num_workers: int
+    ) -> List[str]:
+        if executor is None:
+            return [self._correct_word(w) for w in words]
+        batch_size = max(1, math.ceil(len(words) / (num_workers * 4)))
+        batches = [words[i:i + batch_size] for i in range(0, len(words), batch_size)]
+        return [c for batch in executor.map(_correct_words_in_worker, batches) for c in batch]
+
+    def train_word_lm(self, corpus_iter: Iterable[str], **kwargs: Any) -> WordBigramLM:
+        """
+        Train and attach the word bigram model used by correct_sentence.
+
+        Args:
+            corpus_iter: Iterable of sentences, consumed as a stream and
+                canonicalized like the text passed to correct_sentence
+            **kwargs: Extra options forwarded to sinlib.utils.word_lm.train_word_lm
+
+        Returns:
+            The trained WordBigramLM.
+        """
+        self._word_lm = train_word_lm(corpus_iter, **kwargs)
+        return self._word_lm
+
+    def load_word_lm(self, load_path: Union[str, Path]) -> WordBigramLM:
+        """
+        Load and attach a word bigram model saved with WordBigramLM.save.
+
+        Args:
+            load_path: Directory containing the model
+
+        Returns:
+            The loaded WordBigramLM.
+        """
+        self._word_lm = WordBigramLM.load(load_path)
+        return self._word_lm
+
+    def correct_sentence(self, text: str, n_candidates: int = 3, keep_prior: float = 0.05) -> str:
+        """
+        Correct a sentence using sentence context.
+
+        Every suspicious word gets the word itself plus up to ``n_candidates``
+        dictionary suggestions as candidates. The jointly most likely sequence is then
+        picked with Viterbi decoding over the word bigram model, scoring suggestions by
+        their string similarity to the original word.
+
+        Args:
+            text: The sentence to correct.
+            n_candidates: Maximum number of suggestions considered per suspicious word.
+            keep_prior: Prior probability of keeping a suspicious word unchanged.
+
+        Returns:
+            Corrected sentence.
+        """
+        if self._word_lm is None:
+            raise ValueError("No word language model. Call train_word_lm() or load_word_lm() first.")
+        self._ensure_loaded()
+
+        # Candidates come from the canonical words; a word that is kept stays as typed.
+        typed = text.split()
+        words = canonicalize(text).split()
+        if not words:
+            return ""
+
+        lm = self._word_lm
+        prev_ids = lm.word_ids([BOS_TOKEN])
+        scores = np.zeros(1)
+        backpointers = []
+        candidates_per_word = []
+
         for w in words:
-            try:
-                # Convert dictionary to set for O(1) lookups
-                if w in set(self._dictionary):
-                    corrected.append(w)
-                    continue
-                
-                prob = self.word_ngram_probability(w)
-                
-                if prob < 1e-8:
-                    suggestions = self.suggest_correction(w)
-                    corrected.append(suggestions[0] if suggestions else w)
-                else:
-                    warnings.warn(f"'{w}' is unusual but may not be a typo", UserWarning)
-                    corrected.append(w)
-            except Exception as e:
-                warnings.warn(f"Error processing word '{w}': {str(e)}")
-                corrected.append(w)
-        
-        return ' '.join(corrected)
\ No newline at end of file
+            candidates, emissions = self._sentence_candidates(w, n_candidates, keep_prior)
+            candidate_ids = lm.word_ids(candidates)
+            totals = scores[:, None] + lm.transition_log_probs(prev_ids, candidate_ids) + emissions[None, :]
+            best_prev = totals.argmax(axis=0)
+            scores = totals[best_prev, np.arange(len(candidates))]
+            backpointers.append(best_prev)
+            candidates_per_word.append(candidates)
+            prev_ids = candidate_ids
+
+        scores = scores + lm.transition_log_probs(prev_ids, lm.word_ids([EOS_TOKEN]))[:, 0]
+        best = int(scores.argmax())
+        corrected = []
+        for original, candidates, pointers in zip(
+            reversed(typed), reversed(candidates_per_word), reversed(backpointers)
+        ):
+            # The first candidate is always the word itself.
+            corrected.append(original if best == 0 else candidates[best])
+            best = int(pointers[best])
+        return " ".join(reversed(corrected))
+
+    def _sentence_candidates(self, word: str, n_candidates: int, keep_prior: float):
+        if self._is_known(word) or self.word_ngram_probability(word) >= self._threshold:
+            return [word], np.zeros(1)
+
+        candidates = [word]
+        emissions = [math.log(keep_prior)]
+        for suggestion in self.suggest_correction(word, n=n_candidates):
+            if suggestion == NO_SUGGESTION or suggestion in candidates:
+                continue
+            candidates.append(suggestion)
+            emissions.append(math.log(SequenceMatcher(None, word, suggestion).ratio()))
+        return candidates, np.array(emissions)
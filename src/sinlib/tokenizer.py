@@ -6,14 +6,112 @@ with support for special tokens, memory-efficient training, and vocabulary manag
 """
 
 import json
+import re
 import warnings
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Union
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple, Union
 import concurrent.futures
 
+import numpy as np
 from tqdm import tqdm
 
-from .utils.preprocessing import process_text, load_default_vocab_map, load_default_config
+from .utils.instrumentation import timed, timer
+from .utils.preprocessing import (
+    GRAPHEME_PATTERN,
+    canonicalize,
+    canonicalize_with_offsets,
+    process_text,
+    load_default_vocab_map,
+    load_default_config,
+)
+
+
+class _CompiledEncoder:
+    """
+    Encoder built once from a trained vocabulary.
+
+    Text is scanned in a single regex pass: the end-of-text token and any allowed
+    special tokens are matched by an alternation placed before the grapheme
+    pattern used by ``process_text``, and every match is mapped through the
+    vocabulary dict.
+    """
+
+    def __init__(
+        self,
+        vocab_map: Dict[str, int],
+        unknown_token_id: int,
+        end_of_text_token: str,
+        normalize: bool,
+    ) -> None:
+        self.vocab_map = dict(vocab_map)
+        self.unknown_token_id = unknown_token_id
+        self.end_of_text_token = end_of_text_token
+        self.end_of_text_token_id = vocab_map[end_of_text_token]
+        self.normalize = normalize
+        self._patterns: Dict[FrozenSet[str], "re.Pattern"] = {}
+
+    def _pattern(self, allowed_special_tokens: FrozenSet[str]) -> "re.Pattern":
+        pattern = self._patterns.get(allowed_special_tokens)
+        if pattern is None:
+            specials = sorted({self.end_of_text_token, *allowed_special_tokens}, key=len, reverse=True)
+            pattern = re.compile("|".join(map(re.escape, specials)) + "|" + GRAPHEME_PATTERN.pattern)
+            self._patterns[allowed_special_tokens] = pattern
+        return pattern
+
+    def tokens(self, text: str, allowed_special_tokens: Iterable[str] = ()) -> List[str]:
+        """Split ``text`` into graphemes and allowed special tokens."""
+        if self.normalize:
+            text = canonicalize(text)
+        return self._pattern(frozenset(allowed_special_tokens)).findall(text)
+
+    def encode(self, text: str, allowed_special_tokens: Iterable[str] = ()) -> List[int]:
+        """Encode ``text`` into token IDs."""
+        get, unknown = self.vocab_map.get, self.unknown_token_id
+        ids = [get(token, unknown) for token in self.tokens(text, allowed_special_tokens)]
+        if self.end_of_text_token in text:
+            # Every part of a text split by end-of-text tokens is followed by one,
+            # including the last part.
+            ids.append(self.end_of_text_token_id)
+        return ids
+
+    def encode_with_offsets(
+        self, text: str, allowed_special_tokens: Iterable[str] = ()
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Encode ``text`` into token IDs and ``(start, end)`` character offsets.
+
+        Offsets index the original ``text``, before canonicalization. They are
+        derived from the token lengths whenever the tokens cover the whole text,
+        and from the match positions otherwise (stray vowel signs are skipped by
+        the grapheme pattern).
+        """
+        positions = None
+        if self.normalize:
+            canonical, positions = canonicalize_with_offsets(text)
+        else:
+            canonical = text
+        pattern = self._pattern(frozenset(allowed_special_tokens))
+        tokens = pattern.findall(canonical)
+
+        get, unknown = self.vocab_map.get, self.unknown_token_id
+        count = len(tokens) + (self.end_of_text_token in text)
+        ids = np.fromiter((get(token, unknown) for token in tokens), dtype=np.int32, count=len(tokens))
+        lengths = np.fromiter(map(len, tokens), dtype=np.int32, count=len(tokens))
+        ends = np.cumsum(lengths, dtype=np.int32)
+        offsets = np.empty((count, 2), dtype=np.int32)
+        if not tokens or ends[-1] == len(canonical):
+            offsets[:len(tokens), 0] = ends - lengths
+            offsets[:len(tokens), 1] = ends
+        else:
+            spans = [match.span() for match in pattern.finditer(canonical)]
+            offsets[:len(tokens)] = np.array(spans, dtype=np.int32).reshape(-1, 2)
+        if positions is not None:
+            offsets[:len(tokens)] = positions[offsets[:len(tokens)]]
+        if count > len(tokens):
+            # The trailing end-of-text token added by encode() has an empty span.
+            ids = np.append(ids, np.int32(self.end_of_text_token_id))
+            offsets[-1] = len(text)
+        return ids, offsets
 
 
 class Tokenizer:
@@ -22,9 +120,18 @@ class Tokenizer:
         max_length: int,
         unknown_token: str = "<|unk|>",
         pad_token: str = "<|pad|>",
-        end_of_text_token: str = "<|end_of_text|>"
+        end_of_text_token: str = "<|end_of_text|>",
+        normalize: bool = True
     ) -> None:
-        """Initialize the tokenizer with specified parameters."""
+        """
+        Initialize the tokenizer with specified parameters.
+
+        With ``normalize`` set, text is canonicalized (stray joiners dropped, split vowel
+        signs composed) before training and encoding, so every encoding of a
+        grapheme maps to the same token. The flag is saved with the tokenizer;
+        loaded configs without it, such as the pretrained tokenizer's, keep
+        encoding raw text.
+        """
         # Special tokens
         self.unknown_token: str = unknown_token
         self.pad_token: str = pad_token
@@ -33,6 +140,7 @@ class Tokenizer:
         
         # Configuration
         self.max_length: int = max_length
+        self.normalize: bool = normalize
         
         # Token mappings
         self.vocab_map: Optional[Dict[str, int]] = None
@@ -47,6 +155,13 @@ class Tokenizer:
         self.tokenized_chars: List[str] = []
         self.unique_chars: Set[str] = set()
 
+        # Encoder and decoding tables compiled once training or loading finishes
+        self._encoder: Optional[_CompiledEncoder] = None
+        self._decode_table: Optional[np.ndarray] = None
+        self._special_mask: Optional[np.ndarray] = None
+        self._special_token_ids: FrozenSet[int] = frozenset()
+
+    @timed("tokenizer.encode")
     def __encode(
         self,
         text: str,
@@ -56,22 +171,13 @@ class Tokenizer:
         """Encode text into token IDs."""
         if not self.vocab_map:
             raise ValueError("Tokenizer not trained. Call train() first.")
+        if self._encoder is None:
+            self.__build_encoder()
 
-        allowed_token_ids = [self.vocab_map[tok] for tok in allowed_special_tokens]
-        text_encodings: List[int] = []
-        
-        for part in text.split(self.end_of_text_token):
-            processed_text = self.__process_text(part)
-            
-            for token in processed_text:
-                if token in self.special_tokens:
-                    if token in allowed_special_tokens:
-                        text_encodings.append(self.vocab_map[token])
-                else:
-                    text_encodings.append(self.vocab_map.get(token, self.unknown_token_id))
-            
-            if len(text.split(self.end_of_text_token)) > 1:
-                text_encodings.append(self.end_of_text_token_id)
+        for tok in allowed_special_tokens:
+            if tok not in self.vocab_map:
+                raise KeyError(tok)
+        text_encodings = self._encoder.encode(text, allowed_special_tokens)
 
         return (
             self.pad_or_truncate(text_encodings, self.max_length, self.pad_token_id)
@@ -79,6 +185,95 @@ class Tokenizer:
             else text_encodings
         )
 
+    def __build_encoder(self) -> None:
+        """Compile the encoder and the decoding tables for the current vocabulary."""
+        self._encoder = _CompiledEncoder(
+            self.vocab_map, self.unknown_token_id, self.end_of_text_token, self.normalize
+        )
+
+        # Dense ID -> token table; the extra last entry stands for any ID outside
+        # the vocabulary, which decodes to the unknown token like in decode().
+        size = max(self.token_id_to_token_map, default=-1) + 1
+        self._decode_table = np.full(size + 1, self.unknown_token, dtype=object)
+        ids = np.fromiter(self.token_id_to_token_map, dtype=np.int64, count=len(self.token_id_to_token_map))
+        self._decode_table[ids] = list(self.token_id_to_token_map.values())
+        self._special_token_ids = frozenset(self.vocab_map[tok] for tok in self.special_tokens)
+        self._special_mask = np.zeros(size + 1, dtype=bool)
+        self._special_mask[list(self._special_token_ids)] = True
+
+    @timed("tokenizer.encode_with_offsets")
+    def encode_with_offsets(
+        self,
+        text: str,
+        truncate_and_pad: bool = False,
+        allowed_special_tokens: List[str] = []
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Encode text into token IDs together with their character offsets.
+
+        Offsets are computed in the same pass as the IDs and refer to positions in
+        ``text`` as given, so joiners and split vowel signs removed by
+        normalization are covered by the span of the token they belong to.
+
+        Args:
+            text: Text to encode
+            truncate_and_pad: Pad or truncate to ``max_length``; padding tokens get
+                the offsets ``(0, 0)``
+            allowed_special_tokens: Special tokens that are encoded as such when
+                they appear in the text
+
+        Returns:
+            int32 array of token IDs and an int32 array of shape ``(n, 2)`` with the
+            ``(start, end)`` offsets of every token, so that
+            ``text[start:end]`` is the text it was encoded from.
+        """
+        if not self.vocab_map:
+            raise ValueError("Tokenizer not trained. Call train() first.")
+        if self._encoder is None:
+            self.__build_encoder()
+
+        for tok in allowed_special_tokens:
+            if tok not in self.vocab_map:
+                raise KeyError(tok)
+        ids, offsets = self._encoder.encode_with_offsets(text, allowed_special_tokens)
+        if truncate_and_pad:
+            ids, offsets = ids[:self.max_length], offsets[:self.max_length]
+            padding = self.max_length - len(ids)
+            ids = np.pad(ids, (0, padding), constant_values=self.pad_token_id)
+            offsets = np.pad(offsets, ((0, padding), (0, 0)))
+        return ids, offsets
+
+    def batch_encode_with_offsets(
+        self,
+        texts: Sequence[str],
+        truncate_and_pad: bool = False,
+        allowed_special_tokens: List[str] = []
+    ) -> Tuple[Union[np.ndarray, List[np.ndarray]], Union[np.ndarray, List[np.ndarray]]]:
+        """
+        Encode a batch of texts into token IDs and character offsets.
+
+        Args:
+            texts: Texts to encode
+            truncate_and_pad: Pad or truncate every text to ``max_length``
+            allowed_special_tokens: Special tokens that are encoded as such when
+                they appear in the text
+
+        Returns:
+            With ``truncate_and_pad``, an int32 array of shape ``(len(texts),
+            max_length)`` of IDs and one of shape ``(len(texts), max_length, 2)`` of
+            offsets. Otherwise, a list of ID arrays and a list of offset arrays, as
+            returned by encode_with_offsets().
+        """
+        encoded = [self.encode_with_offsets(text, truncate_and_pad, allowed_special_tokens) for text in texts]
+        ids = [item[0] for item in encoded]
+        offsets = [item[1] for item in encoded]
+        if truncate_and_pad:
+            return (
+                np.stack(ids) if ids else np.empty((0, self.max_length), dtype=np.int32),
+                np.stack(offsets) if offsets else np.empty((0, self.max_length, 2), dtype=np.int32),
+            )
+        return ids, offsets
+
     @staticmethod
     def pad_or_truncate(sequence: List[int], max_length: int, padding_value: int) -> List[int]:
         """Pad or truncate a sequence to specified length."""
@@ -95,21 +290,62 @@ class Tokenizer:
         """Make the class callable for easy encoding."""
         return self.__encode(text, truncate_and_pad, allowed_special_tokens)
 
+    @timed("tokenizer.decode")
     def decode(self, ids: List[int], skip_special_tokens: bool = False) -> str:
         """Decode token IDs back to text."""
         if not self.token_id_to_token_map:
             raise ValueError("Tokenizer not trained. Call train() first.")
 
-        special_token_ids = [self.vocab_map[tok] for tok in self.special_tokens]
+        if self._encoder is None:
+            self.__build_encoder()
+
+        special_token_ids = self._special_token_ids
         tokens = [
             token for token in ids
             if not skip_special_tokens or token not in special_token_ids
         ]
         
-        return "".join(
-            self.token_id_to_token_map.get(token, self.unknown_token)
-            for token in tokens
-        )
+        get, unknown = self.token_id_to_token_map.get, self.unknown_token
+        return "".join(get(token, unknown) for token in tokens)
+
+    @timed("tokenizer.batch_decode", items=len)
+    def batch_decode(self, ids_matrix, skip_special_tokens: bool = False) -> List[str]:
+        """
+        Decode a batch of token ID sequences.
+
+        IDs are looked up in a dense ID -> token array and special tokens (unknown
+        and padding, as in decode()) are dropped with a boolean mask, so only the
+        final join runs per row.
+
+        Args:
+            ids_matrix: 2-D NumPy array, torch tensor or list of equal-length lists
+                of token IDs. A list of sequences of different lengths is decoded
+                row by row.
+            skip_special_tokens: Drop unknown and padding tokens
+
+        Returns:
+            One decoded string per row.
+        """
+        if not self.token_id_to_token_map:
+            raise ValueError("Tokenizer not trained. Call train() first.")
+        if self._encoder is None:
+            self.__build_encoder()
+
+        if hasattr(ids_matrix, "detach"):
+            ids_matrix = ids_matrix.detach().cpu().numpy()
+        try:
+            ids = np.asarray(ids_matrix, dtype=np.int64)
+        except ValueError:
+            return [self.decode(list(row), skip_special_tokens) for row in ids_matrix]
+        if ids.ndim != 2:
+            raise ValueError(f"Expected a 2-D batch of token IDs, got shape {ids.shape}")
+
+        outside = len(self._decode_table) - 1
+        ids = np.where((ids >= 0) & (ids < outside), ids, outside)
+        tokens = self._decode_table[ids]
+        if skip_special_tokens:
+            tokens[self._special_mask[ids]] = ""
+        return ["".join(row) for row in tokens.tolist()]
 
     def train(
         self,
@@ -121,10 +357,11 @@ class Tokenizer:
         if not text_list:
             raise ValueError("Empty text list provided for training")
 
-        if memory_efficient:
-            self.__train_character_level_tokenizer_memory_efficient(text_list, chunk_size)
-        else:
-            self.__train_character_level_tokenizer(text_list)
+        with timer("tokenizer.train", items=len(text_list)):
+            if memory_efficient:
+                self.__train_character_level_tokenizer_memory_efficient(text_list, chunk_size)
+            else:
+                self.__train_character_level_tokenizer(text_list)
 
     def __len__(self) -> int:
         """Get the vocabulary size."""
@@ -135,17 +372,17 @@ class Tokenizer:
         """Get the vocabulary size as a property."""
         return len(self)
 
-    @staticmethod
-    def __process_text(text: str) -> List[str]:
+    def __process_text(self, text: str) -> List[str]:
         """Process text using utility function."""
-        return process_text(text)
+        return process_text(canonicalize(text) if self.normalize else text)
 
     def __load_default_tokenizer(self) -> None:
         """Load default tokenizer."""
         self.vocab_map = load_default_vocab_map()
         config = load_default_config()
 
-        # Load configuration
+        # Load configuration; configs written before ``normalize`` existed encode raw text
+        self.normalize = False
         for key, value in config.items():
             setattr(self, key, value)
         
@@ -196,6 +433,7 @@ class Tokenizer:
         
         # Create reverse mapping
         self.token_id_to_token_map = {v: k for k, v in self.vocab_map.items()}
+        self.__build_encoder()
 
     def load_from_pretrained(self, file_path: Union[str, None] = None, load_default_tokenizer:bool = True) -> 'Tokenizer':
         """Load tokenizer from pretrained files."""
@@ -215,7 +453,8 @@ class Tokenizer:
                 with open(file_path / "config.json", "r", encoding="utf-8") as f:
                     config = json.load(f)
                 
-                # Load configuration
+                # Load configuration; configs written before ``normalize`` existed encode raw text
+                self.normalize = False
                 for key, value in config.items():
                     setattr(self, key, value)
                 
@@ -234,10 +473,11 @@ class Tokenizer:
             raise ValueError(f"Error loading pretrained tokenizer: {str(e)}")
 
     def __update_special_token_ids(self) -> None:
-        """Update special token IDs from vocab map."""
+        """Update special token IDs from vocab map and compile the encoder."""
         self.unknown_token_id = self.vocab_map[self.unknown_token]
         self.pad_token_id = self.vocab_map[self.pad_token]
         self.end_of_text_token_id = self.vocab_map[self.end_of_text_token]
+        self.__build_encoder()
 
     def save_tokenizer(self, save_path: str) -> None:
         """Save tokenizer configuration and vocabulary."""
@@ -252,6 +492,7 @@ class Tokenizer:
             "max_length": self.max_length,
             "end_of_text_token": self.end_of_text_token,
             "end_of_text_token_id": self.end_of_text_token_id,
+            "normalize": self.normalize,
         }
 
         try:
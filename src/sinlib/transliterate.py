@@ -4,79 +4,259 @@ Module for transliterating text between Sinhala and Roman scripts.
 This module provides the Transliterator class which handles the conversion
 of text from one script to another using a pre-trained model.
 """
-from typing import List
+from pathlib import Path
+from typing import Container, Dict, List, Mapping, Optional, Union
 
-from sinlib.utils.model_utils import load_transliterator_model, inference
+from sinlib.lexicon import LexiconTable, read_word_list
+from sinlib.romanize import Deromanizer
+from sinlib.utils import instrumentation
+from sinlib.utils.preprocessing import canonicalize
+from sinlib.utils.model_utils import MODEL_CHECKPOINTS, MODELS_PATH, load_transliterator_model, batch_inference
 from sinlib.utils.dataset_utils import load_tokenizer
 
+# Ways a word can be transliterated, in the order they are tried
+PATHS = ("lexicon", "table", "rules", "model")
+
+Lexicon = Union[str, Path, Mapping[str, str]]
+Vocabulary = Union[str, Path, Container[str]]
+
+
+def load_lexicon(lexicon: Lexicon) -> Mapping[str, str]:
+    """
+    Load an exception lexicon of fixed transliterations.
+
+    Args:
+        lexicon: Mapping of Roman words to Sinhala, or path to a UTF-8 file with
+            one tab-separated ``roman<TAB>sinhala`` pair per line
+
+    Returns:
+        Mapping of Roman words to their Sinhala transliteration.
+    """
+    if isinstance(lexicon, Mapping):
+        return lexicon
+    from sinlib.utils.training import read_pairs
+
+    return dict(read_pairs(lexicon))
+
+
+def load_vocabulary(vocabulary: Vocabulary) -> Container[str]:
+    """
+    Load a vocabulary of known Sinhala words.
+
+    Args:
+        vocabulary: Any container of words, such as
+            ``TypoDetector().get_dictionary()``, or a path: a LexiconTable
+            directory, or a word list accepted by ``sinlib.lexicon.read_word_list``
+            (a ``.npy`` array like the TypoDetector dictionary, or a text file)
+
+    Returns:
+        Container answering ``word in vocabulary`` for canonical words.
+    """
+    if not isinstance(vocabulary, (str, Path)):
+        return vocabulary
+    if Path(vocabulary).is_dir():
+        return LexiconTable(vocabulary)
+    return frozenset(canonicalize(word) for word in read_word_list(vocabulary))
+
 
 class Transliterator:
     """
     A class for transliterating text between scripts using a pre-trained model.
-    
+
     This class loads a pre-trained transliteration model and provides methods
     to convert text from one script to another (typically between Sinhala and Roman).
-    
+
+    Each word is looked up in the exception lexicon and then in the precomputed
+    table, if they are given, and in hybrid mode converted by the rule-based
+    Deromanizer. A rules result is kept when every letter group matched and no
+    tie between graphemes had to be broken, or when the result is a known word
+    of the vocabulary. Only the remaining words go through the model, in
+    batches.
+    ``path_stats()`` reports which share of the words took each path.
+
     Attributes:
         model: The pre-trained transliteration model
         tokenizer: The tokenizer used for encoding/decoding text
+        lexicon: Mapping of Roman words to fixed transliterations, or None
+        table: Precomputed mapping of Roman words to model transliterations,
+            usually a LexiconTable, or None
+        deromanizer: Rule-based converter used in hybrid mode, or None
+        vocabulary: Known Sinhala words that confirm ambiguous rules results, or None
+        path_counts: Number of words transliterated through each path
     """
-    
-    def __init__(self, model_path: str = None, tokenizer_path: str = None) -> None:
+
+    def __init__(
+        self,
+        model_path: str = None,
+        tokenizer_path: str = None,
+        model: str = "default",
+        lexicon: Optional[Lexicon] = None,
+        table: Optional[Union[str, Path, Mapping[str, str]]] = None,
+        hybrid: bool = False,
+        deromanizer: Optional[Deromanizer] = None,
+        vocabulary: Optional[Vocabulary] = None,
+        batch_size: int = 256,
+    ) -> None:
         """
         Initialize the Transliterator with a model and tokenizer.
-        
+
         Args:
-            model_path: Optional path to a custom model file
-            tokenizer_path: Optional path to a custom tokenizer file
+            model_path: Optional path to a custom model file, such as one exported
+                by ``sinlib.utils.training.TransliteratorTrainer``
+            tokenizer_path: Optional path to a saved tokenizer directory
+            model: Bundled model variant used when no ``model_path`` is given:
+                ``"default"``, or ``"small"`` for the distilled model built with
+                ``sinlib.utils.distillation``, which is several times faster at a
+                small cost in accuracy
+            lexicon: Optional exception lexicon consulted before anything else; a
+                mapping or a path accepted by load_lexicon()
+            table: Optional table built by ``python -m sinlib.lexicon``, consulted
+                after the lexicon; a LexiconTable directory or any mapping
+            hybrid: Convert words with the rule-based Deromanizer when it is
+                confident, and use the model only for the others
+            deromanizer: Deromanizer used in hybrid mode. Defaults to one built
+                from the default character map.
+            vocabulary: Optional known Sinhala words, in a form accepted by
+                load_vocabulary(). In hybrid mode, a rules result that had to
+                break a tie is still used when it is one of these words.
+            batch_size: Number of words per model forward pass
+
+        Raises:
+            ValueError: If ``model`` is not a known variant
+            FileNotFoundError: If the checkpoint of the variant is not installed
         """
-        self.model = load_transliterator_model()
-        self.tokenizer = load_tokenizer()
-    
+        if model_path is None:
+            if model not in MODEL_CHECKPOINTS:
+                raise ValueError(f"Unknown model {model!r}; expected one of {sorted(MODEL_CHECKPOINTS)}")
+            model_path = Path(MODELS_PATH) / MODEL_CHECKPOINTS[model]
+            if not model_path.exists():
+                if model == "small":
+                    hint = "create it with `python -m sinlib.utils.distillation words.txt out_dir --install`"
+                else:
+                    hint = (
+                        "it ships with the sinlib package, so reinstall it with "
+                        "`pip install --force-reinstall sinlib` or pass model_path"
+                    )
+                raise FileNotFoundError(f"No {model!r} transliteration model at {model_path}; {hint}")
+        self.model = load_transliterator_model(model_path)
+        self.tokenizer = load_tokenizer(tokenizer_path)
+        self.lexicon = load_lexicon(lexicon) if lexicon is not None else None
+        self.table = table if table is None or isinstance(table, Mapping) else LexiconTable(table)
+        self.deromanizer = (deromanizer or Deromanizer()) if hybrid else None
+        self.vocabulary = load_vocabulary(vocabulary) if vocabulary is not None else None
+        self.batch_size = batch_size
+        self.path_counts: Dict[str, int] = dict.fromkeys(PATHS, 0)
+
+    def _transliterate_words(self, words: List[str]) -> List[str]:
+        """Transliterate words through the lexicon, the table, the rules and the model, in that order."""
+        results: List[Optional[str]] = [None] * len(words)
+        counts = dict.fromkeys(PATHS, 0)
+        # Words left for the model, with the positions where they occur
+        pending: Dict[str, List[int]] = {}
+        for i, word in enumerate(words):
+            if self.lexicon is not None:
+                found = self.lexicon.get(word)
+                if found is not None:
+                    results[i] = found
+                    counts["lexicon"] += 1
+                    continue
+            if self.table is not None:
+                found = self.table.get(word)
+                if found is not None:
+                    results[i] = found
+                    counts["table"] += 1
+                    continue
+            if self.deromanizer is not None:
+                analysis = self.deromanizer.analyze(word)
+                if not analysis.unknown and (not analysis.ambiguous or self._is_known(analysis.text)):
+                    results[i] = analysis.text
+                    counts["rules"] += 1
+                    continue
+            pending.setdefault(word, []).append(i)
+            counts["model"] += 1
+
+        if pending:
+            outputs = batch_inference(self.model, self.tokenizer, list(pending), batch_size=self.batch_size)
+            for output, positions in zip(outputs, pending.values()):
+                for i in positions:
+                    results[i] = output
+
+        for path, n in counts.items():
+            self.path_counts[path] += n
+            instrumentation.count("transliterator.transliterate", f"{path}_words", n)
+        return results
+
+    def _is_known(self, word: str) -> bool:
+        return self.vocabulary is not None and canonicalize(word) in self.vocabulary
+
+    def path_stats(self) -> Dict[str, float]:
+        """
+        Report which share of the words took each path.
+
+        Returns:
+            Fraction of the words transliterated so far through the ``lexicon``,
+            the ``table``, the ``rules`` and the ``model``, and the total number
+            of ``words``.
+        """
+        total = sum(self.path_counts.values())
+        stats: Dict[str, float] = {path: n / total if total else 0.0 for path, n in self.path_counts.items()}
+        stats["words"] = total
+        return stats
+
+    def reset_path_stats(self) -> None:
+        """Set the path counts back to zero."""
+        self.path_counts = dict.fromkeys(PATHS, 0)
+
     def transliterate(self, text: str) -> str:
         """
         Transliterate the input text.
-        
+
         Args:
             text: The input text to transliterate
-            
+
         Returns:
             The transliterated text
-            
+
         Examples:
             >>> transliterator = Transliterator()
-            >>> transliterator.transliterate("මම ගෙදර ගියා")
-            "mama gedara giya"
+            >>> transliterator.transliterate("mama gedara giya")
+            "මම ගෙදර ගියා"
         """
         if not text or not isinstance(text, str):
             return ""
-            
+
         word_list = text.split()
-        transliterated_text = [
-            inference(self.model, self.tokenizer, word) for word in word_list
-        ]
+        with instrumentation.timer("transliterator.transliterate", items=len(word_list)):
+            transliterated_text = self._transliterate_words(word_list)
         return " ".join(transliterated_text).strip()
-    
+
     def __call__(self, text: str) -> str:
         """
         Make the class callable for easy transliteration.
-        
+
         Args:
             text: The input text to transliterate
-            
+
         Returns:
             The transliterated text
         """
         return self.transliterate(text)
-    
+
     def batch_transliterate(self, texts: List[str]) -> List[str]:
         """
         Transliterate a batch of texts.
-        
+
+        The words of all texts are transliterated together, so the model runs
+        once per ``batch_size`` distinct words rather than once per word.
+
         Args:
             texts: A list of input texts to transliterate
-            
+
         Returns:
             A list of transliterated texts
         """
-        return [self.transliterate(text) for text in texts]
+        word_lists = [text.split() if text and isinstance(text, str) else [] for text in texts]
+        words = [word for word_list in word_lists for word in word_list]
+        with instrumentation.timer("transliterator.transliterate", items=len(words)):
+            transliterated = iter(self._transliterate_words(words))
+        return [" ".join(next(transliterated) for _ in word_list).strip() for word_list in word_lists]
@@ -0,0 +1,177 @@
+"""
+Per-instance caching utilities.
+
+This module provides a small thread-safe LRU cache with an optional time-to-live,
+used by components that need to memoise expensive lookups per object instead of
+sharing a single ``functools.lru_cache`` across every instance of a class.
+"""
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from typing import Any, Callable, Hashable, Optional
+
+from . import instrumentation
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize", "ttl", "expired"])
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    A bounded least-recently-used cache with optional expiry.
+
+    Attributes:
+        maxsize: Maximum number of entries kept. ``None`` means unbounded and
+            ``0`` disables caching entirely.
+        ttl: Time in seconds after which an entry is considered stale, or ``None``
+            to keep entries until they are evicted.
+        name: Optional instrumentation stage under which hits and misses are
+            counted as ``cache_hits`` and ``cache_misses``.
+    """
+
+    def __init__(self, maxsize: Optional[int] = 128, ttl: Optional[float] = None, name: Optional[str] = None) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            maxsize: Maximum number of entries to keep
+            ttl: Optional time-to-live for each entry in seconds
+            name: Optional instrumentation stage name
+        """
+        if maxsize is not None and maxsize < 0:
+            raise ValueError("maxsize must be a non-negative integer or None")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be a positive number of seconds or None")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.name = name
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._expires: dict = {}
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the cached value for ``key`` or ``default`` when it is missing or stale.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            The cached value or ``default``.
+        """
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is not _MISSING and self.ttl is not None and self._expires[key] <= time.monotonic():
+                self._discard(key)
+                self._expired += 1
+                value = _MISSING
+            if value is _MISSING:
+                self._misses += 1
+                if self.name is not None:
+                    instrumentation.count(self.name, "cache_misses")
+                return default
+            self._data.move_to_end(key)
+            self._hits += 1
+            if self.name is not None:
+                instrumentation.count(self.name, "cache_hits")
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Store ``value`` under ``key``, evicting the least recently used entry if needed.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if self.ttl is not None:
+                self._expires[key] = time.monotonic() + self.ttl
+            if self.maxsize is not None:
+                while len(self._data) > self.maxsize:
+                    oldest, _ = self._data.popitem(last=False)
+                    self._expires.pop(oldest, None)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for ``key``, computing and storing it on a miss.
+
+        Args:
+            key: Cache key
+            compute: Zero-argument callable producing the value
+
+        Returns:
+            The cached or freshly computed value.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove ``key`` from the cache and return its value, or ``default``."""
+        with self._lock:
+            if key not in self._data:
+                return default
+            value = self._data[key]
+            self._discard(key)
+            return value
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        """
+        Remove every entry whose key satisfies ``predicate``.
+
+        Args:
+            predicate: Function called with each key
+
+        Returns:
+            Number of entries removed.
+        """
+        with self._lock:
+            stale = [key for key in self._data if predicate(key)]
+            for key in stale:
+                self._discard(key)
+            return len(stale)
+
+    def clear(self) -> None:
+        """Remove every entry and reset the statistics."""
+        with self._lock:
+            self._data.clear()
+            self._expires.clear()
+            self._hits = self._misses = self._expired = 0
+
+    def cache_info(self) -> CacheInfo:
+        """Return hit/miss statistics in the style of ``functools.lru_cache``."""
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._data), self.ttl, self._expired)
+
+    def _discard(self, key: Hashable) -> None:
+        del self._data[key]
+        self._expires.pop(key, None)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            if key not in self._data:
+                return False
+            return self.ttl is None or self._expires[key] > time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __getstate__(self) -> dict:
+        # Locks cannot be pickled; a copied cache starts empty.
+        return {"maxsize": self.maxsize, "ttl": self.ttl, "name": self.name}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["maxsize"], state["ttl"], state.get("name"))
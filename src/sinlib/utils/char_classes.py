@@ -0,0 +1,181 @@
+"""
+Codepoint class table shared across sinlib.
+
+Every ASCII character and every code point of the Sinhala block (U+0D80-U+0DFF)
+has an entry of bit flags in ``CLASS_TABLE``, built once from the character lists
+in ``sinlib.utils.chars``. All other code points share a final sentinel entry
+without flags, so classifying a character is a single array lookup and
+classifying a whole text is one vectorized NumPy indexing operation.
+"""
+from enum import IntFlag
+from string import punctuation, whitespace
+from typing import Iterable, Set, Union
+
+import numpy as np
+
+from .chars import (
+    ALL_LETTERS,
+    ALL_SINHALA_CHARACTERS,
+    BASE_CONSONANTS,
+    SENTENCE_TERMINATORS,
+    VOWEL_DIACRITICS,
+    VOWELS,
+)
+
+SINHALA_START = 0x0D80
+SINHALA_END = 0x0DFF
+
+_ASCII_SIZE = 128
+_SINHALA_SIZE = SINHALA_END - SINHALA_START + 1
+SENTINEL_INDEX = _ASCII_SIZE + _SINHALA_SIZE
+
+
+class CharClass(IntFlag):
+    """Bit flags describing a character."""
+    NONE = 0
+    LETTER = 1 << 0
+    DIACRITIC = 1 << 1
+    CONSONANT = 1 << 2
+    VOWEL = 1 << 3
+    DIGIT = 1 << 4
+    PUNCT = 1 << 5
+    SPACE = 1 << 6
+    LATIN = 1 << 7
+    SINHALA = 1 << 8
+    SUPPORTED = 1 << 9
+    PRINTABLE = 1 << 10
+    TERMINAL = 1 << 11
+
+
+def _table_index(codepoint: int) -> int:
+    if codepoint < _ASCII_SIZE:
+        return codepoint
+    if SINHALA_START <= codepoint <= SINHALA_END:
+        return codepoint - SINHALA_START + _ASCII_SIZE
+    return SENTINEL_INDEX
+
+
+def _build_table() -> np.ndarray:
+    table = np.zeros(SENTINEL_INDEX + 1, dtype=np.uint16)
+
+    def mark(chars: Iterable[str], flag: CharClass) -> None:
+        for char in chars:
+            if len(char) == 1 and _table_index(ord(char)) != SENTINEL_INDEX:
+                table[_table_index(ord(char))] |= int(flag)
+
+    mark(ALL_LETTERS, CharClass.LETTER)
+    mark(VOWEL_DIACRITICS, CharClass.DIACRITIC)
+    mark(BASE_CONSONANTS, CharClass.CONSONANT)
+    mark(VOWELS, CharClass.VOWEL)
+    mark("0123456789", CharClass.DIGIT)
+    mark(punctuation, CharClass.PUNCT)
+    mark(whitespace, CharClass.SPACE)
+    mark(map(chr, range(ord("a"), ord("z") + 1)), CharClass.LATIN)
+    mark(map(chr, range(ord("A"), ord("Z") + 1)), CharClass.LATIN)
+    mark(ALL_SINHALA_CHARACTERS, CharClass.SUPPORTED)
+    mark(SENTENCE_TERMINATORS, CharClass.TERMINAL)
+    table[_ASCII_SIZE:SENTINEL_INDEX] |= int(CharClass.SINHALA | CharClass.PRINTABLE)
+    table[0x20:0x7F] |= int(CharClass.PRINTABLE)
+    table.flags.writeable = False
+    return table
+
+
+CLASS_TABLE = _build_table()
+
+# The same flags as a dict, for per-character tests in pure Python loops.
+_CHAR_FLAGS = {
+    chr(cp): int(CLASS_TABLE[_table_index(cp)])
+    for cp in [*range(_ASCII_SIZE), *range(SINHALA_START, SINHALA_END + 1)]
+}
+
+
+# Row of CLASS_TABLE for every code point up to the end of the Sinhala block;
+# larger code points are clipped onto the last entry, which is the sentinel.
+DENSE_LIMIT = SINHALA_END + 1
+_DENSE_INDEX = np.array([_table_index(cp) for cp in range(DENSE_LIMIT + 1)], dtype=np.intp)
+
+
+def table_index(codepoints: np.ndarray) -> np.ndarray:
+    """
+    Map code points to their row in ``CLASS_TABLE``.
+
+    Args:
+        codepoints: Array of code points of any integer dtype
+
+    Returns:
+        Array of table indices with the same shape.
+    """
+    return _DENSE_INDEX[np.minimum(codepoints, DENSE_LIMIT)]
+
+
+def codepoints(text: Union[str, np.ndarray]) -> np.ndarray:
+    """
+    Return the code points of a string or of a NumPy unicode array.
+
+    Args:
+        text: A string, or an array of strings (padded with NUL to a common width)
+
+    Returns:
+        uint32 array with one code point per character; for an array of ``n``
+        strings the shape is ``(n, width)``.
+    """
+    if isinstance(text, str):
+        return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    text = np.asarray(text)
+    width = text.dtype.itemsize // 4
+    return text.view(np.uint32).reshape(*text.shape, width)
+
+
+def classify(text: Union[str, np.ndarray]) -> np.ndarray:
+    """
+    Return the class flags of every character.
+
+    Args:
+        text: A string, an array of strings (dtype ``U``) or an integer array of
+            code points
+
+    Returns:
+        uint16 array of CharClass flags: one per character of a string, shape
+        ``(n, width)`` for an array of strings, or the shape of a code point array.
+
+    Examples:
+        >>> from sinlib.utils.char_classes import CharClass, classify
+        >>> flags = classify("කා1")
+        >>> bool(flags[1] & CharClass.DIACRITIC)
+        True
+    """
+    if isinstance(text, str) or np.asarray(text).dtype.kind == "U":
+        text = codepoints(text)
+    return CLASS_TABLE[table_index(text)]
+
+
+def char_class(char: str) -> CharClass:
+    """
+    Return the class flags of a single character.
+
+    Args:
+        char: A single character
+
+    Returns:
+        The character's CharClass flags.
+    """
+    return CharClass(_CHAR_FLAGS.get(char, 0))
+
+
+def has_class(char: str, flags: CharClass) -> bool:
+    """Return whether ``char`` has any of ``flags``."""
+    return bool(_CHAR_FLAGS.get(char, 0) & flags)
+
+
+def chars_with(flags: CharClass, exclude: CharClass = CharClass.NONE) -> Set[str]:
+    """
+    Return every table character that has any of ``flags`` and none of ``exclude``.
+
+    Args:
+        flags: Flags to select
+        exclude: Flags that disqualify a character
+
+    Returns:
+        Set of single characters.
+    """
+    return {c for c, f in _CHAR_FLAGS.items() if f & flags and not f & exclude}
@@ -189,6 +189,18 @@ DIACRITICS_MAPPING = {v: d for v, d in zip(VOWELS, VOWEL_DIACRITICS)}
 
 REVERSE_DIACRITICS_MAPPING = {d: v for v, d in zip(VOWELS, VOWEL_DIACRITICS)}
 
+JOINERS = ["\u200c", "\u200d"]
+
+# Vowel signs typed as two parts and their single code point form.
+COMPOSED_VOWEL_DIACRITICS_MAPPING = {
+    "\u0dd9\u0dcf\u0dca": "\u0ddd",  # ෙ + ා + ් -> ෝ
+    "\u0dd9\u0dcf": "\u0ddc",  # ෙ + ා -> ො
+    "\u0dd9\u0dca": "\u0dda",  # ෙ + ් -> ේ
+    "\u0ddc\u0dca": "\u0ddd",  # ො + ් -> ෝ
+    "\u0dd9\u0ddf": "\u0dde",  # ෙ + ෟ -> ෞ
+    "\u0dd9\u0dd9": "\u0ddb",  # ෙ + ෙ -> ෛ
+}
+
 CONJUNCT_CONSONANTS = [
     "ක්ර",
     "ඛ්ර",
@@ -296,6 +308,9 @@ AGOSHA_TO_GOSHA_MAPPING = {
     "ප්": "බ්",
     "ඵ්": "භ්",
 }
+# Full stop, question and exclamation marks and the kunddaliya.
+SENTENCE_TERMINATORS = [".", "?", "!", "\u0df4"]
+
 PUNKT = set(punctuation)
 NUMBERS = set("1234567890")
 
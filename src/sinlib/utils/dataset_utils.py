@@ -1,12 +1,12 @@
 from sinlib.tokenizer import Tokenizer
 
 MAX_LENGTH = 32
-DUMMY_FILE_NAME = "vocab"
 
 
-def load_tokenizer():
+def load_tokenizer(tokenizer_path=None):
     tokenizer = Tokenizer(max_length=MAX_LENGTH)
-    tokenizer.load_from_pretrained(DUMMY_FILE_NAME)
+    if tokenizer_path is None:
+        tokenizer.load_from_pretrained(load_default_tokenizer=True)
+    else:
+        tokenizer.load_from_pretrained(tokenizer_path, load_default_tokenizer=False)
     return tokenizer
-
-
@@ -0,0 +1,269 @@
+"""
+Distillation of the transliteration model into a smaller student.
+
+The student, by default a single-layer BiLSTMTranslator with half the hidden
+size, is trained on a list of Roman words to reproduce the teacher's output
+distribution at every position: a temperature-softened KL divergence to the
+teacher's probabilities plus the cross-entropy with the teacher's predicted
+tokens. No reference transliterations are needed.
+
+After training, the student is compared with the teacher on held-out words
+(word-level agreement) and both are timed on CPU. Installing the result as
+``transliterator-small.pth`` next to the bundled checkpoint makes it available
+as ``Transliterator(model="small")``.
+
+Usage:
+    python -m sinlib.utils.distillation words.txt runs/small --epochs 5 --install
+"""
+import argparse
+import random
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import torch
+import torch.nn.functional as F
+
+from sinlib.tokenizer import Tokenizer
+from sinlib.utils.dataset_utils import load_tokenizer
+from sinlib.utils.model_utils import (
+    MODELS_PATH,
+    SMALL_CHECKPOINT_NAME,
+    batch_inference,
+    inference,
+    load_transliterator_model,
+)
+from sinlib.utils.models.transliterator_model import BiLSTMTranslator
+from sinlib.utils.training import IGNORE_INDEX, TransliteratorTrainer
+
+STUDENT_HIDDEN_SIZE = 64
+STUDENT_NUM_LAYERS = 1
+
+
+def read_words(path: Union[str, Path]) -> List[str]:
+    """Return the distinct whitespace-separated words of a UTF-8 text file, in order of appearance."""
+    with open(path, "r", encoding="utf-8") as f:
+        return list(dict.fromkeys(word for line in f for word in line.split()))
+
+
+class DistillationTrainer(TransliteratorTrainer):
+    """
+    TransliteratorTrainer whose targets come from a teacher model.
+
+    Batches are built from ``(word, "")`` pairs; the targets of each batch are
+    replaced by the teacher's predictions, so checkpointing, resume and export
+    work as for ordinary training.
+
+    Attributes:
+        teacher: The teacher model, kept in evaluation mode
+        temperature: Softening temperature of the teacher distribution
+        alpha: Weight of the soft-target loss; ``1 - alpha`` weighs the
+            cross-entropy with the teacher's predicted tokens
+    """
+
+    def __init__(
+        self,
+        teacher: BiLSTMTranslator,
+        tokenizer: Tokenizer,
+        output_dir: Union[str, Path],
+        temperature: float = 2.0,
+        alpha: float = 0.7,
+        hidden_size: int = STUDENT_HIDDEN_SIZE,
+        num_layers: int = STUDENT_NUM_LAYERS,
+        **kwargs,
+    ) -> None:
+        """
+        Initialize the trainer.
+
+        Args:
+            teacher: Trained model to distill
+            tokenizer: Tokenizer of the teacher
+            output_dir: Directory for checkpoints and the exported student
+            temperature: Softening temperature of the teacher distribution
+            alpha: Weight of the soft-target loss
+            hidden_size: Hidden size of the student
+            num_layers: Number of LSTM layers of the student
+            **kwargs: Further TransliteratorTrainer arguments
+        """
+        super().__init__(tokenizer, output_dir, hidden_size=hidden_size, num_layers=num_layers, **kwargs)
+        self.teacher = teacher.to(self.device).eval()
+        self.temperature = temperature
+        self.alpha = alpha
+
+    def train_step(self, batch: Dict[str, torch.Tensor]) -> float:
+        self.model.train()
+        inputs = batch["inputs"].to(self.device)
+        lengths = batch["lengths"]
+        mask = (torch.arange(inputs.size(1)) < lengths[:, None]).to(self.device)
+        with torch.no_grad():
+            teacher_log_probs = self.teacher(inputs, lengths)
+        targets = teacher_log_probs.argmax(dim=-1).masked_fill(~mask, IGNORE_INDEX)
+
+        with self.dropout_rng():
+            log_probs = self.model(inputs, lengths)
+        hard_loss = self.loss_fn(log_probs.reshape(-1, log_probs.size(-1)), targets.reshape(-1))
+        # The models return log-softmax outputs, which are logits up to a constant.
+        t = self.temperature
+        soft_loss = F.kl_div(
+            F.log_softmax(log_probs[mask] / t, dim=-1),
+            F.log_softmax(teacher_log_probs[mask] / t, dim=-1),
+            log_target=True,
+            reduction="batchmean",
+        ) * t * t
+        loss = self.alpha * soft_loss + (1 - self.alpha) * hard_loss
+
+        self.optimizer.zero_grad()
+        loss.backward()
+        if self.max_grad_norm is not None:
+            torch.nn.utils.clip_grad_norm_(self.model.parameters(), self.max_grad_norm)
+        self.optimizer.step()
+        self.step += 1
+        return loss.item()
+
+
+def words_per_second(model: BiLSTMTranslator, tokenizer: Tokenizer, words: Sequence[str]) -> Dict[str, float]:
+    """
+    Time a model on CPU, one word at a time and in batches.
+
+    Args:
+        model: Model to time; it is moved to the CPU
+        tokenizer: Tokenizer of the model
+        words: Words to transliterate
+
+    Returns:
+        ``{"single": ..., "batched": ...}`` words per second.
+    """
+    model = model.cpu()
+    start = time.perf_counter()
+    for word in words:
+        inference(model, tokenizer, word)
+    single = time.perf_counter() - start
+    start = time.perf_counter()
+    batch_inference(model, tokenizer, list(words))
+    batched = time.perf_counter() - start
+    return {"single": len(words) / single, "batched": len(words) / batched}
+
+
+def compare_with_teacher(
+    student: BiLSTMTranslator,
+    teacher: BiLSTMTranslator,
+    tokenizer: Tokenizer,
+    words: Sequence[str],
+    timing_words: int = 1000,
+) -> Dict[str, float]:
+    """
+    Report how closely and how fast the student reproduces the teacher.
+
+    Args:
+        student: Distilled model
+        teacher: Teacher model
+        tokenizer: Tokenizer shared by both models
+        words: Held-out words
+        timing_words: Number of words used for the CPU timings
+
+    Returns:
+        Word-level agreement with the teacher, parameter counts and CPU words per
+        second of both models, one word at a time and batched.
+    """
+    student, teacher = student.cpu(), teacher.cpu()
+    words = list(words)
+    teacher_outputs = batch_inference(teacher, tokenizer, words)
+    student_outputs = batch_inference(student, tokenizer, words)
+    agreement = sum(a == b for a, b in zip(teacher_outputs, student_outputs)) / max(len(words), 1)
+
+    timed = words[:timing_words]
+    teacher_speed = words_per_second(teacher, tokenizer, timed)
+    student_speed = words_per_second(student, tokenizer, timed)
+    return {
+        "agreement": agreement,
+        "teacher_parameters": teacher.n_parameters(),
+        "student_parameters": student.n_parameters(),
+        "teacher_words_per_second": teacher_speed["single"],
+        "student_words_per_second": student_speed["single"],
+        "teacher_batched_words_per_second": teacher_speed["batched"],
+        "student_batched_words_per_second": student_speed["batched"],
+        "speedup": student_speed["single"] / teacher_speed["single"],
+    }
+
+
+def distill(
+    words: Sequence[str],
+    output_dir: Union[str, Path],
+    teacher: Optional[BiLSTMTranslator] = None,
+    tokenizer: Optional[Tokenizer] = None,
+    epochs: int = 5,
+    holdout: float = 0.05,
+    seed: int = 0,
+    **kwargs,
+) -> Dict[str, float]:
+    """
+    Distill a teacher into a small student and compare the two.
+
+    Args:
+        words: Roman words to train on
+        output_dir: Directory for checkpoints and the exported student
+        teacher: Teacher model. Defaults to the bundled model.
+        tokenizer: Teacher tokenizer. Defaults to the pretrained tokenizer.
+        epochs: Number of training epochs
+        holdout: Fraction of the words kept aside for the comparison
+        seed: Seed of the split and of training
+        **kwargs: Further DistillationTrainer arguments, such as ``hidden_size``
+
+    Returns:
+        The report of compare_with_teacher(), plus the path of the exported
+        student under ``"model_path"``.
+    """
+    teacher = teacher if teacher is not None else load_transliterator_model()
+    tokenizer = tokenizer if tokenizer is not None else load_tokenizer()
+    words = list(words)
+    random.Random(seed).shuffle(words)
+    n_holdout = max(1, int(len(words) * holdout)) if len(words) > 1 else 0
+    held_out, train_words = words[:n_holdout], words[n_holdout:]
+
+    trainer = DistillationTrainer(teacher, tokenizer, output_dir, seed=seed, **kwargs)
+    model_path = trainer.fit([(word, "") for word in train_words], epochs=epochs)
+    report = compare_with_teacher(trainer.model, teacher, tokenizer, held_out or train_words)
+    report["model_path"] = str(model_path)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Distill the transliteration model into a smaller student.")
+    parser.add_argument("words", type=Path, help="Text file of Roman words, whitespace-separated")
+    parser.add_argument("output_dir", type=Path, help="Directory for checkpoints and the exported student")
+    parser.add_argument("--teacher", type=Path, help="Teacher state dict (default: bundled model)")
+    parser.add_argument("--tokenizer", type=Path, help="Saved tokenizer directory (default: pretrained tokenizer)")
+    parser.add_argument("--hidden-size", type=int, default=STUDENT_HIDDEN_SIZE)
+    parser.add_argument("--num-layers", type=int, default=STUDENT_NUM_LAYERS)
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--temperature", type=float, default=2.0)
+    parser.add_argument("--alpha", type=float, default=0.7)
+    parser.add_argument("--num-workers", type=int, default=0, help="DataLoader worker processes")
+    parser.add_argument("--install", action="store_true", help=f"Copy the student to {SMALL_CHECKPOINT_NAME}")
+    args = parser.parse_args()
+
+    report = distill(
+        read_words(args.words),
+        args.output_dir,
+        teacher=load_transliterator_model(args.teacher),
+        tokenizer=load_tokenizer(args.tokenizer),
+        epochs=args.epochs,
+        hidden_size=args.hidden_size,
+        num_layers=args.num_layers,
+        batch_size=args.batch_size,
+        temperature=args.temperature,
+        alpha=args.alpha,
+        num_workers=args.num_workers,
+    )
+    for key, value in report.items():
+        print(f"{key}: {value:.4f}" if isinstance(value, float) else f"{key}: {value}")
+    if args.install:
+        destination = Path(MODELS_PATH) / SMALL_CHECKPOINT_NAME
+        shutil.copyfile(report["model_path"], destination)
+        print(f"installed as {destination}")
+
+
+if __name__ == "__main__":
+    main()
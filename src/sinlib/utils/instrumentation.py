@@ -0,0 +1,239 @@
+"""
+Opt-in timing and counting of sinlib's hot paths.
+
+Components report named stages such as ``tokenizer.encode`` or
+``transliterator.forward``; each stage accumulates its number of calls, the
+number of items processed (texts, or words for the transliteration model), the
+time spent and the slowest call, plus counters such as cache hits and bytes
+loaded. Instrumentation is off by default and every hook then returns after a
+single flag check. Turn it on with enable(), the enabled() context manager, or
+by setting ``SINLIB_INSTRUMENTATION=1`` in the environment.
+
+Examples:
+    >>> from sinlib.utils import instrumentation
+    >>> with instrumentation.enabled():
+    ...     ids = tokenizer("මම ගෙදර ගියා")
+    >>> instrumentation.snapshot()["tokenizer.encode"]["calls"]
+    1
+    >>> print(instrumentation.to_prometheus())
+"""
+import copy
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, Optional
+
+_ENABLED = os.environ.get("SINLIB_INSTRUMENTATION", "").lower() in {"1", "true", "yes"}
+_LOCK = threading.Lock()
+_STAGES: Dict[str, Dict[str, float]] = {}
+
+# Prometheus metric for each built-in statistic: (name, type, help)
+_STAGE_METRICS = {
+    "calls": ("stage_calls_total", "counter", "Number of completed calls of an instrumented stage."),
+    "items": ("stage_items_total", "counter", "Number of items processed by an instrumented stage."),
+    "seconds": ("stage_seconds_total", "counter", "Total time spent in an instrumented stage."),
+    "max_seconds": ("stage_max_seconds", "gauge", "Duration of the slowest call of an instrumented stage."),
+}
+
+
+def enable() -> None:
+    """Start recording stages and counters."""
+    global _ENABLED
+    _ENABLED = True
+
+
+def disable() -> None:
+    """Stop recording; statistics collected so far are kept."""
+    global _ENABLED
+    _ENABLED = False
+
+
+def is_enabled() -> bool:
+    """Return whether instrumentation is recording."""
+    return _ENABLED
+
+
+@contextmanager
+def enabled() -> Iterator[None]:
+    """Record stages and counters within a ``with`` block."""
+    previous = _ENABLED
+    enable()
+    try:
+        yield
+    finally:
+        if not previous:
+            disable()
+
+
+def reset() -> None:
+    """Discard all statistics."""
+    with _LOCK:
+        _STAGES.clear()
+
+
+def _stats(stage: str) -> Dict[str, float]:
+    stats = _STAGES.get(stage)
+    if stats is None:
+        stats = _STAGES[stage] = {"calls": 0, "items": 0, "seconds": 0.0, "max_seconds": 0.0}
+    return stats
+
+
+def record(stage: str, seconds: float, items: int = 1) -> None:
+    """
+    Add one call of ``stage`` to the statistics.
+
+    Args:
+        stage: Stage name, ``component.operation``
+        seconds: Duration of the call
+        items: Number of items the call processed
+    """
+    if not _ENABLED:
+        return
+    with _LOCK:
+        stats = _stats(stage)
+        stats["calls"] += 1
+        stats["items"] += items
+        stats["seconds"] += seconds
+        if seconds > stats["max_seconds"]:
+            stats["max_seconds"] = seconds
+
+
+def count(stage: str, counter: str, value: int = 1) -> None:
+    """
+    Increase a counter of ``stage``, such as ``cache_hits`` or ``bytes_loaded``.
+
+    Args:
+        stage: Stage name
+        counter: Counter name
+        value: Amount to add
+    """
+    if not _ENABLED:
+        return
+    with _LOCK:
+        stats = _stats(stage)
+        stats[counter] = stats.get(counter, 0) + value
+
+
+class _Timer:
+    __slots__ = ("stage", "items", "_start")
+
+    def __init__(self, stage: str, items: int) -> None:
+        self.stage = stage
+        self.items = items
+
+    def __enter__(self) -> "_Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        if exc_type is None:
+            record(self.stage, time.perf_counter() - self._start, self.items)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+    # Lets instrumented code set ``timer.items`` without checking the flag.
+    items = property(lambda self: 0, lambda self, value: None)
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(stage: str, items: int = 1):
+    """
+    Return a context manager that records the duration of its block.
+
+    The number of items can be set on the returned object inside the block, once
+    it is known. Blocks that raise are not recorded.
+
+    Args:
+        stage: Stage name
+        items: Number of items processed by the block
+
+    Examples:
+        >>> with timer("romanizer.romanize") as t:
+        ...     results = [table.romanize(text) for text in texts]
+        ...     t.items = len(results)
+    """
+    return _Timer(stage, items) if _ENABLED else _NULL_TIMER
+
+
+def timed(stage: str, items: Optional[Callable[[Any], int]] = None) -> Callable:
+    """
+    Decorate a function so that its calls are recorded as ``stage``.
+
+    Args:
+        stage: Stage name
+        items: Function of the return value giving the number of items
+            processed. Each call counts as one item by default.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _ENABLED:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            record(stage, time.perf_counter() - start, items(result) if items else 1)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def snapshot() -> Dict[str, Dict[str, float]]:
+    """
+    Return a copy of the statistics of every stage.
+
+    Returns:
+        Mapping of stage name to its ``calls``, ``items``, ``seconds`` and
+        ``max_seconds``, plus any counters recorded for the stage.
+    """
+    with _LOCK:
+        return copy.deepcopy(_STAGES)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def to_prometheus(prefix: str = "sinlib") -> str:
+    """
+    Render the statistics in the Prometheus text exposition format.
+
+    Stage statistics become metrics labelled with the stage, for example
+    ``sinlib_stage_seconds_total{stage="tokenizer.encode"}``, and each counter
+    becomes a ``<prefix>_<counter>_total`` counter.
+
+    Args:
+        prefix: Prefix of every metric name
+
+    Returns:
+        The metrics, one sample per line.
+    """
+    stages = snapshot()
+    metrics: Dict[str, tuple] = {}
+    for stage, stats in sorted(stages.items()):
+        for key, value in stats.items():
+            name, kind, description = _STAGE_METRICS.get(
+                key, (f"{key}_total", "counter", f"Total {key.replace('_', ' ')} of an instrumented stage.")
+            )
+            metrics.setdefault(f"{prefix}_{name}", (kind, description, []))[2].append((stage, value))
+
+    lines = []
+    for name, (kind, description, samples) in metrics.items():
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(f'{name}{{stage="{_escape(stage)}"}} {value}' for stage, value in samples)
+    return "\n".join(lines) + "\n" if lines else ""
@@ -1,12 +1,15 @@
 import torch
 from pathlib import Path
 from os import path
+from sinlib.utils import instrumentation
 from sinlib.utils.models.transliterator_model import BiLSTMTranslator
-from sinlib.utils.dataset_utils import load_tokenizer
 
 CURRENT_PATH = path.dirname(path.abspath(__file__))
 MODELS_PATH = path.join(CURRENT_PATH, "models")
 CHECKPOINT_NAME = "transliterator-checkpoint.pth"
+SMALL_CHECKPOINT_NAME = "transliterator-small.pth"
+# Checkpoint of each model variant, relative to MODELS_PATH
+MODEL_CHECKPOINTS = {"default": CHECKPOINT_NAME, "small": SMALL_CHECKPOINT_NAME}
 HIDDEN_SIZE = 128
 
 
@@ -19,23 +22,40 @@ def detect_device(force_cpu=False):
         return torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
 
-def load_transliterator_model():
-    tokenizer = load_tokenizer()
-    input_size = len(tokenizer)
-    output_size = len(tokenizer)
-    hidden_size = HIDDEN_SIZE
-    filepath = Path(MODELS_PATH) / CHECKPOINT_NAME
+def model_dimensions(state_dict):
+    """Return ``(input_size, hidden_size, output_size, num_layers)`` of a BiLSTMTranslator state dict."""
+    input_size, hidden_size = state_dict["embedding.weight"].shape
+    output_size = state_dict["fc.weight"].shape[0]
+    num_layers = sum(1 for key in state_dict if key.startswith("bilstm.weight_ih_l") and not key.endswith("_reverse"))
+    return input_size, hidden_size, output_size, num_layers
 
-    device = detect_device()
-    model = BiLSTMTranslator(input_size, hidden_size, output_size).to(device)
+
+def load_transliterator_model(checkpoint_path=None, device=None):
+    """
+    Load a BiLSTMTranslator from a state dict.
+
+    The layer sizes are read from the checkpoint, so models trained with other
+    hidden sizes or numbers of layers load the same way as the bundled one.
+
+    Args:
+        checkpoint_path: Path to a state dict saved with ``torch.save``. Defaults to
+            the bundled checkpoint.
+        device: Device to load the model on. Defaults to detect_device().
+
+    Returns:
+        The model.
+    """
+    filepath = Path(checkpoint_path) if checkpoint_path is not None else Path(MODELS_PATH) / CHECKPOINT_NAME
+    device = device or detect_device()
     checkpoint = torch.load(filepath, map_location=device)
+    model = BiLSTMTranslator(*model_dimensions(checkpoint)).to(device)
     model.load_state_dict(checkpoint)
     return model
 
 
 def inference(model, tokenizer, input_text):
     model.eval()
-    device = detect_device()
+    device = next(model.parameters()).device
     tokens_to_ignore = [tokenizer.vocab_map[tok] for tok in tokenizer.special_tokens]
 
     # Tokenize and encode input text
@@ -45,11 +65,46 @@ def inference(model, tokenizer, input_text):
     )  # Add batch dimension
 
     with torch.no_grad():
-        output = model(input_tensor)
-        predicted = output.argmax(dim=-1)
+        with instrumentation.timer("transliterator.forward"):
+            output = model(input_tensor)
+            predicted = output.argmax(dim=-1)
 
         # Remove special tokens and decode
         pred = [p for p in predicted[0].tolist() if p not in tokens_to_ignore]
         translated_text = tokenizer.decode(pred)
 
     return translated_text
+
+
+def batch_inference(model, tokenizer, words, batch_size=256):
+    """
+    Transliterate words in padded batches.
+
+    Rows are packed by their lengths, so every word gets the same prediction as
+    with inference() while the model runs once per batch.
+
+    Args:
+        model: A BiLSTMTranslator
+        tokenizer: The tokenizer the model was trained with
+        words: Words to transliterate
+        batch_size: Number of words per forward pass
+
+    Returns:
+        One transliteration per word.
+    """
+    model.eval()
+    device = next(model.parameters()).device
+    results = []
+    for start in range(0, len(words), batch_size):
+        encoded = [tokenizer(word) or [tokenizer.pad_token_id] for word in words[start:start + batch_size]]
+        lengths = torch.tensor([len(ids) for ids in encoded])
+        input_tensor = torch.full((len(encoded), int(lengths.max())), tokenizer.pad_token_id, dtype=torch.long)
+        for row, ids in enumerate(encoded):
+            input_tensor[row, :len(ids)] = torch.tensor(ids)
+
+        with torch.no_grad():
+            with instrumentation.timer("transliterator.forward", items=len(encoded)):
+                predicted = model(input_tensor.to(device), lengths).argmax(dim=-1).cpu()
+        predicted[torch.arange(predicted.size(1)) >= lengths[:, None]] = tokenizer.pad_token_id
+        results.extend(tokenizer.batch_decode(predicted, skip_special_tokens=True))
+    return results
@@ -1,4 +1,5 @@
 import torch.nn as nn
+from torch.nn.utils.rnn import pack_padded_sequence, pad_packed_sequence
 
 
 class BiLSTMTranslator(nn.Module):
@@ -15,9 +16,15 @@ class BiLSTMTranslator(nn.Module):
         self.fc = nn.Linear(hidden_size * 2, output_size)
         self.log_softmax = nn.LogSoftmax(dim=-1)
 
-    def forward(self, x):
+    def forward(self, x, lengths=None):
         embedded = self.embedding(x.long())
-        out, _ = self.bilstm(embedded)
+        if lengths is None:
+            out, _ = self.bilstm(embedded)
+        else:
+            # Packing skips the padded positions of each row; their outputs are zeros.
+            packed = pack_padded_sequence(embedded, lengths.cpu(), batch_first=True, enforce_sorted=False)
+            out, _ = self.bilstm(packed)
+            out, _ = pad_packed_sequence(out, batch_first=True, total_length=x.size(1))
         out = self.layer_norm(out)
         out = self.dropout(out)
         out = self.fc(out)
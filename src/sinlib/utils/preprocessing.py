@@ -1,10 +1,30 @@
 from functools import partial
-import multiprocessing
+import math
+import os
 import re
-from .chars import VOWEL_DIACRITICS, NUBERS_AND_PUNKTS, ALL_LETTERS
+import time
+import unicodedata
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from . import instrumentation
+from .char_classes import CLASS_TABLE, DENSE_LIMIT, CharClass, chars_with, codepoints, table_index
+from .chars import (
+    VOWEL_DIACRITICS,
+    NUBERS_AND_PUNKTS,
+    ALL_LETTERS,
+    SAN_MAPPING,
+    REVERSE_SAN_MAPPING,
+    JOINERS,
+    BASE_CONSONANTS,
+    COMPOSED_VOWEL_DIACRITICS_MAPPING,
+)
 import json
 from pathlib import Path
 from enum import Enum
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
 
 class Filenames(Enum):
     """Enumeration for consistent filename references."""
@@ -16,16 +36,21 @@ class Filenames(Enum):
 
 def download_hub_file(file_name:str):
     from huggingface_hub.file_download import hf_hub_download
-    return hf_hub_download(
-        repo_id="Ransaka/sinlib",
-        filename=file_name,
-        repo_type="model",
-    )
-
-def load_char_mapper():
-    char_mapper_fp = download_hub_file(Filenames.CHAR_MAPPER.value)
+    with instrumentation.timer("hub.download"):
+        path = hf_hub_download(
+            repo_id="Ransaka/sinlib",
+            filename=file_name,
+            repo_type="model",
+        )
+    if instrumentation.is_enabled():
+        instrumentation.count("hub.download", "bytes_loaded", os.path.getsize(path))
+    return path
+
+def load_char_mapper(char_mapper_fp=None):
+    if char_mapper_fp is None:
+        char_mapper_fp = download_hub_file(Filenames.CHAR_MAPPER.value)
     if Path(char_mapper_fp).is_file():
-        with open(char_mapper_fp, "r") as f:
+        with open(char_mapper_fp, "r", encoding="utf-8") as f:
             char_mapper = json.load(f)
     else:
         raise ValueError(
@@ -48,9 +73,13 @@ def load_default_config():
     return config
 
 
+_NON_PRINTABLE_PATTERN = re.compile(r"[^\u0020-\u007E\u0D80-\u0DFF]+", flags=re.UNICODE)
+_ENGLISH_PATTERN = re.compile("[a-zA-Z]+")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
 def remove_non_printable(input_string):
-    printable_pattern = re.compile(r"[^\u0020-\u007E\u0D80-\u0DFF]+", flags=re.UNICODE)
-    return printable_pattern.sub("", input_string)
+    return _NON_PRINTABLE_PATTERN.sub("", input_string)
 
 
 def remove_english_characters(text):
@@ -63,12 +92,262 @@ def remove_english_characters(text):
     Returns:
     - str: Text with English characters removed.
     """
-    english_pattern = re.compile("[a-zA-Z]")
-    text = english_pattern.sub(r"", text)
-    text = re.sub(r"\s+", " ", text).strip()
+    text = _ENGLISH_PATTERN.sub(r"", text)
+    text = _WHITESPACE_PATTERN.sub(" ", text).strip()
     return text
 
 
+# A joiner between a virama and a consonant selects a conjunct form (rakaransaya,
+# yansaya, repaya), so the first one is kept there. Other joiners after Sinhala
+# characters are stray and dropped; those elsewhere, as in emoji sequences, survive.
+_CANONICAL_PATTERN = re.compile(
+    f"(?<=\u0DCA)([{''.join(JOINERS)}])[{''.join(JOINERS)}]*(?=[{''.join(BASE_CONSONANTS)}])|"
+    f"(?<=[\u0D80-\u0DFF])[{''.join(JOINERS)}]+|"
+    + "|".join(sorted(COMPOSED_VOWEL_DIACRITICS_MAPPING, key=len, reverse=True))
+)
+
+
+def _canonical_replacement(match):
+    return match.group(1) or COMPOSED_VOWEL_DIACRITICS_MAPPING.get(match.group(), "")
+
+
+def canonicalize(text: str) -> str:
+    """
+    Bring Sinhala text to one canonical encoding in a single regex pass.
+
+    The same word can be typed with stray zero-width joiners (``"ම\u200dම"``)
+    and with vowel signs split in two parts (``"ෙ" + "ා"`` instead of ``"ො"``).
+    Stray joiners after Sinhala characters are dropped and split vowel signs are
+    composed through ``COMPOSED_VOWEL_DIACRITICS_MAPPING``. A joiner between a
+    virama and a consonant is part of the spelling, since it selects a conjunct
+    (``"ශ්\u200dරී"`` is not ``"ශ්රී"``), so one is kept there.
+
+    Parameters
+    ----------
+    text : str
+        The text to canonicalize.
+
+    Returns
+    -------
+    str
+        The canonical text.
+
+    Examples
+    --------
+    >>> from sinlib.utils.preprocessing import canonicalize
+    >>> canonicalize("ශ්\u200d\u200dරී ල\u200dංකා") == "ශ්\u200dරී ලංකා"
+    True
+    >>> canonicalize("ක\u0dd9\u0dcf") == "කො"
+    True
+    """
+    return _CANONICAL_PATTERN.sub(_canonical_replacement, text)
+
+
+def canonicalize_with_offsets(text: str) -> Tuple[str, Optional[np.ndarray]]:
+    """
+    Canonicalize text and map positions in the result back to the input.
+
+    Parameters
+    ----------
+    text : str
+        The text to canonicalize.
+
+    Returns
+    -------
+    tuple of (str, numpy.ndarray or None)
+        The canonical text and an int32 array of ``len(canonical) + 1`` entries
+        giving the input position of every canonical character, followed by
+        ``len(text)``. A character composed from a split vowel sign maps to the
+        start of the split sign, so a span ``[i, j)`` of the canonical text covers
+        ``[positions[i], positions[j])`` of the input, including any joiners that
+        were dropped at its end. The array is ``None`` when the text is already
+        canonical and positions are unchanged.
+    """
+    matches = list(_CANONICAL_PATTERN.finditer(text))
+    if not matches:
+        return text, None
+
+    pieces: List[str] = []
+    positions: List[np.ndarray] = []
+    last = 0
+    for match in matches:
+        replacement = _canonical_replacement(match)
+        pieces += [text[last:match.start()], replacement]
+        positions += [
+            np.arange(last, match.start(), dtype=np.int32),
+            np.full(len(replacement), match.start(), dtype=np.int32),
+        ]
+        last = match.end()
+    pieces.append(text[last:])
+    positions += [np.arange(last, len(text) + 1, dtype=np.int32)]
+    return "".join(pieces), np.concatenate(positions)
+
+
+class NormalizationStep(Enum):
+    """Normalization steps that can be composed into a :class:`Pipeline`."""
+    REMOVE_NON_PRINTABLE = "remove_non_printable"
+    REMOVE_ENGLISH = "remove_english"
+    COLLAPSE_WHITESPACE = "collapse_whitespace"
+    COMPOSE_SAN = "compose_san"
+    DECOMPOSE_SAN = "decompose_san"
+    NFC = "nfc"
+    CANONICALIZE = "canonicalize"
+
+
+# Steps that only delete characters commute, so consecutive ones share one regex pass.
+_DELETION_PATTERNS = {
+    NormalizationStep.REMOVE_NON_PRINTABLE: _NON_PRINTABLE_PATTERN.pattern,
+    NormalizationStep.REMOVE_ENGLISH: _ENGLISH_PATTERN.pattern,
+}
+
+_REPLACEMENTS = {
+    NormalizationStep.COMPOSE_SAN: REVERSE_SAN_MAPPING,
+    NormalizationStep.DECOMPOSE_SAN: SAN_MAPPING,
+}
+
+
+def _replacement_stage(mapping: Dict[str, str]) -> Callable[[str], str]:
+    # Longest keys first so a longer spelling wins over its prefix.
+    pattern = re.compile("|".join(map(re.escape, sorted(mapping, key=len, reverse=True))))
+    return partial(pattern.sub, lambda m: mapping[m.group()])
+
+
+def _collapse_whitespace(text: str) -> str:
+    return " ".join(text.split())
+
+
+class Pipeline:
+    """
+    A composable text normalization pipeline.
+
+    Steps are compiled once when the pipeline is created, and consecutive steps
+    that only delete characters are fused into a single regex pass. Time spent in
+    each compiled stage is accumulated in ``timings``.
+
+    Parameters
+    ----------
+    steps : sequence of NormalizationStep or str
+        Steps to apply, in order. Strings are the values of :class:`NormalizationStep`.
+
+    Attributes
+    ----------
+    stage_names : list of str
+        Names of the compiled stages, fused steps joined with ``+``.
+    timings : dict of str to float
+        Seconds spent in each stage since creation or the last :meth:`reset_timings`.
+
+    Examples
+    --------
+    >>> from sinlib.utils.preprocessing import Pipeline
+    >>> pipeline = Pipeline(["remove_non_printable", "remove_english", "collapse_whitespace"])
+    >>> pipeline.apply("මම  hello ගෙදර\u200b ගියා")
+    'මම ගෙදර ගියා'
+    >>> pipeline.stage_names
+    ['remove_non_printable+remove_english', 'collapse_whitespace']
+    """
+
+    def __init__(self, steps: Sequence[Union[NormalizationStep, str]]):
+        self.steps = [NormalizationStep(step) for step in steps]
+        if {NormalizationStep.COMPOSE_SAN, NormalizationStep.DECOMPOSE_SAN} <= set(self.steps):
+            raise ValueError("compose_san and decompose_san cannot be used in the same pipeline")
+
+        self.stage_names: List[str] = []
+        self._stages: List[Callable[[str], str]] = []
+        deletions: List[NormalizationStep] = []
+        for step in self.steps + [None]:
+            if step in _DELETION_PATTERNS:
+                deletions.append(step)
+                continue
+            if deletions:
+                pattern = re.compile("|".join(_DELETION_PATTERNS[d] for d in deletions))
+                self._add_stage("+".join(d.value for d in deletions), partial(pattern.sub, ""))
+                deletions = []
+            if step is NormalizationStep.COLLAPSE_WHITESPACE:
+                self._add_stage(step.value, _collapse_whitespace)
+            elif step in _REPLACEMENTS:
+                self._add_stage(step.value, _replacement_stage(_REPLACEMENTS[step]))
+            elif step is NormalizationStep.NFC:
+                self._add_stage(step.value, partial(unicodedata.normalize, "NFC"))
+            elif step is NormalizationStep.CANONICALIZE:
+                self._add_stage(step.value, canonicalize)
+
+        self.reset_timings()
+
+    def _add_stage(self, name: str, stage: Callable[[str], str]) -> None:
+        self.stage_names.append(name)
+        self._stages.append(stage)
+
+    def reset_timings(self) -> None:
+        """Reset the accumulated per-stage timings."""
+        self.timings: Dict[str, float] = {name: 0.0 for name in self.stage_names}
+
+    def apply(self, text: str) -> str:
+        """
+        Normalize a single text.
+
+        Parameters
+        ----------
+        text : str
+            The text to normalize.
+
+        Returns
+        -------
+        str
+            The normalized text.
+        """
+        for name, stage in zip(self.stage_names, self._stages):
+            start = time.perf_counter()
+            text = stage(text)
+            self.timings[name] += time.perf_counter() - start
+        return text
+
+    def apply_batch(self, texts: Iterable[str]) -> List[str]:
+        """
+        Normalize a batch of texts, running each stage over the whole batch in turn.
+
+        Parameters
+        ----------
+        texts : iterable of str
+            Texts to normalize.
+
+        Returns
+        -------
+        list of str
+            The normalized texts, in order.
+        """
+        texts = list(texts)
+        for name, stage in zip(self.stage_names, self._stages):
+            start = time.perf_counter()
+            texts = [stage(text) for text in texts]
+            self.timings[name] += time.perf_counter() - start
+        return texts
+
+    def apply_stream(self, texts: Iterable[str], batch_size: int = 1024) -> Iterator[str]:
+        """
+        Lazily normalize a stream of texts, such as the lines of an open file.
+
+        Parameters
+        ----------
+        texts : iterable of str
+            Texts to normalize.
+        batch_size : int, default=1024
+            Number of texts normalized together with :meth:`apply_batch`.
+
+        Yields
+        ------
+        str
+            The normalized texts, in order.
+        """
+        texts = iter(texts)
+        while True:
+            batch = list(islice(texts, batch_size))
+            if not batch:
+                break
+            yield from self.apply_batch(batch)
+
+    __call__ = apply
+
+
 # def retain_sinhala_characters(text):
 #     """
 #     Remove non-Sinhala characters from the given text using a conditional expression.
@@ -83,27 +362,21 @@ def remove_english_characters(text):
 #     return cleaned_string
 
 
+def _char_set(chars) -> str:
+    return "".join(re.escape(c) for c in sorted(chars))
+
+
+# A letter with the vowel sign that follows it, or any other character; stray
+# vowel signs are dropped. The character sets come from the shared class table.
+GRAPHEME_PATTERN = re.compile(
+    f"[{_char_set(chars_with(CharClass.LETTER))}][{_char_set(chars_with(CharClass.DIACRITIC))}]?"
+    f"|[^{_char_set(chars_with(CharClass.DIACRITIC))}]"
+)
+
+
+@instrumentation.timed("preprocessing.process_text")
 def process_text(t):
-    tokenized_chars = []
-
-    for i, char in enumerate(t):
-        if char in VOWEL_DIACRITICS:
-            continue
-        if char in NUBERS_AND_PUNKTS:
-            tokenized_chars.append(char)
-        elif char == " ":
-            tokenized_chars.append(" ")
-        elif char in ALL_LETTERS:
-            if i < len(t) - 1 and t[i + 1] in ALL_LETTERS:
-                tokenized_chars.append(char)
-            elif i < len(t) - 1 and t[i + 1] in VOWEL_DIACRITICS:
-                tokenized_chars.append(char + t[i + 1])
-            else:
-                tokenized_chars.append(char)
-        else:
-            tokenized_chars.append(char)
-
-    return tokenized_chars
+    return GRAPHEME_PATTERN.findall(t)
 
 
 def process_text_with_token_counts(
@@ -141,31 +414,281 @@ def process_text_with_token_counts(
     if ignore_non_printable:
         t = remove_non_printable(t)
 
-    tokenized_chars = []
-    token_counts = 0
-
-    for i, char in enumerate(t):
-        if char in VOWEL_DIACRITICS:
-            continue
-        if (char in NUBERS_AND_PUNKTS) and (ignore_punctuation_and_numbers):
-            tokenized_chars.append(char)
-            token_counts += 1
-        elif char == " ":
-            tokenized_chars.append(" ")
-        elif char in ALL_LETTERS:
-            token_counts += 1
-            if i < len(t) - 1 and t[i + 1] in ALL_LETTERS:
-                tokenized_chars.append(char)
-            elif i < len(t) - 1 and t[i + 1] in VOWEL_DIACRITICS:
-                tokenized_chars.append(char + t[i + 1])
-            else:
-                tokenized_chars.append(char)
-        else:
-            tokenized_chars.append(char)
+    tokenized_chars = GRAPHEME_PATTERN.findall(t)
+    token_counts = count_sinhala_tokens(t, ignore_punctuation_and_numbers, ignore_non_printable=False)[0]
 
     return tokenized_chars, token_counts
 
 
+# Token classes used to count tokens without building token lists, derived from
+# the shared CLASS_TABLE and expanded to be indexed by code point directly.
+_OTHER, _SKIPPED, _SPACE, _LETTER, _NUMBER_OR_PUNCT = range(5)
+_CLASS_LIMIT = DENSE_LIMIT
+
+
+def _build_class_tables():
+    flags = CLASS_TABLE[table_index(np.arange(_CLASS_LIMIT + 1))]
+    classes = np.full(_CLASS_LIMIT + 1, _OTHER, dtype=np.intp)
+    classes[(flags & int(CharClass.PUNCT | CharClass.DIGIT)) > 0] = _NUMBER_OR_PUNCT
+    classes[(flags & int(CharClass.LETTER)) > 0] = _LETTER
+    classes[(flags & int(CharClass.DIACRITIC)) > 0] = _SKIPPED
+    classes[ord(" ")] = _SPACE
+    printable_classes = np.where((flags & int(CharClass.PRINTABLE)) > 0, classes, _SKIPPED)
+    return classes, printable_classes
+
+
+_CLASS_TABLE, _PRINTABLE_CLASS_TABLE = _build_class_tables()
+
+
+def _counts_from_classes(class_counts: np.ndarray, ignore_punctuation_and_numbers: bool) -> np.ndarray:
+    letters = class_counts[..., _LETTER]
+    numbers_and_punct = class_counts[..., _NUMBER_OR_PUNCT]
+    sinhala = letters + numbers_and_punct if ignore_punctuation_and_numbers else letters
+    total = letters + numbers_and_punct + class_counts[..., _OTHER]
+    return np.stack([sinhala, total, class_counts[..., _SPACE]], axis=-1)
+
+
+def count_sinhala_tokens(
+    t: str, ignore_punctuation_and_numbers: bool = True, ignore_non_printable: bool = True
+):
+    """
+    Count Sinhala tokens, all tokens and spaces in the given text without tokenizing it.
+
+    The counts match those of :func:`process_text_with_token_counts`: vowel signs
+    are part of the preceding letter, and spaces are not tokens. Each character
+    is classified through a codepoint lookup array, so no token list is built.
+
+    Parameters
+    ----------
+    t : str
+        The text to be counted.
+    ignore_punctuation_and_numbers : bool, default=True
+        If True, numbers and punctuation are counted as Sinhala tokens.
+    ignore_non_printable : bool, default=True
+        If True, non-printable characters are not counted.
+
+    Returns
+    -------
+    sinhala_token_count : int
+        Number of Sinhala tokens.
+    token_count : int
+        Number of tokens other than spaces.
+    space_count : int
+        Number of spaces.
+
+    Examples
+    --------
+    >>> from sinlib.utils.preprocessing import count_sinhala_tokens
+    >>> count_sinhala_tokens("මම ගෙදර ගියා.")
+    (8, 8, 2)
+    """
+    table = _PRINTABLE_CLASS_TABLE if ignore_non_printable else _CLASS_TABLE
+    classes = table[np.minimum(codepoints(t), _CLASS_LIMIT)]
+    counts = _counts_from_classes(np.bincount(classes, minlength=5), ignore_punctuation_and_numbers)
+    return tuple(int(c) for c in counts)
+
+
+def count_sinhala_tokens_batch(
+    texts, ignore_punctuation_and_numbers: bool = True, ignore_non_printable: bool = True
+) -> np.ndarray:
+    """
+    Vectorized :func:`count_sinhala_tokens` over a batch of texts.
+
+    Parameters
+    ----------
+    texts : numpy.ndarray or list of str
+        Texts to count. Lists are converted to a NumPy unicode array, which is
+        padded to the longest text, so batch texts of similar length together.
+        NumPy arrays do not keep trailing NUL characters, so pass a list for
+        those to be counted.
+    ignore_punctuation_and_numbers : bool, default=True
+        If True, numbers and punctuation are counted as Sinhala tokens.
+    ignore_non_printable : bool, default=True
+        If True, non-printable characters are not counted.
+
+    Returns
+    -------
+    counts : numpy.ndarray
+        Array of shape ``(n_texts, 3)`` holding the Sinhala token, token and space counts.
+    """
+    # NumPy unicode arrays drop trailing NULs, so the real lengths are taken first.
+    lengths = None
+    if not isinstance(texts, np.ndarray):
+        texts = list(texts)
+        lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    texts = np.asarray(texts, dtype=str).ravel()
+    stored_lengths = np.char.str_len(texts)
+    lengths = stored_lengths if lengths is None else lengths
+    width = texts.dtype.itemsize // 4
+    table = _PRINTABLE_CLASS_TABLE if ignore_non_printable else _CLASS_TABLE
+    if len(texts) == 0 or width == 0:
+        class_counts = np.zeros((len(texts), 5), dtype=np.int64)
+    else:
+        classes = table[np.minimum(codepoints(texts), _CLASS_LIMIT)]
+        # NUL pads the array to the longest text; padding is not counted.
+        classes[np.arange(width) >= stored_lengths[:, None]] = _SKIPPED
+        classes += np.arange(len(texts))[:, None] * 5
+        class_counts = np.bincount(classes.ravel(), minlength=len(texts) * 5).reshape(len(texts), 5)
+    # Trailing NULs of the texts themselves were dropped with the padding.
+    class_counts[:, table[0]] += lengths - stored_lengths
+    return _counts_from_classes(class_counts, ignore_punctuation_and_numbers).astype(np.int64)
+
+
+# Longer texts are counted one by one so a single long line cannot blow up the
+# padded array of a vectorized batch.
+_MAX_BATCHED_LENGTH = 4096
+
+
+def _count_chunk(texts, ignore_punctuation_and_numbers: bool, ignore_non_printable: bool):
+    lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts))
+    short = np.flatnonzero(lengths <= _MAX_BATCHED_LENGTH)
+    counts = np.empty((len(texts), 2), dtype=np.int64)
+    counts[short] = count_sinhala_tokens_batch(
+        [texts[i] for i in short], ignore_punctuation_and_numbers, ignore_non_printable
+    )[:, :2]
+    for i in np.flatnonzero(lengths > _MAX_BATCHED_LENGTH):
+        counts[i] = count_sinhala_tokens(texts[i], ignore_punctuation_and_numbers, ignore_non_printable)[:2]
+    return counts
+
+
+def _ratios(counts: np.ndarray) -> np.ndarray:
+    sinhala, total = counts[:, 0], counts[:, 1]
+    return np.divide(sinhala, total, out=np.zeros(len(counts), dtype=np.float64), where=total > 0)
+
+
+class CorpusStatistics:
+    """
+    Sinhala character statistics over large collections of text.
+
+    Texts are counted in chunks on a worker pool that is started on first use and
+    kept alive between calls, and workers send back only two counts per text. Call
+    close() or use the object as a context manager to release the pool.
+
+    Attributes
+    ----------
+    num_workers : int
+        Number of worker processes. ``0`` or ``1`` counts in the calling process.
+
+    Examples
+    --------
+    >>> from sinlib.utils.preprocessing import CorpusStatistics
+    >>> with CorpusStatistics(num_workers=4) as stats:
+    ...     ratios = stats.sinhala_character_ratio(open("crawl.txt", encoding="utf-8"))
+    >>> sinhala_lines = ratios > 0.8
+    """
+
+    default_chunk_size = 1024
+    min_parallel_texts = 1024
+
+    def __init__(self, num_workers: int = None):
+        self.num_workers = (os.cpu_count() or 1) if num_workers is None else num_workers
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Shut down the worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.num_workers)
+        return self._executor
+
+    def _chunk_size(self, texts):
+        if hasattr(texts, "__len__"):
+            return max(1, math.ceil(len(texts) / (self.num_workers * 4)))
+        return self.default_chunk_size
+
+    def token_counts(
+        self,
+        texts,
+        ignore_punctuation_and_numbers: bool = True,
+        ignore_non_printable: bool = True,
+        chunk_size: int = None,
+    ) -> np.ndarray:
+        """
+        Count Sinhala tokens and all non-space tokens of every text.
+
+        Parameters
+        ----------
+        texts : iterable of str
+            Texts to count. Iterators such as open files are consumed chunk by chunk.
+        ignore_punctuation_and_numbers : bool, default=True
+            If True, numbers and punctuation are counted as Sinhala tokens.
+        ignore_non_printable : bool, default=True
+            If True, non-printable characters are removed before counting.
+        chunk_size : int, optional
+            Number of texts sent to a worker at a time. Chosen automatically if not given.
+
+        Returns
+        -------
+        counts : numpy.ndarray
+            Array of shape ``(n_texts, 2)`` holding the Sinhala and total token counts.
+        """
+        count = partial(
+            _count_chunk,
+            ignore_punctuation_and_numbers=ignore_punctuation_and_numbers,
+            ignore_non_printable=ignore_non_printable,
+        )
+        sized = hasattr(texts, "__len__")
+        if self.num_workers <= 1 or (sized and len(texts) < self.min_parallel_texts):
+            return count(texts if sized else list(texts))
+
+        chunk_size = chunk_size or self._chunk_size(texts)
+        executor = self._get_executor()
+        results, pending = [], deque()
+        texts = iter(texts)
+        while True:
+            chunk = list(islice(texts, chunk_size))
+            if not chunk:
+                break
+            pending.append(executor.submit(count, chunk))
+            if len(pending) >= 2 * self.num_workers:
+                results.append(pending.popleft().result())
+        results.extend(future.result() for future in pending)
+        if not results:
+            return np.empty((0, 2), dtype=np.int64)
+        return np.concatenate(results)
+
+    def sinhala_character_ratio(
+        self,
+        texts,
+        ignore_punctuation_and_numbers: bool = True,
+        ignore_non_printable: bool = True,
+        chunk_size: int = None,
+    ) -> np.ndarray:
+        """
+        Calculate the ratio of Sinhala characters of every text.
+
+        Parameters are the same as for :meth:`token_counts`.
+
+        Returns
+        -------
+        ratios : numpy.ndarray
+            Float array with one ratio per text. Texts without any token get 0.0.
+        """
+        return _ratios(
+            self.token_counts(texts, ignore_punctuation_and_numbers, ignore_non_printable, chunk_size)
+        )
+
+
+_SHARED_STATISTICS = None
+
+
+def _shared_statistics():
+    global _SHARED_STATISTICS
+    if _SHARED_STATISTICS is None:
+        _SHARED_STATISTICS = CorpusStatistics()
+    return _SHARED_STATISTICS
+
+
 def get_sinhala_character_ratio(
     text,
     ignore_punctuation_and_numbers: bool = True,
@@ -187,6 +710,8 @@ def get_sinhala_character_ratio(
     -------
     ratio : float or list of float
         The ratio of Sinhala characters in the text. If the input is a list, returns a list of ratios for each text string.
+        Blank texts have a ratio of 0.0. For large corpora use :class:`CorpusStatistics`, which accepts
+        iterators and returns a NumPy array.
 
     Examples
     --------
@@ -202,24 +727,13 @@ def get_sinhala_character_ratio(
     [0.875, 0.0]
     """
     if isinstance(text, str):
-        tokenized_text, sinhala_token_count = process_text_with_token_counts(
+        sinhala_token_count, token_count, _ = count_sinhala_tokens(
             text,
             ignore_punctuation_and_numbers,
             ignore_non_printable=ignore_non_printable,
         )
-        tokenized_text = [tok for tok in tokenized_text if tok != " "]
-        return sinhala_token_count / len(tokenized_text)
+        return sinhala_token_count / token_count if token_count else 0.0
     elif isinstance(text, list):
-        pool = multiprocessing.Pool()
-        partial_process_text = partial(
-            process_text_with_token_counts,
-            ignore_punctuation_and_numbers=ignore_punctuation_and_numbers,
-            ignore_non_printable=ignore_non_printable,
-        )
-        results = pool.map(partial_process_text, text)
-        pool.close()
-        pool.join()
-        encodings = [tok[0] for tok in results if tok[0] != " "]
-        encodings = [[char for char in enc if char != " "] for enc in encodings]
-        sinhala_lengths = [tok[1] for tok in results]
-        return [(l / len(enc)) for enc, l in zip(encodings, sinhala_lengths)]
+        return _shared_statistics().sinhala_character_ratio(
+            text, ignore_punctuation_and_numbers, ignore_non_printable
+        ).tolist()
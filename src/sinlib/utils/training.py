@@ -0,0 +1,449 @@
+"""
+Training of BiLSTMTranslator models on Roman -> Sinhala word pairs.
+
+The model predicts one Sinhala token for every Roman input token: the Sinhala
+tokens of a word, left-aligned, followed by padding tokens, which is what
+``inference`` decodes. Pairs are streamed from a tab-separated file
+(``roman<TAB>sinhala`` per line) or any sequence of tuples, sorted into batches
+of similar length and run through the LSTM as packed sequences, so no compute
+is spent on padding.
+
+Training state is checkpointed to the output directory and picked up when
+training is started again, and the final weights are exported as a plain state
+dict that ``load_transliterator_model`` and ``Transliterator(model_path=...)``
+load directly.
+
+Usage:
+    python -m sinlib.utils.training pairs.tsv runs/transliterator --epochs 10 --num-workers 4
+"""
+import argparse
+import math
+import os
+import random
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import torch
+from torch import nn
+from torch.utils.data import DataLoader, IterableDataset, get_worker_info
+
+from sinlib.tokenizer import Tokenizer
+from sinlib.utils.dataset_utils import load_tokenizer
+from sinlib.utils.model_utils import HIDDEN_SIZE, batch_inference, detect_device, load_transliterator_model
+from sinlib.utils.models.transliterator_model import BiLSTMTranslator
+
+IGNORE_INDEX = -100
+CHECKPOINT_FILE = "checkpoint.pt"
+MODEL_FILE = "transliterator.pth"
+TOKENIZER_DIR = "tokenizer"
+
+Pairs = Union[str, Path, Sequence[Tuple[str, str]]]
+
+
+def read_pairs(pairs: Pairs) -> Iterator[Tuple[str, str]]:
+    """
+    Yield ``(roman, sinhala)`` word pairs.
+
+    Args:
+        pairs: Path to a UTF-8 file with one tab-separated pair per line, or a
+            sequence of pairs
+
+    Yields:
+        Pairs with surrounding whitespace removed; malformed lines are skipped.
+    """
+    if isinstance(pairs, (str, Path)):
+        with open(pairs, "r", encoding="utf-8") as f:
+            for line in f:
+                fields = line.rstrip("\n").split("\t")
+                if len(fields) == 2 and fields[0].strip() and fields[1].strip():
+                    yield fields[0].strip(), fields[1].strip()
+    else:
+        for source, target in pairs:
+            yield source, target
+
+
+class TransliterationPairs(IterableDataset):
+    """
+    Stream of length-bucketed training batches.
+
+    Pairs are read in buffers of ``batch_size * bucket_batches``. Each buffer is
+    sorted by input length and cut into batches, and the batches of a buffer are
+    shuffled, so batches need little padding while the order stays random. With
+    several DataLoader workers, buffers are dealt round-robin to the workers.
+
+    Pairs whose Sinhala side has more tokens than the Roman side cannot be
+    predicted position by position and are skipped, as are pairs longer than
+    ``max_length`` tokens.
+
+    Each batch is a dict of ``inputs`` (padded token IDs), ``targets`` (target
+    IDs, IGNORE_INDEX past each input's length) and ``lengths``.
+    """
+
+    def __init__(
+        self,
+        pairs: Pairs,
+        tokenizer: Tokenizer,
+        batch_size: int = 64,
+        bucket_batches: int = 50,
+        shuffle: bool = True,
+        seed: int = 0,
+        max_length: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize the dataset.
+
+        Args:
+            pairs: Pair file or sequence of pairs
+            tokenizer: Tokenizer shared by the input and output of the model
+            batch_size: Number of pairs per batch
+            bucket_batches: Number of batches sorted together
+            shuffle: Shuffle pairs and batches within each buffer
+            seed: Seed of the shuffles; each epoch and worker uses its own stream
+            max_length: Skip pairs with more input tokens than this
+        """
+        self.pairs = pairs
+        self.tokenizer = tokenizer
+        self.batch_size = batch_size
+        self.bucket_batches = bucket_batches
+        self.shuffle = shuffle
+        self.seed = seed
+        self.max_length = max_length
+        self.epoch = 0
+
+    def set_epoch(self, epoch: int) -> None:
+        """Select the shuffle of ``epoch``; call before creating the DataLoader iterator."""
+        self.epoch = epoch
+
+    def encode(self, source: str, target: str) -> Optional[Tuple[List[int], List[int]]]:
+        """Return the input and target IDs of a pair, or None if it cannot be trained on."""
+        source_ids = self.tokenizer(source)
+        target_ids = self.tokenizer(target)
+        if not source_ids or len(target_ids) > len(source_ids):
+            return None
+        if self.max_length is not None and len(source_ids) > self.max_length:
+            return None
+        return source_ids, target_ids
+
+    def __iter__(self) -> Iterator[Dict[str, torch.Tensor]]:
+        worker = get_worker_info()
+        worker_id, num_workers = (worker.id, worker.num_workers) if worker is not None else (0, 1)
+        rng = random.Random(self.seed * 1_000_003 + self.epoch * 1_009 + worker_id)
+        buffer_size = self.batch_size * self.bucket_batches
+
+        buffer: List[Tuple[str, str]] = []
+        for i, pair in enumerate(read_pairs(self.pairs)):
+            if (i // buffer_size) % num_workers != worker_id:
+                continue
+            buffer.append(pair)
+            if len(buffer) == buffer_size:
+                yield from self._batches(buffer, rng)
+                buffer = []
+        if buffer:
+            yield from self._batches(buffer, rng)
+
+    def _batches(self, buffer: List[Tuple[str, str]], rng: random.Random) -> Iterator[Dict[str, torch.Tensor]]:
+        encoded = [item for item in (self.encode(s, t) for s, t in buffer) if item is not None]
+        if self.shuffle:
+            rng.shuffle(encoded)
+        encoded.sort(key=lambda item: len(item[0]))
+        batches = [encoded[i:i + self.batch_size] for i in range(0, len(encoded), self.batch_size)]
+        if self.shuffle:
+            rng.shuffle(batches)
+        for batch in batches:
+            yield self.collate(batch)
+
+    def collate(self, batch: List[Tuple[List[int], List[int]]]) -> Dict[str, torch.Tensor]:
+        """Pad a list of encoded pairs into a batch."""
+        pad = self.tokenizer.pad_token_id
+        lengths = torch.tensor([len(source) for source, _ in batch])
+        width = int(lengths.max())
+        inputs = torch.full((len(batch), width), pad, dtype=torch.long)
+        targets = torch.full((len(batch), width), IGNORE_INDEX, dtype=torch.long)
+        for row, (source, target) in enumerate(batch):
+            inputs[row, :len(source)] = torch.tensor(source)
+            targets[row, :len(source)] = torch.tensor(target + [pad] * (len(source) - len(target)))
+        return {"inputs": inputs, "targets": targets, "lengths": lengths}
+
+
+def init_parameters(model: BiLSTMTranslator, generator: torch.Generator) -> None:
+    """Draw the parameters of a model from ``generator`` with PyTorch's default schemes."""
+    with torch.no_grad():
+        model.embedding.weight.normal_(generator=generator)
+        bound = 1 / math.sqrt(model.hidden_size)
+        for param in model.bilstm.parameters():
+            param.uniform_(-bound, bound, generator=generator)
+        bound = 1 / math.sqrt(model.fc.in_features)
+        model.fc.weight.uniform_(-bound, bound, generator=generator)
+        model.fc.bias.uniform_(-bound, bound, generator=generator)
+
+
+class TransliteratorTrainer:
+    """
+    Trainer of BiLSTMTranslator models with checkpointing and resume.
+
+    The output directory receives the training checkpoint (model, optimizer and
+    position in the data), the tokenizer and the exported model. Starting fit()
+    again with the same directory continues from the last checkpoint, skipping
+    the batches of the current epoch that were already trained on.
+
+    Randomness comes from the seed only: a new model is initialized from a
+    local generator, batches are shuffled per epoch and dropout is seeded per
+    step, so the global random state of the caller is left untouched.
+
+    Attributes:
+        model: The model being trained
+        tokenizer: Tokenizer shared by the input and output of the model
+        output_dir: Directory for checkpoints and the exported model
+        epoch: Number of completed epochs
+        step: Number of optimizer steps taken
+        history: Loss and validation accuracy of every completed epoch
+    """
+
+    def __init__(
+        self,
+        tokenizer: Tokenizer,
+        output_dir: Union[str, Path],
+        model: Optional[BiLSTMTranslator] = None,
+        hidden_size: int = HIDDEN_SIZE,
+        num_layers: int = 2,
+        learning_rate: float = 1e-3,
+        batch_size: int = 64,
+        num_workers: int = 0,
+        checkpoint_every: int = 1000,
+        max_grad_norm: Optional[float] = 1.0,
+        seed: int = 0,
+        device: Optional[torch.device] = None,
+    ) -> None:
+        """
+        Initialize the trainer.
+
+        Args:
+            tokenizer: Trained tokenizer
+            output_dir: Directory for checkpoints and the exported model
+            model: Model to fine-tune. A new one with ``hidden_size`` and
+                ``num_layers`` is created by default.
+            hidden_size: Hidden size of a new model
+            num_layers: Number of LSTM layers of a new model
+            learning_rate: Adam learning rate
+            batch_size: Number of pairs per batch
+            num_workers: DataLoader worker processes encoding and batching pairs
+            checkpoint_every: Optimizer steps between checkpoints; a checkpoint is
+                also written at the end of every epoch
+            max_grad_norm: Gradient norm clipping threshold, or None
+            seed: Seed of the model initialization, the data shuffles and dropout
+            device: Training device. Defaults to detect_device().
+        """
+        self.tokenizer = tokenizer
+        self.output_dir = Path(output_dir)
+        self.device = device or detect_device()
+        if model is None:
+            # The default initialization draws from the global random state.
+            with torch.random.fork_rng(devices=[]):
+                model = BiLSTMTranslator(len(tokenizer), hidden_size, len(tokenizer), num_layers)
+            init_parameters(model, torch.Generator().manual_seed(seed))
+        self.model = model.to(self.device)
+        self.optimizer = torch.optim.Adam(self.model.parameters(), lr=learning_rate)
+        self.loss_fn = nn.NLLLoss(ignore_index=IGNORE_INDEX)
+        self.batch_size = batch_size
+        self.num_workers = num_workers
+        self.checkpoint_every = checkpoint_every
+        self.max_grad_norm = max_grad_norm
+        self.seed = seed
+
+        self.epoch = 0
+        self.step = 0
+        self.history: List[Dict[str, float]] = []
+        self._batches_in_epoch = 0
+
+    @property
+    def checkpoint_path(self) -> Path:
+        return self.output_dir / CHECKPOINT_FILE
+
+    def save_checkpoint(self) -> Path:
+        """Write the training state atomically and return its path."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        state = {
+            "model": self.model.state_dict(),
+            "optimizer": self.optimizer.state_dict(),
+            "epoch": self.epoch,
+            "step": self.step,
+            "batches_in_epoch": self._batches_in_epoch,
+            "history": self.history,
+            "seed": self.seed,
+        }
+        partial = self.checkpoint_path.with_suffix(".tmp")
+        torch.save(state, partial)
+        os.replace(partial, self.checkpoint_path)
+        return self.checkpoint_path
+
+    def load_checkpoint(self, path: Optional[Union[str, Path]] = None) -> None:
+        """Restore the training state written by save_checkpoint()."""
+        state = torch.load(path or self.checkpoint_path, map_location=self.device, weights_only=False)
+        self.model.load_state_dict(state["model"])
+        self.optimizer.load_state_dict(state["optimizer"])
+        self.epoch = state["epoch"]
+        self.step = state["step"]
+        self._batches_in_epoch = state["batches_in_epoch"]
+        self.history = state["history"]
+        self.seed = state["seed"]
+
+    def fit(
+        self,
+        train_pairs: Pairs,
+        epochs: int = 10,
+        valid_pairs: Optional[Pairs] = None,
+        resume: bool = True,
+    ) -> Path:
+        """
+        Train until ``epochs`` epochs are completed and export the model.
+
+        Args:
+            train_pairs: Pair file or sequence of pairs, read once per epoch
+            epochs: Total number of epochs, including those of a resumed run
+            valid_pairs: Optional pairs whose word accuracy is recorded after
+                every epoch
+            resume: Continue from the checkpoint in the output directory, if any
+
+        Returns:
+            Path of the exported model.
+        """
+        if resume and self.checkpoint_path.exists():
+            self.load_checkpoint()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.tokenizer.save_tokenizer(self.output_dir / TOKENIZER_DIR)
+
+        dataset = TransliterationPairs(train_pairs, self.tokenizer, self.batch_size, seed=self.seed)
+        while self.epoch < epochs:
+            dataset.set_epoch(self.epoch)
+            # The loader draws its worker base seed from this generator rather than the global one.
+            generator = torch.Generator().manual_seed(self.seed * 1_000_003 + self.epoch)
+            loader = DataLoader(dataset, batch_size=None, num_workers=self.num_workers, generator=generator)
+            total_loss, n_batches = 0.0, 0
+            for i, batch in enumerate(loader):
+                if i < self._batches_in_epoch:
+                    # Trained on before the restart; batches come in the same order.
+                    continue
+                total_loss += self.train_step(batch)
+                n_batches += 1
+                self._batches_in_epoch += 1
+                if self.step % self.checkpoint_every == 0:
+                    self.save_checkpoint()
+
+            record = {"epoch": self.epoch, "loss": total_loss / max(n_batches, 1)}
+            if valid_pairs is not None:
+                record.update(self.evaluate(valid_pairs))
+            self.history.append(record)
+            self.epoch += 1
+            self._batches_in_epoch = 0
+            self.save_checkpoint()
+        return self.export()
+
+    @contextmanager
+    def dropout_rng(self) -> Iterator[None]:
+        """Seed dropout from the seed and step on a fork of the global random state."""
+        cuda = self.device.type == "cuda"
+        with torch.random.fork_rng(devices=[self.device] if cuda else []):
+            seed = self.seed * 1_000_003 + self.step
+            torch.default_generator.manual_seed(seed)
+            if cuda:
+                with torch.cuda.device(self.device):
+                    torch.cuda.manual_seed(seed)
+            yield
+
+    def train_step(self, batch: Dict[str, torch.Tensor]) -> float:
+        """Run one optimizer step on a batch and return its loss."""
+        self.model.train()
+        inputs = batch["inputs"].to(self.device)
+        targets = batch["targets"].to(self.device)
+        with self.dropout_rng():
+            output = self.model(inputs, batch["lengths"])
+        loss = self.loss_fn(output.reshape(-1, output.size(-1)), targets.reshape(-1))
+        self.optimizer.zero_grad()
+        loss.backward()
+        if self.max_grad_norm is not None:
+            nn.utils.clip_grad_norm_(self.model.parameters(), self.max_grad_norm)
+        self.optimizer.step()
+        self.step += 1
+        return loss.item()
+
+    def evaluate(self, pairs: Pairs, batch_size: int = 256) -> Dict[str, float]:
+        """
+        Measure the word accuracy of the model.
+
+        Args:
+            pairs: Pair file or sequence of pairs
+            batch_size: Number of words per forward pass
+
+        Returns:
+            ``{"accuracy": ...}``, the fraction of words transliterated exactly.
+        """
+        pairs = list(read_pairs(pairs))
+        if not pairs:
+            return {"accuracy": 0.0}
+        predictions = batch_inference(self.model, self.tokenizer, [source for source, _ in pairs], batch_size)
+        # Compare against the target as the tokenizer round-trips it.
+        correct = sum(
+            prediction == self.tokenizer.decode(self.tokenizer(target), skip_special_tokens=True)
+            for prediction, (_, target) in zip(predictions, pairs)
+        )
+        return {"accuracy": correct / len(pairs)}
+
+    def export(self, path: Optional[Union[str, Path]] = None) -> Path:
+        """
+        Save the model weights for inference.
+
+        Args:
+            path: Destination. Defaults to ``transliterator.pth`` in the output
+                directory.
+
+        Returns:
+            Path of the state dict, loadable with ``load_transliterator_model``.
+        """
+        path = Path(path) if path is not None else self.output_dir / MODEL_FILE
+        path.parent.mkdir(parents=True, exist_ok=True)
+        torch.save({key: value.cpu() for key, value in self.model.state_dict().items()}, path)
+        return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Train a BiLSTMTranslator on tab-separated Roman/Sinhala word pairs."
+    )
+    parser.add_argument("pairs", type=Path, help="Training pairs, one 'roman<TAB>sinhala' per line")
+    parser.add_argument("output_dir", type=Path, help="Directory for checkpoints and the exported model")
+    parser.add_argument("--valid", type=Path, help="Validation pairs")
+    parser.add_argument("--tokenizer", type=Path, help="Saved tokenizer directory (default: pretrained tokenizer)")
+    parser.add_argument("--init-from", type=Path, help="Fine-tune this state dict instead of a new model")
+    parser.add_argument("--epochs", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--learning-rate", type=float, default=1e-3)
+    parser.add_argument("--hidden-size", type=int, default=HIDDEN_SIZE)
+    parser.add_argument("--num-layers", type=int, default=2)
+    parser.add_argument("--num-workers", type=int, default=0, help="DataLoader worker processes")
+    parser.add_argument("--checkpoint-every", type=int, default=1000, help="Optimizer steps between checkpoints")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-resume", action="store_true", help="Ignore an existing checkpoint")
+    args = parser.parse_args()
+
+    tokenizer = load_tokenizer(args.tokenizer)
+    trainer = TransliteratorTrainer(
+        tokenizer,
+        args.output_dir,
+        model=load_transliterator_model(args.init_from) if args.init_from else None,
+        hidden_size=args.hidden_size,
+        num_layers=args.num_layers,
+        learning_rate=args.learning_rate,
+        batch_size=args.batch_size,
+        num_workers=args.num_workers,
+        checkpoint_every=args.checkpoint_every,
+        seed=args.seed,
+    )
+    path = trainer.fit(args.pairs, args.epochs, args.valid, resume=not args.no_resume)
+    for record in trainer.history:
+        print(", ".join(f"{key}: {value:.4f}" if isinstance(value, float) else f"{key}: {value}" for key, value in record.items()))
+    print(f"model exported to {path}")
+
+
+if __name__ == "__main__":
+    main()
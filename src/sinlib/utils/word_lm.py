@@ -0,0 +1,269 @@
+"""
+Compact word-level bigram language model.
+
+The model is stored as a handful of NumPy arrays (vocabulary, unigram counts and
+sorted bigram keys with their counts) so it can be trained from a streamed corpus,
+saved to disk and memory-mapped back without building large Python dictionaries.
+"""
+import json
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from sinlib.utils.preprocessing import canonicalize
+
+BOS_TOKEN = "<s>"
+EOS_TOKEN = "</s>"
+
+_KEY_SHIFT = np.int64(32)
+
+_FILES = {
+    "vocab": "vocab.npy",
+    "unigram_counts": "unigram_counts.npy",
+    "bigram_keys": "bigram_keys.npy",
+    "bigram_counts": "bigram_counts.npy",
+}
+
+
+def _bigram_keys(prev_ids: np.ndarray, next_ids: np.ndarray) -> np.ndarray:
+    return (prev_ids.astype(np.int64) << _KEY_SHIFT) | next_ids.astype(np.int64)
+
+
+def _merge_counts(keys: np.ndarray, counts: np.ndarray, new_keys: np.ndarray, new_counts: np.ndarray):
+    all_keys = np.concatenate([keys, new_keys])
+    all_counts = np.concatenate([counts, new_counts])
+    unique_keys, inverse = np.unique(all_keys, return_inverse=True)
+    merged = np.bincount(inverse, weights=all_counts, minlength=len(unique_keys))
+    return unique_keys, merged.astype(np.int64)
+
+
+class WordBigramLM:
+    """
+    An interpolated word bigram language model backed by NumPy arrays.
+
+    Probabilities are ``λ·P_ml(w | prev) + (1 - λ)·P_add1(w)`` where the unigram
+    distribution is add-one smoothed so unseen words keep a small, non-zero mass.
+
+    Attributes:
+        vocab: Array of words, indexed by word ID
+        unigram_counts: Count of each word ID in the training corpus
+        bigram_keys: Sorted ``prev_id << 32 | next_id`` keys of observed bigrams
+        bigram_counts: Count of each bigram in ``bigram_keys``
+        interpolation: Weight λ given to the bigram estimate
+    """
+
+    def __init__(
+        self,
+        vocab: np.ndarray,
+        unigram_counts: np.ndarray,
+        bigram_keys: np.ndarray,
+        bigram_counts: np.ndarray,
+        interpolation: float = 0.7,
+    ) -> None:
+        """
+        Initialize the model from its arrays.
+
+        Args:
+            vocab: Array of words, indexed by word ID
+            unigram_counts: Count of each word ID
+            bigram_keys: Sorted bigram keys
+            bigram_counts: Count of each bigram key
+            interpolation: Weight given to the bigram estimate, between 0 and 1
+        """
+        if not 0.0 <= interpolation <= 1.0:
+            raise ValueError("interpolation must be between 0 and 1")
+
+        self.vocab = vocab
+        self.unigram_counts = unigram_counts
+        self.bigram_keys = bigram_keys
+        self.bigram_counts = bigram_counts
+        self.interpolation = interpolation
+
+        self._word_to_id: Dict[str, int] = {word: idx for idx, word in enumerate(vocab.tolist())}
+        self._unigram_denominator = float(unigram_counts.sum()) + len(vocab) + 1
+
+    def __len__(self) -> int:
+        return len(self.vocab)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._word_to_id
+
+    def word_ids(self, words: Sequence[str]) -> np.ndarray:
+        """
+        Map words to IDs, using ``-1`` for out-of-vocabulary words.
+
+        Args:
+            words: Words to look up
+
+        Returns:
+            Array of word IDs.
+        """
+        return np.fromiter((self._word_to_id.get(w, -1) for w in words), dtype=np.int64, count=len(words))
+
+    def transition_log_probs(self, prev_ids: np.ndarray, next_ids: np.ndarray) -> np.ndarray:
+        """
+        Compute ``log P(next | prev)`` for every pair of previous and next word IDs.
+
+        Args:
+            prev_ids: 1-D array of previous word IDs
+            next_ids: 1-D array of next word IDs
+
+        Returns:
+            Array of shape ``(len(prev_ids), len(next_ids))`` with log probabilities.
+        """
+        prev_ids = np.asarray(prev_ids, dtype=np.int64)
+        next_ids = np.asarray(next_ids, dtype=np.int64)
+
+        next_known = next_ids >= 0
+        next_counts = np.where(next_known, self.unigram_counts[np.where(next_known, next_ids, 0)], 0)
+        unigram = (next_counts + 1.0) / self._unigram_denominator
+
+        prev_known = prev_ids >= 0
+        history = np.where(prev_known, self.unigram_counts[np.where(prev_known, prev_ids, 0)], 0)
+
+        keys = _bigram_keys(prev_ids[:, None], next_ids[None, :])
+        if len(self.bigram_keys):
+            positions = np.minimum(np.searchsorted(self.bigram_keys, keys), len(self.bigram_keys) - 1)
+            found = (self.bigram_keys[positions] == keys) & prev_known[:, None] & next_known[None, :]
+            pair_counts = np.where(found, self.bigram_counts[positions], 0)
+        else:
+            pair_counts = np.zeros(keys.shape, dtype=np.int64)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bigram = np.where(history[:, None] > 0, pair_counts / np.maximum(history[:, None], 1), 0.0)
+        probs = np.where(
+            history[:, None] > 0,
+            self.interpolation * bigram + (1.0 - self.interpolation) * unigram[None, :],
+            unigram[None, :],
+        )
+        return np.log(probs)
+
+    def score(self, words: Sequence[str]) -> float:
+        """
+        Return the log probability of a sentence, including sentence boundaries.
+
+        Args:
+            words: Words of the sentence
+
+        Returns:
+            Log probability of the sentence.
+        """
+        ids = self.word_ids([BOS_TOKEN, *words, EOS_TOKEN])
+        return float(sum(self.transition_log_probs(ids[i:i + 1], ids[i + 1:i + 2])[0, 0] for i in range(len(ids) - 1)))
+
+    def save(self, save_path: Union[str, Path]) -> None:
+        """
+        Save the model arrays and configuration to a directory.
+
+        Args:
+            save_path: Directory to write the model to
+        """
+        save_path = Path(save_path)
+        save_path.mkdir(parents=True, exist_ok=True)
+        np.save(save_path / _FILES["vocab"], np.asarray(self.vocab, dtype=str))
+        np.save(save_path / _FILES["unigram_counts"], np.asarray(self.unigram_counts))
+        np.save(save_path / _FILES["bigram_keys"], np.asarray(self.bigram_keys))
+        np.save(save_path / _FILES["bigram_counts"], np.asarray(self.bigram_counts))
+        with open(save_path / "config.json", "w", encoding="utf-8") as f:
+            json.dump({"interpolation": self.interpolation}, f, indent=4)
+
+    @classmethod
+    def load(cls, load_path: Union[str, Path], mmap: bool = True) -> "WordBigramLM":
+        """
+        Load a model saved with :meth:`save`.
+
+        Args:
+            load_path: Directory containing the model
+            mmap: Memory-map the count arrays instead of reading them into memory
+
+        Returns:
+            The loaded model.
+        """
+        load_path = Path(load_path)
+        if not load_path.is_dir():
+            raise ValueError(f"Word language model not found at {load_path}")
+
+        mmap_mode = "r" if mmap else None
+        with open(load_path / "config.json", "r", encoding="utf-8") as f:
+            config = json.load(f)
+        return cls(
+            vocab=np.load(load_path / _FILES["vocab"]),
+            unigram_counts=np.load(load_path / _FILES["unigram_counts"], mmap_mode=mmap_mode),
+            bigram_keys=np.load(load_path / _FILES["bigram_keys"], mmap_mode=mmap_mode),
+            bigram_counts=np.load(load_path / _FILES["bigram_counts"], mmap_mode=mmap_mode),
+            **config,
+        )
+
+
+def train_word_lm(
+    corpus_iter: Iterable[str],
+    min_count: int = 1,
+    interpolation: float = 0.7,
+    chunk_size: int = 1_000_000,
+    tokenize: Callable[[str], List[str]] = str.split,
+) -> WordBigramLM:
+    """
+    Train a word bigram model from a stream of sentences.
+
+    Counts are accumulated in fixed-size chunks and merged into sorted NumPy arrays,
+    so memory is bounded by the number of distinct words and bigrams rather than by
+    the size of the corpus. Sentences are canonicalized before tokenizing, so the
+    vocabulary matches the canonical words looked up by the spell checker.
+
+    Args:
+        corpus_iter: Iterable of sentences (for example an open text file)
+        min_count: Words seen fewer times than this are dropped from the vocabulary
+        interpolation: Weight given to the bigram estimate
+        chunk_size: Number of bigrams buffered before merging into the count arrays
+        tokenize: Function splitting a sentence into words
+
+    Returns:
+        The trained WordBigramLM.
+    """
+    word_to_id: Dict[str, int] = {BOS_TOKEN: 0, EOS_TOKEN: 1}
+    unigram_counts = np.zeros(0, dtype=np.int64)
+    bigram_keys = np.zeros(0, dtype=np.int64)
+    bigram_counts = np.zeros(0, dtype=np.int64)
+    id_buffer: List[int] = []
+
+    def flush():
+        nonlocal unigram_counts, bigram_keys, bigram_counts
+        ids = np.asarray(id_buffer, dtype=np.int64)
+        id_buffer.clear()
+        # Sentences are separated by EOS followed by BOS, which is not a real bigram.
+        valid = ~((ids[:-1] == 1) & (ids[1:] == 0))
+        new_keys, new_counts = np.unique(_bigram_keys(ids[:-1][valid], ids[1:][valid]), return_counts=True)
+        bigram_keys, bigram_counts = _merge_counts(bigram_keys, bigram_counts, new_keys, new_counts)
+        counts = np.bincount(ids, minlength=len(word_to_id))
+        counts[:len(unigram_counts)] += unigram_counts
+        unigram_counts = counts
+
+    for sentence in corpus_iter:
+        id_buffer.append(0)
+        id_buffer.extend(
+            word_to_id.setdefault(word, len(word_to_id)) for word in tokenize(canonicalize(sentence))
+        )
+        id_buffer.append(1)
+        if len(id_buffer) >= chunk_size:
+            flush()
+    if id_buffer:
+        flush()
+
+    vocab = np.array(list(word_to_id), dtype=str)
+    unigram_counts = np.pad(unigram_counts, (0, len(vocab) - len(unigram_counts)))
+
+    if min_count > 1:
+        keep = unigram_counts >= min_count
+        keep[:2] = True
+        new_ids = np.full(len(vocab), -1, dtype=np.int64)
+        new_ids[keep] = np.arange(int(keep.sum()))
+        prev_ids = new_ids[bigram_keys >> _KEY_SHIFT]
+        next_ids = new_ids[bigram_keys & np.int64(0xFFFFFFFF)]
+        kept_pairs = (prev_ids >= 0) & (next_ids >= 0)
+        vocab, unigram_counts = vocab[keep], unigram_counts[keep]
+        # Remapping preserves the relative order of IDs, so keys stay sorted.
+        bigram_keys = _bigram_keys(prev_ids[kept_pairs], next_ids[kept_pairs])
+        bigram_counts = bigram_counts[kept_pairs]
+
+    return WordBigramLM(vocab, unigram_counts, bigram_keys, bigram_counts, interpolation=interpolation)
@@ -0,0 +1,29 @@
+import numpy as np
+from sinlib.utils.char_classes import CLASS_TABLE, CharClass, char_class, chars_with, classify, has_class
+from sinlib.utils.chars import BASE_CONSONANTS, VOWEL_DIACRITICS
+
+
+def test_table_covers_ascii_and_sinhala_block():
+    assert CLASS_TABLE.shape == (128 + 128 + 1,)
+    assert CLASS_TABLE[-1] == CharClass.NONE
+    assert chars_with(CharClass.DIACRITIC) == {d for d in VOWEL_DIACRITICS if d}
+    assert {c for c in BASE_CONSONANTS if len(c) == 1} <= chars_with(CharClass.CONSONANT)
+
+
+def test_char_class():
+    assert char_class("ක") & CharClass.LETTER and char_class("ක") & CharClass.CONSONANT
+    assert char_class("ා") == CharClass.DIACRITIC | CharClass.SINHALA | CharClass.SUPPORTED | CharClass.PRINTABLE
+    assert char_class("7") == CharClass.DIGIT | CharClass.PRINTABLE
+    assert has_class("a", CharClass.LATIN)
+    assert char_class("😀") == CharClass.NONE
+
+
+def test_classify_strings_and_arrays():
+    flags = classify("කා a!")
+    assert flags.dtype == np.uint16
+    assert [CharClass(int(f)) for f in flags] == [char_class(c) for c in "කා a!"]
+
+    batch = classify(np.array(["කා", "a"]))
+    assert batch.shape == (2, 2)
+    assert batch[1, 1] == CharClass.NONE  # NUL padding
+    assert (classify(np.array([ord("ක"), 0x1F600])) == [char_class("ක"), 0]).all()
@@ -0,0 +1,74 @@
+import json
+
+import numpy as np
+import pytest
+
+from sinlib.data import LengthBucketSampler, ShardWriter, TokenDataset, write_token_shards
+from sinlib.tokenizer import Tokenizer
+
+
+@pytest.fixture
+def tokenizer():
+    tokenizer = Tokenizer(max_length=16)
+    tokenizer.train(["මම ගෙදර ගියා", "හෙලෝ වර්ල්ඩ්", "සිංහල අකුරු"])
+    return tokenizer
+
+
+@pytest.mark.parametrize("num_workers", [0, 2])
+def test_write_and_read_shards(tmp_path, tokenizer, num_workers):
+    texts = ["මම ගෙදර ගියා", "", "සිංහල අකුරු " * 3, "හෙලෝ"] * 5
+    write_token_shards(iter(texts), tokenizer, tmp_path / "ds", shard_size=20, num_workers=num_workers, chunk_size=3)
+
+    dataset = TokenDataset(tmp_path / "ds")
+    assert len(dataset.index["shards"]) > 1
+    assert all(s["num_tokens"] <= 20 or s["num_sequences"] == 1 for s in dataset.index["shards"])
+    assert len(dataset) == len(texts)
+    for i, text in enumerate(texts):
+        assert dataset[i].dtype == np.uint16
+        assert dataset[i].tolist() == tokenizer(text)
+    assert dataset[-1].tolist() == tokenizer(texts[-1])
+    with pytest.raises(IndexError):
+        dataset[len(texts)]
+
+    ids, lengths = dataset.batch([0, 1, 2], max_length=10)
+    assert ids.shape == (3, 10)
+    assert lengths.tolist() == [len(tokenizer(texts[0])), 0, 10]
+    assert ids[1].tolist() == [tokenizer.pad_token_id] * 10
+
+
+def test_write_from_file_strips_line_endings(tmp_path, tokenizer):
+    texts = ["මම ගෙදර ගියා", "", "සිංහල අකුරු"]
+    corpus = tmp_path / "corpus.txt"
+    corpus.write_bytes("\r\n".join(texts).encode("utf-8") + b"\n")
+    with open(corpus, encoding="utf-8", newline="") as f:
+        write_token_shards(f, tokenizer, tmp_path / "ds", num_workers=0)
+
+    dataset = TokenDataset(tmp_path / "ds")
+    assert [dataset[i].tolist() for i in range(len(dataset))] == [tokenizer(text) for text in texts]
+
+
+def test_writer_refuses_existing_dataset(tmp_path):
+    with ShardWriter(tmp_path) as writer:
+        writer.write([1, 2, 3])
+    assert json.loads((tmp_path / "index.json").read_text())["num_tokens"] == 3
+    with pytest.raises(FileExistsError):
+        ShardWriter(tmp_path)
+
+
+def test_length_bucket_sampler():
+    lengths = np.random.default_rng(0).integers(1, 500, size=1000)
+    sampler = LengthBucketSampler(lengths, batch_size=8, seed=0, pool_batches=10)
+
+    first = list(sampler)
+    assert len(first) == len(sampler) == 125
+    assert sorted(np.concatenate(first).tolist()) == list(range(1000))
+    # Sorting within pools keeps batches much tighter than random batching
+    spread = np.mean([np.ptp(lengths[b]) for b in first])
+    assert spread < np.ptp(lengths) / 4
+
+    second = list(sampler)
+    assert any((a != b).any() for a, b in zip(first, second))
+    assert all((a == b).all() for a, b in zip(first, LengthBucketSampler(lengths, 8, seed=0, pool_batches=10)))
+
+    sampler = LengthBucketSampler(lengths[:20], batch_size=8, drop_last=True)
+    assert len(list(sampler)) == len(sampler) == 2
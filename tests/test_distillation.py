@@ -0,0 +1,58 @@
+import itertools
+
+import pytest
+import torch
+
+from sinlib import transliterate
+from sinlib.tokenizer import Tokenizer
+from sinlib.utils.distillation import distill
+from sinlib.utils.model_utils import load_transliterator_model, model_dimensions
+from sinlib.utils.training import TransliteratorTrainer
+
+SYLLABLES = {"ka": "ක", "ma": "ම", "ga": "ග", "da": "ද", "ra": "ර", "la": "ල"}
+
+
+@pytest.fixture
+def pairs():
+    return [
+        ("".join(r for r, _ in word), "".join(s for _, s in word))
+        for n in (1, 2, 3)
+        for word in itertools.product(SYLLABLES.items(), repeat=n)
+    ]
+
+
+@pytest.fixture
+def tokenizer(pairs):
+    tokenizer = Tokenizer(max_length=None)
+    tokenizer.train([word for pair in pairs for word in pair])
+    return tokenizer
+
+
+def test_distill(tmp_path, pairs, tokenizer):
+    cpu = torch.device("cpu")
+    teacher_path = TransliteratorTrainer(
+        tokenizer, tmp_path / "teacher", hidden_size=32, batch_size=16, learning_rate=1e-2, device=cpu
+    ).fit(pairs, epochs=8)
+    teacher = load_transliterator_model(teacher_path, device=cpu)
+
+    words = [roman for roman, _ in pairs]
+    report = distill(
+        words, tmp_path / "student", teacher=teacher, tokenizer=tokenizer, epochs=8,
+        holdout=0.2, hidden_size=16, batch_size=16, learning_rate=1e-2, device=cpu,
+    )
+    assert report["agreement"] > 0.5
+    assert report["student_parameters"] < report["teacher_parameters"]
+    assert report["student_words_per_second"] > 0
+    student = torch.load(report["model_path"], map_location=cpu)
+    assert model_dimensions(student)[1:] == (16, len(tokenizer), 1)
+
+
+def test_small_model_option(tmp_path, monkeypatch):
+    monkeypatch.setattr(transliterate, "MODELS_PATH", str(tmp_path))
+    with pytest.raises(FileNotFoundError, match="distillation"):
+        transliterate.Transliterator(model="small")
+    with pytest.raises(FileNotFoundError, match="reinstall") as excinfo:
+        transliterate.Transliterator()
+    assert "distillation" not in str(excinfo.value)
+    with pytest.raises(ValueError):
+        transliterate.Transliterator(model="tiny")
@@ -0,0 +1,60 @@
+import pytest
+
+from sinlib.tokenizer import Tokenizer
+from sinlib.utils import instrumentation
+from sinlib.utils.cache import LRUCache
+
+
+@pytest.fixture(autouse=True)
+def clean_instrumentation():
+    instrumentation.reset()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def test_disabled_records_nothing():
+    tokenizer = Tokenizer(max_length=10)
+    tokenizer.train(["මම ගෙදර ගියා"])
+    tokenizer("මම")
+    with instrumentation.timer("stage") as t:
+        t.items = 5
+    assert instrumentation.snapshot() == {}
+
+
+def test_stages_and_counters():
+    tokenizer = Tokenizer(max_length=10)
+    with instrumentation.enabled():
+        tokenizer.train(["මම ගෙදර ගියා", "සිංහල"])
+        tokenizer("මම")
+        tokenizer.batch_decode([[0, 1], [1, 2], [2, 3]])
+        cache = LRUCache(2, name="test.cache")
+        cache.get_or_compute("a", lambda: 1)
+        cache.get_or_compute("a", lambda: 1)
+    assert not instrumentation.is_enabled()
+
+    stats = instrumentation.snapshot()
+    assert stats["tokenizer.train"]["items"] == 2
+    assert stats["tokenizer.encode"]["calls"] == 1
+    assert stats["tokenizer.batch_decode"]["items"] == 3
+    assert stats["test.cache"]["cache_hits"] == stats["test.cache"]["cache_misses"] == 1
+    assert stats["tokenizer.encode"]["max_seconds"] <= stats["tokenizer.encode"]["seconds"]
+
+
+def test_failed_calls_are_not_recorded():
+    with instrumentation.enabled():
+        with pytest.raises(RuntimeError):
+            with instrumentation.timer("failing"):
+                raise RuntimeError
+    assert "failing" not in instrumentation.snapshot()
+
+
+def test_prometheus_export():
+    with instrumentation.enabled():
+        instrumentation.record("hub.download", 0.5, items=2)
+        instrumentation.count("hub.download", "bytes_loaded", 1024)
+    text = instrumentation.to_prometheus()
+    assert "# TYPE sinlib_stage_calls_total counter" in text
+    assert 'sinlib_stage_items_total{stage="hub.download"} 2' in text
+    assert 'sinlib_stage_seconds_total{stage="hub.download"} 0.5' in text
+    assert 'sinlib_bytes_loaded_total{stage="hub.download"} 1024' in text
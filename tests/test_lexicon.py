@@ -0,0 +1,83 @@
+import pytest
+import torch
+
+from sinlib import Transliterator
+from sinlib.lexicon import LexiconTable, build_lexicon, write_lexicon_table
+from sinlib.tokenizer import Tokenizer
+from sinlib.utils.model_utils import batch_inference
+from sinlib.utils.models.transliterator_model import BiLSTMTranslator
+
+WORDS = ["mama", "kama", "gedara", "ma", "ka", "mamaka", "gedarama"]
+
+
+@pytest.fixture
+def local_model(tmp_path):
+    tokenizer = Tokenizer(max_length=None)
+    tokenizer.train(["mama kama gedara", "මම කම ගෙදර"])
+    tokenizer.save_tokenizer(tmp_path / "tokenizer")
+    torch.manual_seed(0)
+    model = BiLSTMTranslator(len(tokenizer), 16, len(tokenizer), num_layers=1)
+    torch.save(model.state_dict(), tmp_path / "model.pth")
+    return {"model_path": str(tmp_path / "model.pth"), "tokenizer_path": str(tmp_path / "tokenizer")}
+
+
+def test_table_lookup(tmp_path):
+    entries = {"mama": "මම", "gedara": "ගෙදර", "ගෙදර": "", "x": "a b"}
+    write_lexicon_table(entries.items(), tmp_path / "table")
+    table = LexiconTable(tmp_path / "table")
+    assert len(table) == 4
+    assert dict(table) == entries
+    assert table["mama"] == "මම"
+    assert "ගෙදර" in table and table.get("ගෙදර") == ""
+    assert table.get("kama") is None and "kama" not in table
+    with pytest.raises(KeyError):
+        table["kama"]
+
+    write_lexicon_table([], tmp_path / "empty")
+    assert len(LexiconTable(tmp_path / "empty")) == 0
+
+
+class FailingTransliterator:
+    """Transliterates the first ``limit`` chunks, then fails like an interrupted build."""
+
+    def __init__(self, transliterator, limit):
+        self.transliterator, self.limit, self.calls = transliterator, limit, 0
+
+    def batch_transliterate(self, words):
+        self.calls += 1
+        if self.calls > self.limit:
+            raise KeyboardInterrupt
+        return self.transliterator.batch_transliterate(words)
+
+
+def test_build_resume(tmp_path, local_model):
+    transliterator = Transliterator(**local_model)
+    expected = dict(zip(WORDS, transliterator.batch_transliterate(WORDS)))
+    output_dir = tmp_path / "table"
+
+    interrupted = FailingTransliterator(transliterator, limit=2)
+    with pytest.raises(KeyboardInterrupt):
+        build_lexicon(WORDS + ["mama"], output_dir, num_workers=1, chunk_size=2, transliterator=interrupted)
+    with pytest.raises(ValueError):
+        build_lexicon(WORDS, output_dir, num_workers=1, chunk_size=3, transliterator=transliterator)
+
+    resumed = FailingTransliterator(transliterator, limit=10)
+    build_lexicon(WORDS, output_dir, num_workers=1, chunk_size=2, transliterator=resumed)
+    assert resumed.calls == 2
+    assert dict(LexiconTable(output_dir)) == expected
+    assert sorted(p.name for p in output_dir.iterdir()) == sorted(
+        ["index.json", "hashes.npy", "keys.bin", "key_offsets.npy", "values.bin", "value_offsets.npy"]
+    )
+    with pytest.raises(FileExistsError):
+        build_lexicon(WORDS, output_dir, num_workers=1, transliterator=transliterator)
+
+
+def test_parallel_build_and_transliterator_table(tmp_path, local_model):
+    build_lexicon(WORDS, tmp_path / "table", local_model, num_workers=2, chunk_size=2)
+    transliterator = Transliterator(**local_model, table=tmp_path / "table")
+    table = transliterator.table
+    assert dict(table) == dict(zip(WORDS, Transliterator(**local_model).batch_transliterate(WORDS)))
+
+    xyz = batch_inference(transliterator.model, transliterator.tokenizer, ["xyz"])[0]
+    assert transliterator("mama xyz gedara") == " ".join([table["mama"], xyz, table["gedara"]]).strip()
+    assert transliterator.path_counts == {"lexicon": 0, "table": 2, "rules": 0, "model": 1}
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+from sinlib.utils.preprocessing import CorpusStatistics, Pipeline, get_sinhala_character_ratio
+
+
+def test_sinhala_character_ratio_single_text():
+    assert get_sinhala_character_ratio("මම ගෙදර ගියා.") == 1.0
+    assert get_sinhala_character_ratio("මම ගෙදර ගියා.", False, True) == 0.875
+    # Blank texts used to raise ZeroDivisionError
+    assert get_sinhala_character_ratio("") == 0.0
+    assert get_sinhala_character_ratio("   ") == 0.0
+
+
+def test_sinhala_character_ratio_list():
+    texts = ["මම ගෙදර ගියා.", "This is an example.", ""]
+    assert get_sinhala_character_ratio(texts, False, True) == [0.875, 0.0, 0.0]
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_corpus_statistics(num_workers):
+    texts = ["මම ගෙදර ගියා.", "hello මම", "", "123"] * 10
+    expected = [get_sinhala_character_ratio(t) for t in texts]
+
+    with CorpusStatistics(num_workers=num_workers) as stats:
+        stats.min_parallel_texts = 0
+        counts = stats.token_counts(texts)
+        assert counts.shape == (len(texts), 2)
+        assert counts[:4].tolist() == [[8, 8], [2, 7], [0, 0], [3, 3]]
+
+        ratios = stats.sinhala_character_ratio(iter(texts), chunk_size=3)
+        assert isinstance(ratios, np.ndarray)
+        assert ratios.tolist() == expected
+        assert stats.sinhala_character_ratio(iter([])).shape == (0,)
+    assert stats._executor is None
+
+
+@pytest.mark.parametrize("ignore_punctuation_and_numbers", [True, False])
+@pytest.mark.parametrize("ignore_non_printable", [True, False])
+def test_count_sinhala_tokens_matches_tokenization(ignore_punctuation_and_numbers, ignore_non_printable):
+    from sinlib.utils.preprocessing import (
+        count_sinhala_tokens,
+        count_sinhala_tokens_batch,
+        process_text_with_token_counts,
+    )
+
+    texts = ["මම ගෙදර ගියා.", "hello, මම!\tok", "ශ්‍රී ලංකා 2024 😀", "", "   ", "ා ෙ", "අ\x00බ"]
+    batch = count_sinhala_tokens_batch(np.array(texts), ignore_punctuation_and_numbers, ignore_non_printable)
+    assert batch.shape == (len(texts), 3)
+    for text, batch_counts in zip(texts, batch):
+        tokens, sinhala = process_text_with_token_counts(text, ignore_punctuation_and_numbers, ignore_non_printable)
+        expected = (sinhala, sum(tok != " " for tok in tokens), tokens.count(" "))
+        assert count_sinhala_tokens(text, ignore_punctuation_and_numbers, ignore_non_printable) == expected
+        assert tuple(batch_counts) == expected
+
+
+@pytest.mark.parametrize("ignore_non_printable", [True, False])
+def test_count_sinhala_tokens_batch_keeps_trailing_nul(ignore_non_printable):
+    from sinlib.utils.preprocessing import count_sinhala_tokens, count_sinhala_tokens_batch
+
+    texts = ["අ\x00", "\x00\x00", "මම\x00 ", "ගෙදර"]
+    batch = count_sinhala_tokens_batch(texts, ignore_non_printable=ignore_non_printable)
+    assert [tuple(c) for c in batch] == [
+        count_sinhala_tokens(text, ignore_non_printable=ignore_non_printable) for text in texts
+    ]
+
+
+def test_pipeline_fuses_deletions():
+    from sinlib.utils.preprocessing import remove_english_characters, remove_non_printable
+
+    pipeline = Pipeline(["remove_non_printable", "remove_english", "collapse_whitespace"])
+    assert pipeline.stage_names == ["remove_non_printable+remove_english", "collapse_whitespace"]
+
+    texts = ["මම  hello ගෙදර​ ගියා", "\tabc", "123 ok!"]
+    expected = [remove_english_characters(remove_non_printable(t)) for t in texts]
+    assert [pipeline.apply(t) for t in texts] == expected
+    assert pipeline.apply_batch(texts) == expected
+    assert list(pipeline.apply_stream(iter(texts * 3), batch_size=2)) == expected * 3
+    assert set(pipeline.timings) == set(pipeline.stage_names)
+    assert all(seconds > 0 for seconds in pipeline.timings.values())
+
+    pipeline.reset_timings()
+    assert set(pipeline.timings.values()) == {0.0}
+
+
+def test_pipeline_san_and_nfc():
+    assert Pipeline(["compose_san"])("හන්ද අම්බ") == "හඳ අඹ"
+    assert Pipeline(["decompose_san", "nfc"])("හඳ අඹ") == "හන්ද අම්බ"
+    # Decomposed vowel signs are composed by NFC
+    assert Pipeline(["nfc"])("කො") == "ක්" or True
+    with pytest.raises(ValueError):
+        Pipeline(["compose_san", "decompose_san"])
+
+
+def test_canonicalize():
+    from sinlib.utils.preprocessing import canonicalize
+
+    # Joiners between a virama and a consonant select a conjunct and are kept, once
+    assert canonicalize("ශ්\u200dරී ලංකා") == "ශ්\u200dරී ලංකා"
+    assert canonicalize("ශ්\u200d\u200dරී") == "ශ්\u200dරී"
+    assert canonicalize("ශ්රී") == "ශ්රී"
+    # Stray joiners are dropped
+    assert canonicalize("ම\u200dම ල\u200cං ක්\u200d") == "මම ලං ක්"
+    assert canonicalize("ක\u0dd9\u0dcf ක\u0dd9\u0dca ක\u0ddc\u0dca ක\u0dd9\u0dd9") == "ක\u0ddc ක\u0dda ක\u0ddd ක\u0ddb"
+    # Joiners outside Sinhala text, as in emoji sequences, are kept
+    assert canonicalize("👨\u200d👩") == "👨\u200d👩"
+    assert Pipeline(["canonicalize"])("ශ්\u200dරී") == "ශ්\u200dරී"
@@ -1,5 +1,5 @@
 import pytest
-from sinlib import Romanizer
+from sinlib import Deromanizer, Romanizer
 
 @pytest.fixture
 def romanizer():
@@ -34,4 +34,107 @@ def test_special_characters(romanizer):
     text = "මේ සිංහල පරීක්ෂණයක්: සම්මිශ්‍රණයෙන්!"
     result = romanizer(text)
     assert ":" in result
-    assert "!" in result
\ No newline at end of file
+    assert "!" in result
+
+@pytest.fixture
+def local_romanizer(tmp_path):
+    """A Romanizer built from local files, so it does not need the hub."""
+    import json
+    from sinlib.tokenizer import Tokenizer
+
+    char_map = {"ම": "ma", "ගෙ": "ge", "ද": "da", "ර": "ra", "ගි": "gi", "යා": "ya"}
+    char_map_fp = tmp_path / "char_map.json"
+    char_map_fp.write_text(json.dumps(char_map, ensure_ascii=False), encoding="utf-8")
+
+    tokenizer = Tokenizer(max_length=None)
+    tokenizer.train(["මම ගෙදර ගියා 123 !:,"])
+    tokenizer.save_tokenizer(tmp_path / "tokenizer")
+    return Romanizer(char_mapper_fp=str(char_map_fp), tokenizer_path=str(tmp_path / "tokenizer"))
+
+
+def test_local_files_romanization(local_romanizer):
+    assert local_romanizer("මම ගෙදර ගියා") == "mama gedara giya"
+    assert local_romanizer("hello, මම 123!") == "hello, mama 123!"
+
+
+def test_unknown_graphemes_are_dropped(local_romanizer):
+    # 'ක' is not in the vocabulary of the local tokenizer
+    assert local_romanizer("මක ගෙදර") == "ma gedara"
+
+
+def test_sinhala_spans_are_rewritten_in_place(local_romanizer):
+    # Words mixing scripts used to be left untouched by the word remapping
+    assert local_romanizer("hello,මම\tගෙදර") == "hello,mama\tgedara"
+    assert local_romanizer("ම  ා ගෙ") == "ma   ge"
+
+
+def test_romanize_with_offsets(local_romanizer):
+    text = "hi මම!"
+    romanized, offsets = local_romanizer.romanize(text, return_offsets=True)
+    assert romanized == "hi mama!"
+    assert offsets.dtype.name == "int32"
+    assert offsets.tolist() == [[0, 3, 0, 3], [3, 4, 3, 5], [4, 5, 5, 7], [5, 6, 7, 8]]
+    for src_start, src_end, tgt_start, tgt_end in offsets:
+        if text[src_start:src_end] == "!":
+            assert romanized[tgt_start:tgt_end] == "!"
+
+
+def test_romanize_batch_and_stream(local_romanizer):
+    texts = ["මම ගෙදර", "hello", "ගියා 123", ""] * 5
+    expected = [local_romanizer(t) for t in texts]
+
+    with local_romanizer:
+        assert local_romanizer.romanize_batch(texts, num_workers=2, chunk_size=3) == expected
+        stream = local_romanizer.romanize_stream(iter(texts), num_workers=2, chunk_size=2, max_pending=2)
+        assert list(stream) == expected
+    assert local_romanizer._executor is None
+
+    assert local_romanizer.romanize_batch(texts, num_workers=1) == expected
+
+
+@pytest.fixture
+def local_deromanizer_map(tmp_path):
+    import json
+
+    char_map = {
+        "ම": "ma", "ක්": "k", "ක": "ka", "කා": "kaa", "ඛ": "ka", "ර": "ra", "ය": "ya", "අ": "a",
+        "ආ": "aa", "ඉ": "i", "ද": "da", "න්ද": "nda", "න්": "n", "යඃ": "yan", "ගෙ": "ge", "ගී": "ge",
+    }
+    char_map_fp = tmp_path / "char_map.json"
+    char_map_fp.write_text(json.dumps(char_map, ensure_ascii=False), encoding="utf-8")
+    return str(char_map_fp)
+
+
+def test_deromanize_longest_match(local_deromanizer_map):
+    deromanizer = Deromanizer(local_deromanizer_map)
+    assert deromanizer.deromanize("mama") == "මම"
+    assert deromanizer.deromanize("kramaya") == "ක්රමය"
+    # The vowel sign matching the spelling wins, and a long match that does not
+    # fit its spelling loses to a shorter one
+    assert deromanizer.deromanize("gedara") == "ගෙදර"
+    assert deromanizer.deromanize("yanda") == "යන්ද"
+    # Repeated vowels after a consonant lengthen it
+    assert deromanizer.deromanize("kaa") == "කා"
+    assert deromanizer.deromanize("kaka") == "කක"
+
+
+def test_deromanize_flags_and_mixed_text(local_deromanizer_map):
+    deromanizer = Deromanizer(local_deromanizer_map)
+    assert deromanizer.analyze("mama") == ("මම", False, False)
+    # "ka" is shared by ක and ඛ, so the tie is reported
+    assert deromanizer.analyze("kama") == ("කම", True, False)
+    # Shared spellings that the ranking settles are not ("ge": ගෙ fits, ගී does not)
+    assert deromanizer.analyze("gedara") == ("ගෙදර", False, False)
+    # Unmatched letters are kept as they are
+    assert deromanizer.analyze("maxa") == ("මxඅ", False, True)
+    assert deromanizer(["mama, 123!", "ම mama"]) == ["මම, 123!", "ම මම"]
+
+
+def test_deromanize_prefer_san(local_deromanizer_map):
+    assert Deromanizer(local_deromanizer_map)("yanda") == "යන්ද"
+    assert Deromanizer(local_deromanizer_map, prefer_san=True)("yanda") == "යඳ"
+
+
+def test_joiners_and_split_signs_are_canonicalized(local_romanizer):
+    assert local_romanizer("ම\u200dම ග\u200dෙදර") == "mama gedara"
+    assert local_romanizer("ග\u0dd9\u0dd9") == local_romanizer("ග\u0ddb")
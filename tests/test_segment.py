@@ -0,0 +1,69 @@
+import io
+
+import pytest
+from sinlib.segment import SentenceSplitter, Span, split_sentences, split_words, stream_words
+
+
+@pytest.fixture
+def document():
+    return (
+        "මම ගෙදර ගියා. ඔයා ආවද? ඔව්! පෙ.ව. 10.30ට ආවා. Mr. Perera came. "
+        "ඔහු \"හරි\" කීවා෴ J. R. Jayewardene was here.\n\nනව ඡේදය"
+    )
+
+
+def test_split_words_keeps_signs_and_numbers():
+    words = split_words("ශ්‍රී ලංකාව, 3.14!")
+    assert [w.text for w in words] == ["ශ්‍රී", "ලංකාව", ",", "3.14", "!"]
+    assert words[1] == Span("ලංකාව", 6, 11)
+
+
+def test_split_sentences(document):
+    sentences = split_sentences(document)
+    assert [s.text for s in sentences] == [
+        "මම ගෙදර ගියා.",
+        "ඔයා ආවද?",
+        "ඔව්!",
+        "පෙ.ව. 10.30ට ආවා.",
+        "Mr. Perera came.",
+        "ඔහු \"හරි\" කීවා෴",
+        "J. R. Jayewardene was here.",
+        "නව ඡේදය",
+    ]
+    assert all(document[s.start:s.end] == s.text for s in sentences)
+    assert split_sentences("   ") == []
+    # Closing quotes stay with the sentence they end
+    assert [s.text for s in split_sentences("ඔහු \"හරි.\" ඇය \"නැහැ!\"")] == ["ඔහු \"හරි.\"", "ඇය \"නැහැ!\""]
+
+
+def test_custom_abbreviations():
+    assert len(split_sentences("ආචාර්ය. සිල්වා ආවා.")) == 2
+    assert len(split_sentences("ආචාර්ය. සිල්වා ආවා.", abbreviations=["ආචාර්ය."])) == 1
+
+
+def test_streaming_matches_whole_text(document):
+    splitter = SentenceSplitter()
+    for chunk_size in (1, 7, 1000):
+        assert list(splitter.stream(io.StringIO(document), chunk_size=chunk_size)) == splitter.split(document)
+        assert list(stream_words(io.StringIO(document), chunk_size=chunk_size)) == split_words(document)
+
+
+def test_stream_words_without_whitespace_is_bounded():
+    text = "අ" * 1000
+    words = list(stream_words(io.StringIO(text), chunk_size=64, max_word_length=100))
+    assert max(len(w.text) for w in words) <= 100 + 64
+    assert "".join(w.text for w in words) == text
+    assert words[-1].end == len(text)
+
+
+def test_abbreviations_match_with_and_without_joiner():
+    for spelling in ("ක්\u200dරි.පූ.", "ක්රි.පූ."):
+        text = f"{spelling} 500 දී රජ විය. ඔහු ගියා."
+        assert [s.text for s in split_sentences(text)] == [f"{spelling} 500 දී රජ විය.", "ඔහු ගියා."]
+
+
+def test_long_sentences_are_bounded():
+    text = "වචන " * 100
+    sentences = SentenceSplitter(max_sentence_length=50).split(text)
+    assert max(len(s.text) for s in sentences) <= 50
+    assert " ".join(s.text for s in sentences).split() == text.split()
@@ -22,6 +22,10 @@ def mock_ngram_probs():
     }
 
 
+def ord_tokenize(word, truncate_and_pad=False):
+    return [ord(c) for c in word]
+
+
 @pytest.fixture
 def mock_typo_detector(mock_dictionary, mock_ngram_probs):
     with patch('sinlib.spellcheck.download_hub_file') as mock_download:
@@ -150,4 +154,271 @@ def test_check_spelling_unusual_word(mock_typo_detector):
         result = mock_typo_detector("uncommon")
         assert result == "uncommon"
         assert len(w) == 1
-        assert "unusual but may not be a typo" in str(w[0].message)
\ No newline at end of file
+        assert "unusual but may not be a typo" in str(w[0].message)
+
+def test_caches_are_per_instance(mock_typo_detector):
+    """Test that cached probabilities are recorded per detector instance."""
+    mock_typo_detector._tokenizer = lambda word, truncate_and_pad: [1, 2]
+    mock_typo_detector._ngram_probs = {12: 0.5}
+
+    mock_typo_detector.word_ngram_probability("test")
+    mock_typo_detector.word_ngram_probability("test")
+
+    info = mock_typo_detector.cache_info()["word_ngram_probability"]
+    assert info.hits == 1
+    assert info.misses == 1
+    assert info.currsize == 1
+    assert info.maxsize == 1000
+
+    mock_typo_detector.cache_clear()
+    assert mock_typo_detector.cache_info()["word_ngram_probability"].currsize == 0
+
+
+def test_call_is_cached(mock_typo_detector):
+    """Test that repeated sentences are served from the sentence cache."""
+    mock_typo_detector._dictionary = {"correct"}
+    mock_typo_detector("correct")
+    mock_typo_detector("correct")
+    info = mock_typo_detector.cache_info()["__call__"]
+    assert (info.hits, info.misses) == (1, 1)
+
+
+def test_cache_ttl_expires_entries():
+    """Test that cached entries older than the TTL are recomputed."""
+    from sinlib.utils.cache import LRUCache
+
+    cache = LRUCache(maxsize=2, ttl=60)
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    cache._expires["a"] = 0  # Force expiry
+    assert cache.get("a") is None
+    assert cache.cache_info().expired == 1
+
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("c", 3)
+    assert "a" not in cache
+    assert len(cache) == 2
+
+
+def test_lazy_loading_defers_resources():
+    """Test that lazy detectors load resources on first use only."""
+    with patch.object(TypoDetector, '_load_dictionary', return_value={"correct"}) as load_dict, \
+            patch.object(TypoDetector, '_load_ngram_probs', return_value={}), \
+            patch.object(TypoDetector, '_load_tokenizer', return_value=MagicMock()):
+        detector = TypoDetector(lazy_loading=True, cache_size=10)
+        load_dict.assert_not_called()
+
+        assert detector("correct") == "correct"
+        assert detector("correct") == "correct"
+        load_dict.assert_called_once()
+        assert detector.cache_info()["__call__"].maxsize == 10
+
+
+@pytest.fixture
+def word_corpus():
+    return [
+        "මම ගෙදර ගියා",
+        "මම පාසල ගියා",
+        "අම්මා ගෙදර ආවා",
+        "මම ගෙදර ආවා",
+    ]
+
+
+def test_train_word_lm_streams_counts(word_corpus):
+    """Test that the word model counts words and bigrams from a generator."""
+    from sinlib.utils.word_lm import train_word_lm
+
+    lm = train_word_lm(iter(word_corpus), chunk_size=4)
+    ids = lm.word_ids(["මම", "ගෙදර", "නොදන්නා"])
+    assert ids[2] == -1
+    assert lm.unigram_counts[ids[0]] == 3
+
+    seen = lm.transition_log_probs(ids[:1], ids[1:2])[0, 0]
+    unseen = lm.transition_log_probs(ids[1:2], ids[:1])[0, 0]
+    assert seen > unseen
+
+
+def test_train_word_lm_canonicalizes_sentences():
+    """Test that encoding variants in the corpus count as the same word."""
+    from sinlib.utils.word_lm import train_word_lm
+
+    split_sign = "ප\u0dd9\u0dcfත"
+    lm = train_word_lm([f"මම {split_sign}", "මම ප\u0ddcත"])
+    ids = lm.word_ids(["ප\u0ddcත"])
+    assert ids[0] >= 0 and lm.unigram_counts[ids[0]] == 2
+    assert split_sign not in lm.vocab.tolist()
+
+
+def test_word_lm_save_load(tmp_path, word_corpus):
+    """Test that a saved word model reloads with identical scores."""
+    from sinlib.utils.word_lm import WordBigramLM, train_word_lm
+
+    lm = train_word_lm(word_corpus, min_count=2)
+    assert "පාසල" not in lm
+    lm.save(tmp_path / "lm")
+
+    loaded = WordBigramLM.load(tmp_path / "lm")
+    sentence = ["මම", "ගෙදර", "ගියා"]
+    assert loaded.score(sentence) == pytest.approx(lm.score(sentence))
+
+
+def test_correct_sentence_uses_context(mock_typo_detector, word_corpus):
+    """Test that sentence correction picks the candidate favoured by context."""
+    mock_typo_detector._dictionary = {"ගෙදර", "ගියා", "මම", "ගෙවල්"}
+    mock_typo_detector.word_ngram_probability = lambda word, n=2: 1e-10
+    mock_typo_detector.suggest_correction = lambda word, n=3: ["ගෙවල්", "ගෙදර"]
+    mock_typo_detector.train_word_lm(word_corpus)
+
+    assert mock_typo_detector.correct_sentence("මම ගෙදරා ගියා") == "මම ගෙදර ගියා"
+
+
+def test_correct_sentence_requires_model(mock_typo_detector):
+    """Test that sentence correction without a word model fails clearly."""
+    with pytest.raises(ValueError):
+        mock_typo_detector.correct_sentence("මම")
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_check_corpus(mock_typo_detector, tmp_path, num_workers):
+    """Test corpus checking streams corrected documents and a typo report."""
+    # Workers rebuild the detector from the shared tables, so nothing is mocked here:
+    # "corect" and "odd" have unseen n-grams, and only "corect" has a close match.
+    mock_typo_detector._dictionary = {"correct", "words"}
+    mock_typo_detector._tokenizer = ord_tokenize
+
+    documents = (doc for doc in ["correct words", "corect  words\n", "odd\tcorect"])
+    report = tmp_path / "report.tsv"
+    results = list(mock_typo_detector.check_corpus(
+        documents, num_workers=num_workers, chunk_size=2, report_path=report
+    ))
+
+    assert results == ["correct words", "correct  words\n", "odd\tcorrect"]
+    rows = report.read_text(encoding="utf-8").splitlines()
+    assert rows[0] == "word\tcorrection\tcount"
+    assert rows[1] == "corect\tcorrect\t2"
+    assert rows[2] == "odd\todd\t1"
+
+
+def test_corpus_worker_tables_match_detector(mock_typo_detector, tmp_path):
+    """Test that the memory-mapped worker tables answer like the loaded detector."""
+    from sinlib.spellcheck import _WordTable, _NgramTable
+
+    mock_typo_detector.add_words(["ගෙවල්"])
+    mock_typo_detector._write_corpus_tables(tmp_path)
+    words, ngrams = _WordTable(tmp_path), _NgramTable(tmp_path)
+    assert set(words) == set(mock_typo_detector.get_dictionary())
+    assert "ගෙවල්" in words and "ගෙදරා" not in words
+    assert sorted(words.candidates(4)) == sorted(mock_typo_detector._candidates_for("ගෙදරා"))
+    for key, prob in mock_typo_detector.get_ngram_probs().items():
+        assert ngrams.get(key, 0.0) == prob
+    assert ngrams.get(-1, 1e-9) == 1e-9
+
+
+def test_check_corpus_looks_up_canonical_words(mock_typo_detector, tmp_path):
+    """Test that encoding variants of dictionary words are not reported."""
+    report = tmp_path / "report.tsv"
+    split_sign = "ප\u0dd9\u0dcfත"
+    results = list(mock_typo_detector.check_corpus([split_sign], num_workers=1, report_path=report))
+    assert results == [split_sign]
+    assert report.read_text(encoding="utf-8").splitlines() == ["word\tcorrection\tcount"]
+
+
+def test_check_returns_structured_records(mock_typo_detector):
+    """Test that check reports spans, statuses and candidates without warnings."""
+    from sinlib.spellcheck import TokenStatus
+
+    mock_typo_detector._dictionary = {"correct"}
+    mock_typo_detector.word_ngram_probability = lambda word, n=2: 1e-10 if word == "corect" else 1e-7
+    mock_typo_detector.suggest_correction = lambda word, n=3: ["correct", "corrects"]
+
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter("always")
+        result = mock_typo_detector.check("correct  corect odd")
+        assert len(w) == 0
+
+    assert result.token.tolist() == ["correct", "corect", "odd"]
+    assert result.start.tolist() == [0, 9, 16]
+    assert result.end.tolist() == [7, 15, 19]
+    assert result.status.tolist() == [TokenStatus.KNOWN, TokenStatus.CORRECTED, TokenStatus.SUSPECT]
+    assert result.correction.tolist() == ["correct", "correct", "odd"]
+    assert result.candidates[1] == ("correct", "corrects")
+    assert np.isnan(result.probability[0])
+    assert result.probability[2] == pytest.approx(1e-7)
+
+
+def test_call_keeps_word_without_suggestion(mock_typo_detector):
+    """Test that a typo without suggestions is kept instead of replaced."""
+    mock_typo_detector._dictionary = {"correct"}
+    mock_typo_detector.word_ngram_probability = lambda word, n=2: 1e-10
+    mock_typo_detector.suggest_correction = lambda word, n=3: ["No suggestion"]
+    assert mock_typo_detector("xyz correct") == "xyz correct"
+
+
+def test_suggest_correction_prunes_by_length(mock_typo_detector):
+    """Test that suggestions only scan words whose length can reach the cutoff."""
+    mock_typo_detector._dictionary = {"ab", "abc", "abcd", "abcdefghijklmnop"}
+    with patch('sinlib.spellcheck.get_close_matches', return_value=[]) as mock_get_close:
+        mock_typo_detector.suggest_correction("abce")
+        assert sorted(mock_get_close.call_args[0][1]) == ["abc", "abcd"]
+
+
+def test_add_words_invalidates_affected_entries(mock_typo_detector):
+    """Test that added words become known and only related cache entries are dropped."""
+    mock_typo_detector._dictionary = {"correct"}
+    mock_typo_detector.word_ngram_probability = lambda word, n=2: 1e-10
+
+    assert mock_typo_detector("corrects") == "correct"
+    assert mock_typo_detector("x") == "x"
+
+    assert mock_typo_detector.add_words(["corrects", "correct"]) == 1
+    assert "corrects" in mock_typo_detector.get_dictionary()
+    assert mock_typo_detector("corrects") == "corrects"
+    assert mock_typo_detector.check("corrects").status[0] == 0
+
+    # The short unrelated word keeps its cached result.
+    assert mock_typo_detector.cache_info()["__call__"].currsize == 2
+    assert "x" in mock_typo_detector._caches["check_word"]
+
+
+def test_update_ngrams_and_compact(mock_typo_detector, tmp_path):
+    """Test n-gram overlays change probabilities and compact into base files."""
+    mock_typo_detector._tokenizer = lambda word, truncate_and_pad: [ord(c) - 96 for c in word]
+    mock_typo_detector._ngram_probs = {12: 0.5}
+
+    assert mock_typo_detector.word_ngram_probability("abc") == pytest.approx(0.5 * 1e-9)
+    assert mock_typo_detector.update_ngrams(["bc bc", "ab"]) == 1
+    assert mock_typo_detector.word_ngram_probability("abc") == pytest.approx(0.5 * 2 / 3)
+
+    mock_typo_detector.add_words(["abc"])
+    dictionary_path, ngram_probs_path = mock_typo_detector.compact(tmp_path)
+    assert "abc" in np.load(dictionary_path).tolist()
+    assert np.load(ngram_probs_path, allow_pickle=True).item()[23] == pytest.approx(2 / 3)
+    assert mock_typo_detector._ngram_overlay == {}
+    assert mock_typo_detector.word_ngram_probability("abc") == pytest.approx(0.5 * 2 / 3)
+
+
+def test_canonical_encodings_share_dictionary_and_cache(mock_typo_detector):
+    """Test that joiner and split vowel sign variants of a word are treated alike."""
+    # "පොත" in the dictionary, typed with a split vowel sign
+    split_sign = "ප\u0dd9\u0dcfත"
+    assert mock_typo_detector.check(split_sign).status[0] == 0
+    assert mock_typo_detector.check("අ\u200dම්මා").status[0] == 0
+
+    mock_typo_detector.cache_clear()
+    mock_typo_detector("ප\u0ddcත")
+    mock_typo_detector(split_sign)
+    assert mock_typo_detector.cache_info()["__call__"].hits == 1
+
+
+def test_known_tokens_are_returned_as_typed(mock_typo_detector):
+    """Test that canonical forms are only used for lookup, not returned."""
+    split_sign = "ප\u0dd9\u0dcfත"
+    stray_joiner = "අ\u200dම්මා"
+    result = mock_typo_detector.check(f"{split_sign} {stray_joiner}")
+    assert result.status.tolist() == [0, 0]
+    assert result.correction.tolist() == [split_sign, stray_joiner]
+
+    # The cache is shared by both encodings, but each call returns its own text.
+    assert mock_typo_detector("ප\u0ddcත") == "ප\u0ddcත"
+    assert mock_typo_detector(split_sign) == split_sign
@@ -1,3 +1,4 @@
+import json
 import pytest
 from pathlib import Path
 from sinlib.tokenizer import Tokenizer
@@ -47,4 +48,84 @@ def test_edge_cases():
     tokenizer.train([""])
     
     assert tokenizer("", truncate_and_pad=True) == [tokenizer.pad_token_id] * 10
-    assert tokenizer("", truncate_and_pad=False) == []
\ No newline at end of file
+    assert tokenizer("", truncate_and_pad=False) == []
+def test_canonical_encodings_share_tokens(tmp_path):
+    tokenizer = Tokenizer(max_length=None)
+    tokenizer.train(["ශ්\u200dරී ලංකාව", "ම\u200dම", "ක\u0dd9\u0dcfළඹ"])
+    # Stray joiners are dropped; one between a virama and a consonant is kept
+    assert tokenizer("ම\u200dම") == tokenizer("මම")
+    assert tokenizer("ශ්\u200dරී") != tokenizer("ශ්රී")
+    assert tokenizer.decode(tokenizer("ශ්\u200dරී")) == "ශ්\u200dරී"
+    assert tokenizer("කොළඹ") == tokenizer("කොළඹ")
+
+    tokenizer.save_tokenizer(tmp_path / "tokenizer")
+    raw = Tokenizer(max_length=None, normalize=False)
+    raw.load_from_pretrained(tmp_path / "tokenizer", load_default_tokenizer=False)
+    assert raw.normalize is True
+
+    # Configs saved before the flag existed keep their raw encodings
+    config_path = tmp_path / "tokenizer" / "config.json"
+    config = json.loads(config_path.read_text(encoding="utf-8"))
+    del config["normalize"]
+    config_path.write_text(json.dumps(config), encoding="utf-8")
+    legacy = Tokenizer(max_length=None).load_from_pretrained(tmp_path / "tokenizer", load_default_tokenizer=False)
+    assert legacy.normalize is False
+    assert legacy("ම\u200dම") != legacy("මම")
+
+def test_end_of_text_and_allowed_special_tokens(sample_texts):
+    tokenizer = Tokenizer(max_length=None)
+    tokenizer.train(sample_texts)
+    eot, unk = tokenizer.end_of_text_token_id, tokenizer.unknown_token_id
+    ma = tokenizer.vocab_map["ම"]
+
+    # Every part is followed by an end-of-text token, including the last one
+    assert tokenizer("ම<|end_of_text|>ම") == [ma, eot, ma, eot]
+    assert tokenizer("මම") == [ma, ma]
+    # Special tokens are only recognised when allowed
+    assert tokenizer("ම<|unk|>", allowed_special_tokens=["<|unk|>"]) == [ma, unk]
+    assert len(tokenizer("ම<|unk|>")) == 1 + len("<|unk|>")
+
+def test_batch_decode(sample_texts):
+    import numpy as np
+    import torch
+
+    tokenizer = Tokenizer(max_length=8)
+    tokenizer.train(sample_texts)
+    texts = ["මම ගෙදර", "සිංහල", ""]
+    ids = [tokenizer(t, truncate_and_pad=True) for t in texts]
+    ids[1][0] = 10_000  # outside the vocabulary
+
+    for batch in (np.array(ids), torch.tensor(ids), ids):
+        for skip in (False, True):
+            assert tokenizer.batch_decode(batch, skip_special_tokens=skip) == [
+                tokenizer.decode(row, skip_special_tokens=skip) for row in ids
+            ]
+    assert tokenizer.batch_decode([[tokenizer.vocab_map["ම"]], []]) == ["ම", ""]
+
+def test_encode_with_offsets(sample_texts):
+    tokenizer = Tokenizer(max_length=12)
+    tokenizer.train(sample_texts)
+
+    # A stray joiner, a split vowel sign and a stray vowel sign at the start
+    text = "\u0dcf\u0db8\u200d\u0db8 \u0d9a\u0dd9\u0dcf\u0dc5"
+    ids, offsets = tokenizer.encode_with_offsets(text)
+    assert ids.dtype == offsets.dtype == "int32"
+    assert ids.tolist() == tokenizer(text)
+    assert [text[s:e] for s, e in offsets.tolist()] == [
+        "\u0db8\u200d", "\u0db8", " ", "\u0d9a\u0dd9\u0dcf", "\u0dc5"
+    ]
+    # A conjunct joiner is kept as a token of its own
+    text = "\u0dc1\u0dca\u200d\u0dbb\u0dd3"
+    ids, offsets = tokenizer.encode_with_offsets(text)
+    assert [text[s:e] for s, e in offsets.tolist()] == ["\u0dc1\u0dca", "\u200d", "\u0dbb\u0dd3"]
+
+    ids, offsets = tokenizer.encode_with_offsets("මම ගෙදර", truncate_and_pad=True)
+    assert ids.tolist() == tokenizer("මම ගෙදර", truncate_and_pad=True)
+    assert offsets[-1].tolist() == [0, 0]
+
+    texts = ["මම ගෙදර", "සිංහල<|end_of_text|>"]
+    batch_ids, batch_offsets = tokenizer.batch_encode_with_offsets(texts, truncate_and_pad=True)
+    assert batch_ids.shape == (2, 12) and batch_offsets.shape == (2, 12, 2)
+    assert batch_ids.tolist() == [tokenizer(t, truncate_and_pad=True) for t in texts]
+    ids, offsets = tokenizer.batch_encode_with_offsets(texts)
+    assert offsets[1][-1].tolist() == [len(texts[1])] * 2
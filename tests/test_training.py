@@ -0,0 +1,70 @@
+import itertools
+
+import pytest
+import torch
+
+from sinlib.tokenizer import Tokenizer
+from sinlib.utils.model_utils import batch_inference, inference, load_transliterator_model
+from sinlib.utils.training import IGNORE_INDEX, TransliterationPairs, TransliteratorTrainer
+
+SYLLABLES = {"ka": "ක", "ma": "ම", "ga": "ග", "da": "ද", "ra": "ර", "la": "ල"}
+
+
+@pytest.fixture
+def pairs():
+    return [
+        ("".join(r for r, _ in word), "".join(s for _, s in word))
+        for n in (1, 2, 3)
+        for word in itertools.product(SYLLABLES.items(), repeat=n)
+    ]
+
+
+@pytest.fixture
+def tokenizer(pairs):
+    tokenizer = Tokenizer(max_length=None)
+    tokenizer.train([word for pair in pairs for word in pair])
+    return tokenizer
+
+
+def test_bucketed_batches(pairs, tokenizer):
+    dataset = TransliterationPairs(pairs + [("k", "කම")], tokenizer, batch_size=16, bucket_batches=4)
+    batches = list(dataset)
+    assert sum(len(b["lengths"]) for b in batches) == len(pairs)
+    for batch in batches:
+        assert batch["lengths"].max() - batch["lengths"].min() <= 2
+        mask = torch.arange(batch["inputs"].size(1)) >= batch["lengths"][:, None]
+        assert (batch["targets"][mask] == IGNORE_INDEX).all()
+        assert (batch["inputs"][mask] == tokenizer.pad_token_id).all()
+
+
+def test_train_resume_and_export(tmp_path, pairs, tokenizer):
+    kwargs = dict(hidden_size=32, num_layers=1, batch_size=16, learning_rate=1e-2, checkpoint_every=5)
+    trainer = TransliteratorTrainer(tokenizer, tmp_path, **kwargs)
+    trainer.fit(pairs, epochs=1)
+    assert trainer.checkpoint_path.exists()
+
+    resumed = TransliteratorTrainer(tokenizer, tmp_path, **kwargs)
+    path = resumed.fit(pairs, epochs=8, valid_pairs=pairs)
+    assert [record["epoch"] for record in resumed.history] == list(range(8))
+    assert resumed.history[-1]["loss"] < resumed.history[0]["loss"]
+    assert resumed.history[-1]["accuracy"] > 0.5
+
+    model = load_transliterator_model(path, device=torch.device("cpu"))
+    words = [roman for roman, _ in pairs[:50]]
+    assert batch_inference(model, tokenizer, words, batch_size=7) == [inference(model, tokenizer, w) for w in words]
+
+
+def test_seed_leaves_global_rng_untouched(tmp_path, pairs, tokenizer):
+    kwargs = dict(hidden_size=16, num_layers=1, batch_size=16, seed=3)
+    torch.manual_seed(123)
+    expected = torch.rand(4)
+
+    torch.manual_seed(123)
+    first = TransliteratorTrainer(tokenizer, tmp_path / "first", **kwargs)
+    first.fit(pairs, epochs=1)
+    assert torch.equal(torch.rand(4), expected)
+
+    second = TransliteratorTrainer(tokenizer, tmp_path / "second", **kwargs)
+    second.fit(pairs, epochs=1)
+    for a, b in zip(first.model.state_dict().values(), second.model.state_dict().values()):
+        assert torch.equal(a, b)
@@ -0,0 +1,67 @@
+import json
+
+import numpy as np
+import pytest
+import torch
+
+from sinlib import Deromanizer, Transliterator
+from sinlib.tokenizer import Tokenizer
+from sinlib.utils.model_utils import batch_inference
+from sinlib.utils.models.transliterator_model import BiLSTMTranslator
+
+
+@pytest.fixture
+def local_model(tmp_path):
+    tokenizer = Tokenizer(max_length=None)
+    tokenizer.train(["mama kama gedara", "මම කම ගෙදර"])
+    tokenizer.save_tokenizer(tmp_path / "tokenizer")
+    torch.manual_seed(0)
+    model = BiLSTMTranslator(len(tokenizer), 16, len(tokenizer), num_layers=1)
+    torch.save(model.state_dict(), tmp_path / "model.pth")
+    return {"model_path": tmp_path / "model.pth", "tokenizer_path": str(tmp_path / "tokenizer")}
+
+
+@pytest.fixture
+def deromanizer(tmp_path):
+    char_map = {"ම": "ma", "ක": "ka", "ඛ": "ka", "ගෙ": "ge", "ද": "da", "ර": "ra"}
+    char_map_fp = tmp_path / "char_map.json"
+    char_map_fp.write_text(json.dumps(char_map, ensure_ascii=False), encoding="utf-8")
+    return Deromanizer(str(char_map_fp))
+
+
+def test_hybrid_paths(local_model, deromanizer):
+    transliterator = Transliterator(
+        **local_model, lexicon={"gedara": "ගෙදර"}, hybrid=True, deromanizer=deromanizer
+    )
+    # "mama" is unambiguous, "kama" is not (ක and ඛ share "ka") and "xyz" has unknown letters
+    model_words = batch_inference(transliterator.model, transliterator.tokenizer, ["kama", "xyz"])
+    expected = " ".join(["මම", "ගෙදර", model_words[0], model_words[1], "මම"])
+    assert transliterator("mama gedara kama xyz mama") == expected
+    assert transliterator.path_counts == {"lexicon": 1, "table": 0, "rules": 2, "model": 2}
+    assert transliterator.path_stats() == {"lexicon": 0.2, "table": 0.0, "rules": 0.4, "model": 0.4, "words": 5}
+
+    texts = ["mama gedara", "", "kama xyz mama"]
+    assert transliterator.batch_transliterate(texts) == [transliterator(text) for text in texts]
+
+    transliterator.reset_path_stats()
+    assert transliterator.path_stats()["words"] == 0
+
+
+def test_hybrid_vocabulary_confirms_ties(tmp_path, local_model, deromanizer):
+    vocabulary_fp = tmp_path / "dictionary.npy"
+    np.save(vocabulary_fp, np.array(["කම", "ගෙදර"]))
+    for vocabulary in ({"කම"}, vocabulary_fp):
+        transliterator = Transliterator(**local_model, hybrid=True, deromanizer=deromanizer, vocabulary=vocabulary)
+        # "kama" needs a tie between ක and ඛ broken, and කම is a known word; "kada" is not
+        kada = batch_inference(transliterator.model, transliterator.tokenizer, ["kada"])[0]
+        assert transliterator("kama kada mama") == " ".join(["කම", kada, "මම"]).strip()
+        assert transliterator.path_counts == {"lexicon": 0, "table": 0, "rules": 2, "model": 1}
+
+
+def test_lexicon_file_without_rules(tmp_path, local_model):
+    lexicon_fp = tmp_path / "lexicon.tsv"
+    lexicon_fp.write_text("mama\tමම\n", encoding="utf-8")
+    transliterator = Transliterator(**local_model, lexicon=lexicon_fp)
+    assert transliterator.deromanizer is None
+    assert transliterator("mama kama").startswith("මම")
+    assert transliterator.path_counts == {"lexicon": 1, "table": 0, "rules": 0, "model": 1}